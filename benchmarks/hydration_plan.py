@@ -0,0 +1,100 @@
+"""Check that loading a single poll costs the same no matter how many polls exist.
+
+This seeds the database at BENCH_DATABASE_URL with synthetic polls in several steps and, after each step, compares the planner's estimated cost and the actual execution time of loading one poll through PostgresPollsCrud's hydration query and through polls_extended_view.
+
+The database must already have the schema from paul_bot/data/schema.psql applied. The hydration query relies on columns and indexes added by later migrations, so pending migrations are applied before seeding. The database will be filled with junk, so never point this at a real database.
+
+Usage:
+    BENCH_DATABASE_URL=postgres://localhost/paul_bench uv run python -m benchmarks.hydration_plan [SIZE ...]
+"""
+
+import asyncio
+import json
+import os
+import sys
+from typing import Any, cast
+
+import asyncpg
+
+from paul_bot.data import migrate
+from paul_bot.data.polls_crud import PostgresPollsCrud
+
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000, 3_000_000)
+MAX_COST_GROWTH = 1.5
+"""The largest allowed ratio between the hydration cost at the biggest and smallest table sizes."""
+
+_VIEW_QUERY = "SELECT * FROM polls_extended_view WHERE id = $1"
+_HYDRATE_QUERY = f"{PostgresPollsCrud._HYDRATE_QUERY} WHERE polls.id = $1"  # noqa: SLF001
+
+
+async def seed(conn: asyncpg.Connection, target: int) -> None:
+    """Add polls until there are `target` of them, each with two options, three votes per option and one allowed voter."""
+    current = cast(int, await conn.fetchval("SELECT COUNT(*) FROM polls"))
+    if current >= target:
+        return
+    last_id = cast(int, await conn.fetchval("SELECT COALESCE(MAX(id), 0) FROM polls"))
+    async with conn.transaction():
+        await conn.execute(
+            """
+            INSERT INTO polls (question, author, expires, allow_multiple_votes, message, channel, closed)
+            SELECT 'Question ' || i, i, now() + i * interval '1 second', false, i, i, i % 2 = 0
+            FROM generate_series($1::bigint, $2::bigint) AS i
+            """,
+            current + 1,
+            target,
+        )
+        await conn.execute(
+            "INSERT INTO options (poll_id, label, index) SELECT polls.id, 'Option ' || n, n FROM polls, generate_series(0, 1) AS n WHERE polls.id > $1",
+            last_id,
+        )
+        await conn.execute(
+            "INSERT INTO votes (option_id, voter_id) SELECT options.id, v FROM options, generate_series(1, 3) AS v WHERE options.poll_id > $1",
+            last_id,
+        )
+        await conn.execute(
+            "INSERT INTO allowed_voters (poll_id, mention_prefix, mention_id) SELECT id, '@&', id FROM polls WHERE id > $1",
+            last_id,
+        )
+    await conn.execute("ANALYZE")
+
+
+async def explain(
+    conn: asyncpg.Connection, query: str, poll_id: int
+) -> tuple[float, float]:
+    """Get the planner's total cost estimate and the actual execution time in milliseconds of the given query."""
+    result = await conn.fetchval(f"EXPLAIN (ANALYZE, FORMAT JSON) {query}", poll_id)
+    plan: dict[str, Any] = json.loads(result)[0]
+    return plan["Plan"]["Total Cost"], plan["Execution Time"]
+
+
+async def main(sizes: list[int]) -> bool:
+    conn = cast(
+        asyncpg.Connection, await asyncpg.connect(os.environ["BENCH_DATABASE_URL"])
+    )
+    try:
+        await migrate.migrate(conn)
+        costs: list[float] = []
+        print(
+            f"{'polls':>12} {'hydrate cost':>14} {'hydrate ms':>12} {'view cost':>14} {'view ms':>12}"
+        )
+        for size in sorted(sizes):
+            await seed(conn, size)
+            poll_id = size // 2
+            hydrate_cost, hydrate_ms = await explain(conn, _HYDRATE_QUERY, poll_id)
+            view_cost, view_ms = await explain(conn, _VIEW_QUERY, poll_id)
+            costs.append(hydrate_cost)
+            print(
+                f"{size:>12} {hydrate_cost:>14.2f} {hydrate_ms:>12.3f} {view_cost:>14.2f} {view_ms:>12.3f}"
+            )
+    finally:
+        await conn.close()
+    growth = costs[-1] / costs[0]
+    print(
+        f"\nHydration cost grew by a factor of {growth:.2f} (limit {MAX_COST_GROWTH})."
+    )
+    return growth <= MAX_COST_GROWTH
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or list(DEFAULT_SIZES)
+    sys.exit(0 if asyncio.run(main(sizes)) else 1)
@@ -0,0 +1,372 @@
+"""Drive the bot's button handler with fake interactions and report latency, throughput and error rate.
+
+Polls are created in storage, then clicks on their vote, add option, see votes and close buttons are fed through `on_button_click` at a fixed rate for a fixed duration. Every call Discord's REST API would receive is replaced by a stub which just waits for `--rest-latency` seconds, so no bot token or gateway connection is needed.
+
+Clicks which change a poll only finish once its message has been edited to show the change, so the latency reported for them is the click-to-edit latency. For see votes clicks it is the time until the votes browser is sent.
+
+By default polls are stored in the Postgres database at BENCH_DATABASE_URL. It must already have the base schema from paul_bot/data/schema.psql applied; the later migrations are applied by `application.init()`. It will be filled with junk, so never point this at a real database. Pass `--storage memory` to measure the bot without any database, or `--storage sqlite` to use a temporary SQLite database.
+
+Usage:
+    BENCH_DATABASE_URL=postgres://localhost/paul_bench uv run python -m benchmarks.load [--storage postgres] [--rate 200] [--duration 30] [--polls 50] [--voters 5000] [--mix vote=90,see_votes=5,add_option=4,close=1]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+from collections.abc import Callable, Coroutine
+from datetime import UTC, datetime, timedelta
+from time import perf_counter
+from types import SimpleNamespace
+from typing import Any, cast, override
+
+import disnake
+from disnake.interactions import MessageInteraction
+from disnake.interactions.modal import ModalInteraction
+from disnake.utils import SnowflakeList
+
+from paul_bot import application
+from paul_bot.application import Mention, Poll
+from paul_bot.presentation import paul as paul_module
+from paul_bot.presentation.command_params import PollCommandParams
+from paul_bot.utils import background
+
+AUTHOR_ID = 1
+"""The ID of the member who creates every poll, and is therefore the only one allowed to close them."""
+ROLE_ID = 2
+"""The ID of the role which every fake member has, and which is allowed to vote, add options and see votes."""
+GUILD_ID = 3
+CHANNEL_ID = 4
+
+DEFAULT_MIX = "vote=90,see_votes=5,add_option=4,close=1"
+
+
+class FakeMember(disnake.Member):
+    """A member which passes the `isinstance` checks of the permission code without any Discord state behind it."""
+
+    def __init__(self, member_id: int) -> None:  # pyright: ignore[reportMissingSuperCall]
+        self.__member_id = member_id
+        # Acl reads the member's role IDs directly
+        self._roles = SnowflakeList((ROLE_ID,))
+        self.guild = cast(disnake.Guild, disnake.Object(GUILD_ID))
+
+    @property
+    @override
+    def id(self) -> int:  # type: ignore[override]  # pyright: ignore[reportIncompatibleVariableOverride]
+        return self.__member_id
+
+    @property
+    @override
+    def name(self) -> str:  # type: ignore[override]  # pyright: ignore[reportIncompatibleVariableOverride]
+        return f"member{self.__member_id}"
+
+    @property
+    @override
+    def display_name(self) -> str:
+        return self.name
+
+
+class FakeRest:
+    """Stands in for Discord's REST API, counting the calls made to it."""
+
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+        self.calls = 0
+
+    async def call(self) -> None:
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+
+
+class FakeMessage:
+    def __init__(self, rest: FakeRest, message_id: int) -> None:
+        self.__rest = rest
+        self.id = message_id
+        self.channel = SimpleNamespace(id=CHANNEL_ID)
+        self.guild = SimpleNamespace(id=GUILD_ID)
+
+    async def edit(self, **_: Any) -> None:
+        await self.__rest.call()
+
+
+class FakeResponse:
+    def __init__(
+        self, rest: FakeRest, message: FakeMessage, author: FakeMember
+    ) -> None:
+        self.__rest = rest
+        self.__message = message
+        self.__author = author
+        self.__done = False
+
+    def is_done(self) -> bool:
+        return self.__done
+
+    async def defer(self, **_: Any) -> None:
+        self.__done = True
+        await self.__rest.call()
+
+    async def send_message(self, *_: Any, **__: Any) -> None:
+        self.__done = True
+        await self.__rest.call()
+
+    async def send_modal(self, modal: disnake.ui.Modal) -> None:
+        """Submit the modal straight away, as if the member typed a new option instantly."""
+        self.__done = True
+        await self.__rest.call()
+        poll_id = cast(str, modal.custom_id).split()[0]
+        inter = FakeInteraction(
+            self.__rest,
+            self.__message,
+            self.__author,
+            custom_id=modal.custom_id,
+            text_values={f"{poll_id} add_option_input": f"Option {random.random()}"},
+        )
+        # Mirror how disnake dispatches modal submissions
+        try:
+            await modal.callback(cast(ModalInteraction[Any], inter))
+        except Exception as e:  # noqa: BLE001
+            await modal.on_error(e, cast(ModalInteraction[Any], inter))
+
+
+class FakeFollowup:
+    def __init__(self, rest: FakeRest) -> None:
+        self.__rest = rest
+
+    async def send(self, *_: Any, **__: Any) -> None:
+        await self.__rest.call()
+
+
+class FakeInteraction:
+    """Stands in for a MessageInteraction or ModalInteraction."""
+
+    def __init__(
+        self,
+        rest: FakeRest,
+        message: FakeMessage,
+        author: FakeMember,
+        custom_id: str,
+        text_values: dict[str, str] | None = None,
+    ) -> None:
+        self.author = author
+        self.user = author
+        self.message = message
+        self.component = disnake.ui.Button[None](custom_id=custom_id)
+        self.response = FakeResponse(rest, message, author)
+        self.followup = FakeFollowup(rest)
+        self.text_values = text_values or {}
+
+
+class LoadTest:
+    def __init__(
+        self, rest: FakeRest, polls: int, voters: int, mix: dict[str, int]
+    ) -> None:
+        self.__rest = rest
+        self.__poll_count = polls
+        self.__voters = voters
+        self.__mix = mix
+        self.__polls: list[Poll] = []
+        self.__next_message_id = 1
+        self.latencies: dict[str, list[float]] = {kind: [] for kind in mix}
+        self.errors: dict[str, int] = dict.fromkeys(mix, 0)
+
+    async def create_polls(self) -> None:
+        """Create the polls to click on, in the database."""
+        await asyncio.gather(*(self.__add_poll() for _ in range(self.__poll_count)))
+
+    async def run(self, rate: float, duration: float) -> float:
+        """Click buttons at the given rate for the given duration, then wait for the clicks to finish.
+
+        Returns:
+            The number of seconds from the first click until the last click finished.
+        """
+        clicks = {
+            "vote": self.__vote,
+            "see_votes": self.__see_votes,
+            "add_option": self.__add_option,
+            "close": self.__close,
+        }
+        kinds = list(self.__mix)
+        weights = list(self.__mix.values())
+        tasks: list[asyncio.Task[None]] = []
+        start = perf_counter()
+        sent = 0
+        while (elapsed := perf_counter() - start) < duration:
+            # Catch up on any clicks which are due, so the rate holds even if the loop falls behind
+            while sent < elapsed * rate:
+                kind = random.choices(kinds, weights)[0]
+                tasks.append(background(self.__click(kind, clicks[kind])))
+                sent += 1
+            await asyncio.sleep(1 / rate)
+        await asyncio.gather(*tasks)
+        return perf_counter() - start
+
+    async def __click(
+        self, kind: str, click: Callable[[], Coroutine[Any, Any, None]]
+    ) -> None:
+        start = perf_counter()
+        try:
+            await click()
+        except Exception:  # noqa: BLE001
+            self.errors[kind] += 1
+            return
+        self.latencies[kind].append(perf_counter() - start)
+
+    async def __add_poll(self) -> None:
+        message = self.__message()
+        params = PollCommandParams(
+            question="Which option do you prefer?",
+            options=("Yes", "No", "Maybe"),
+            expires=datetime.now(UTC) + timedelta(days=1),
+            allow_multiple_votes=False,
+            allowed_vote_viewers=(Mention.role(ROLE_ID),),
+            allowed_editors=(Mention.role(ROLE_ID),),
+            allowed_voters=(Mention.role(ROLE_ID),),
+        )
+        poll = await Poll.create_poll(params, AUTHOR_ID, cast(disnake.Message, message))
+        self.__polls.append(poll)
+
+    def __message(self, message_id: int | None = None) -> FakeMessage:
+        if message_id is None:
+            message_id = self.__next_message_id
+            self.__next_message_id += 1
+        return FakeMessage(self.__rest, message_id)
+
+    async def __press(self, poll: Poll, custom_id: str, member_id: int) -> None:
+        inter = FakeInteraction(
+            self.__rest,
+            self.__message(poll.message_id),
+            FakeMember(member_id),
+            custom_id,
+        )
+        await paul_module.on_button_click(cast(MessageInteraction[Any], inter))
+
+    def __voter(self) -> int:
+        return 10**17 + random.randrange(self.__voters)
+
+    async def __vote(self) -> None:
+        option = random.choice(random.choice(self.__polls).options)
+        await self.__press(option.poll, str(option.option_id), self.__voter())
+
+    async def __see_votes(self) -> None:
+        poll = random.choice(self.__polls)
+        await self.__press(poll, f"{poll.poll_id} see_votes", self.__voter())
+
+    async def __add_option(self) -> None:
+        poll = random.choice(self.__polls)
+        await self.__press(poll, f"{poll.poll_id} add_option", self.__voter())
+
+    async def __close(self) -> None:
+        # Replace the poll straight away so that other clicks don't land on a closed poll
+        poll = self.__polls.pop(random.randrange(len(self.__polls)))
+        background(self.__add_poll())
+        await self.__press(poll, f"{poll.poll_id} close", AUTHOR_ID)
+
+
+def parse_mix(mix: str) -> dict[str, int]:
+    """Parse a comma separated list of click kinds and their weights, e.g. "vote=9,close=1"."""
+    weights = {
+        kind.strip(): int(weight)
+        for kind, weight in (part.split("=") for part in mix.split(","))
+    }
+    if unknown := set(weights) - {"vote", "see_votes", "add_option", "close"}:
+        raise ValueError(f"Unknown click kinds: {', '.join(sorted(unknown))}")
+    return weights
+
+
+def report(test: LoadTest, elapsed: float) -> None:
+    completed = sum(len(latencies) for latencies in test.latencies.values())
+    failed = sum(test.errors.values())
+    print(
+        f"{'click':<12} {'count':>8} {'errors':>8} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10}"
+    )
+    for kind, latencies in test.latencies.items():
+        if len(latencies) >= 2:
+            q = statistics.quantiles(latencies, n=100, method="inclusive")
+            p50, p95, p99 = (f"{q[i] * 1000:.1f}" for i in (49, 94, 98))
+        else:
+            p50 = p95 = p99 = "-"
+        print(
+            f"{kind:<12} {len(latencies):>8} {test.errors[kind]:>8} {p50:>10} {p95:>10} {p99:>10}"
+        )
+    total = completed + failed
+    print(
+        f"\n{completed / elapsed:.1f} clicks/s over {elapsed:.1f} s, error rate {failed / total if total else 0:.2%}."
+    )
+
+
+async def main(args: argparse.Namespace) -> None:
+    os.environ["STORAGE_BACKEND"] = args.storage
+    if args.storage == "postgres":
+        os.environ["DATABASE_URL"] = os.environ["BENCH_DATABASE_URL"]
+    elif args.storage == "sqlite":
+        os.environ["SQLITE_PATH"] = ":memory:"
+    rest = FakeRest(args.rest_latency)
+    bot = paul_module.bot
+
+    async def change_presence(**_: Any) -> None:
+        await rest.call()
+
+    bot.change_presence = change_presence  # type: ignore[method-assign]  # pyright: ignore[reportAttributeAccessIssue]
+    bot.get_partial_messageable = lambda *_, **__: SimpleNamespace(  # type: ignore[method-assign, assignment]  # pyright: ignore[reportAttributeAccessIssue]
+        fetch_message=lambda message_id: _after(
+            rest.call(), FakeMessage(rest, message_id)
+        )
+    )
+    await application.init()
+    try:
+        test = LoadTest(rest, args.polls, args.voters, parse_mix(args.mix))
+        await test.create_polls()
+        elapsed = await test.run(args.rate, args.duration)
+    finally:
+        await application.close()
+    report(test, elapsed)
+    print(f"{rest.calls} stubbed Discord API calls.")
+
+
+async def _after[T](coro: Coroutine[Any, Any, None], result: T) -> T:
+    await coro
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the button handler.")
+    parser.add_argument(
+        "--storage",
+        choices=("postgres", "sqlite", "memory"),
+        default="postgres",
+        help="The storage backend to use. Default is postgres.",
+    )
+    parser.add_argument(
+        "--rate", type=float, default=200, help="Clicks per second. Default is 200."
+    )
+    parser.add_argument(
+        "--duration",
+        type=float,
+        default=30,
+        help="Seconds to keep clicking for. Default is 30.",
+    )
+    parser.add_argument(
+        "--polls",
+        type=int,
+        default=50,
+        help="Number of open polls to click on. Default is 50.",
+    )
+    parser.add_argument(
+        "--voters",
+        type=int,
+        default=5000,
+        help="Number of distinct members clicking. Default is 5000.",
+    )
+    parser.add_argument(
+        "--rest-latency",
+        type=float,
+        default=0.05,
+        help="Seconds each stubbed Discord API call takes. Default is 0.05.",
+    )
+    parser.add_argument(
+        "--mix",
+        default=DEFAULT_MIX,
+        help=f"Relative weights of each kind of click. Default is {DEFAULT_MIX}.",
+    )
+    asyncio.run(main(parser.parse_args()))
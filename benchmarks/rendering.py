@@ -0,0 +1,163 @@
+"""Time the code which renders a poll's message after every vote, and measure how much memory it allocates.
+
+Each renderer runs against synthetic polls of every combination of option count, voter count, label length and open or closed state. The results are compared with benchmarks/rendering_baseline.json, and the script fails if any renderer became more than MAX_SLOWDOWN times slower or allocates more than MAX_SLOWDOWN times as much memory at its peak. Timings depend on the machine, so the baseline isn't committed: a case which isn't in it yet, as on a fresh checkout, only has its results recorded as its baseline. Save a new baseline with --save-baseline after an intentional change.
+
+Usage:
+    uv run python -m benchmarks.rendering [--save-baseline] [FILTER]
+
+FILTER only runs the cases whose name contains it, e.g. "see_option_results" or "voters=100000".
+"""
+
+import argparse
+import json
+import sys
+import timeit
+import tracemalloc
+from collections.abc import Callable
+from itertools import product
+from pathlib import Path
+from typing import TYPE_CHECKING, cast
+
+from paul_bot.application import Poll
+from paul_bot.presentation.embeds.poll_closed_embed import PollClosedEmbed
+from paul_bot.presentation.embeds.poll_embed import PollEmbed
+from paul_bot.presentation.embeds.see_option_results_embed import SeeOptionResultsEmbed
+from paul_bot.presentation.ui.poll_buttons import PollButtons
+from paul_bot.presentation.ui.votes_browser import PAGE_SIZE
+
+from .synthetic import make_poll
+
+if TYPE_CHECKING:
+    from paul_bot.presentation.paul import Paul
+
+BASELINE = Path(__file__).with_name("rendering_baseline.json")
+MAX_SLOWDOWN = 1.5
+"""The largest allowed ratio between a case's current and baseline time or peak memory."""
+
+OPTION_COUNTS = (2, 10, Poll.MAX_OPTIONS)
+VOTER_COUNTS = (0, 1_000, 100_000)
+LABEL_LENGTHS = (10, Poll.MAX_OPTION_LENGTH)
+
+# Buttons only use the bot in their callbacks, which are never called here
+_PAUL = cast("Paul", None)
+
+type Renderer = Callable[[Poll], Callable[[], object] | None]
+"""Given a poll, prepare a function which renders it, or return None if the renderer doesn't apply to the poll."""
+
+
+def _poll_embed(poll: Poll) -> Callable[[], object]:
+    return lambda: PollClosedEmbed(poll) if poll.closed else PollEmbed(poll)
+
+
+def _option_prefixes(poll: Poll) -> Callable[[], object] | None:
+    if not poll.closed:
+        return None
+    embed = PollClosedEmbed(poll)
+    return lambda: list(embed.option_prefixes())
+
+
+def _see_option_results(poll: Poll) -> Callable[[], object]:
+    option = max(poll.options, key=lambda option: option.vote_count)
+    # Synthetic polls only have vote counts, so any IDs do for the page's mentions
+    voters = list(range(10**17, 10**17 + min(option.vote_count, PAGE_SIZE)))
+    return lambda: SeeOptionResultsEmbed(option, option.index, voters)
+
+
+def _poll_buttons(poll: Poll) -> Callable[[], object]:
+    return lambda: PollButtons(_PAUL, poll)
+
+
+RENDERERS: dict[str, Renderer] = {
+    "poll_embed": _poll_embed,
+    "option_prefixes": _option_prefixes,
+    "see_option_results": _see_option_results,
+    "poll_buttons": _poll_buttons,
+}
+
+
+def cases(name_filter: str = "") -> dict[str, Callable[[], object]]:
+    """Prepare every combination of renderer and poll shape.
+
+    Args:
+        name_filter: Only prepare the cases whose name contains this string.
+
+    Returns:
+        A function running each case, by name.
+    """
+    prepared: dict[str, Callable[[], object]] = {}
+    for options, voters, label_length, closed in product(
+        OPTION_COUNTS, VOTER_COUNTS, LABEL_LENGTHS, (False, True)
+    ):
+        poll = make_poll(
+            options=options, voters=voters, label_length=label_length, closed=closed
+        )
+        shape = f"options={options} voters={voters} label={label_length} {'closed' if closed else 'open'}"
+        for renderer_name, renderer in RENDERERS.items():
+            name = f"{renderer_name} {shape}"
+            if name_filter in name and (run := renderer(poll)) is not None:
+                prepared[name] = run
+    return prepared
+
+
+def measure(run: Callable[[], object]) -> dict[str, float]:
+    """Measure the time and memory a function takes.
+
+    Returns:
+        The best time per call in microseconds out of several repetitions, and the peak memory allocated during one call in KiB.
+    """
+    timer = timeit.Timer(run)
+    number, _ = timer.autorange()
+    seconds = min(timer.repeat(repeat=5, number=number)) / number
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"us": seconds * 1e6, "peak_kib": (peak - before) / 1024}
+
+
+def main(name_filter: str, save_baseline: bool) -> bool:
+    baseline: dict[str, dict[str, float]] = (
+        json.loads(BASELINE.read_text()) if BASELINE.exists() else {}
+    )
+    results: dict[str, dict[str, float]] = {}
+    regressions: list[str] = []
+    print(f"{'case':<70} {'µs':>12} {'peak KiB':>10} {'x µs':>7} {'x KiB':>7}")
+    for name, run in cases(name_filter).items():
+        result = results[name] = measure(run)
+        ratios = ["", ""]
+        if previous := baseline.get(name):
+            for i, metric in enumerate(("us", "peak_kib")):
+                # Ignore tiny absolute values, where noise dominates the ratio
+                ratio = result[metric] / max(previous[metric], 1)
+                ratios[i] = f"{ratio:.2f}"
+                if ratio > MAX_SLOWDOWN:
+                    regressions.append(f"{name}: {metric} grew by {ratio:.2f}x")
+        print(
+            f"{name:<70} {result['us']:>12.1f} {result['peak_kib']:>10.1f} {ratios[0]:>7} {ratios[1]:>7}"
+        )
+    if save_baseline:
+        BASELINE.write_text(json.dumps(baseline | results, indent="\t") + "\n")
+        print(f"\nSaved {len(results)} results to {BASELINE}.")
+        return True
+    # Cases without a baseline can't regress, so their first results become their baseline
+    if new := {
+        name: result for name, result in results.items() if name not in baseline
+    }:
+        BASELINE.write_text(json.dumps(baseline | new, indent="\t") + "\n")
+        print(
+            f"\n{len(new)} cases had no baseline to compare with. Saved their results to {BASELINE}."
+        )
+    for regression in regressions:
+        print(f"Regression in {regression} (limit {MAX_SLOWDOWN}).")
+    return not regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark poll rendering.")
+    parser.add_argument("filter", nargs="?", default="")
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args()
+    sys.exit(0 if main(args.filter, args.save_baseline) else 1)
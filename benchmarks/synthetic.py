@@ -0,0 +1,62 @@
+"""Build synthetic polls in memory, without touching the database."""
+
+from datetime import UTC, datetime, timedelta
+from itertools import count
+
+from paul_bot.application import Mention, Option, Poll
+
+_ids = count(1)
+
+
+def make_poll(
+    *,
+    options: int = 2,
+    voters: int = 0,
+    label_length: int = 10,
+    closed: bool = False,
+    allow_multiple_votes: bool = False,
+) -> Poll:
+    """Create a poll with votes spread over its options.
+
+    Args:
+        options: The number of options.
+        voters: The number of members who voted. Each member votes once, spread over the options so that the first option gets the most votes.
+        label_length: The length of each option's label.
+        closed: Whether the poll has expired and been closed.
+        allow_multiple_votes: Whether the poll allows voting for several options.
+
+    Returns:
+        The poll. Its ID and its options' IDs are unique within the process.
+    """
+    now = datetime.now(UTC)
+    poll = Poll(
+        poll_id=next(_ids),
+        question="Which option do you prefer?",
+        expires=now - timedelta(hours=1) if closed else now + timedelta(days=30),
+        author_id=1,
+        allow_multiple_votes=allow_multiple_votes,
+        allowed_vote_viewers=(Mention.role(2),),
+        allowed_editors=(Mention.member(1),),
+        allowed_voters=(Mention.role(2),),
+        message_id=next(_ids),
+        channel_id=3,
+        closed=closed,
+        guild_id=4,
+    )
+    # Member i votes for option floor(options * (i / voters) ** 2), which skews the votes towards the first options
+    vote_counts = [0] * options
+    for i in range(voters):
+        vote_counts[int(options * (i / voters) ** 2)] += 1
+    for index in range(options):
+        label = f"{index + 1} " + "x" * max(label_length - 2, 0)
+        poll.add_option(
+            Option(
+                next(_ids),
+                label[:label_length],
+                vote_counts[index],
+                poll,
+                index,
+                None if index < 2 else 1,
+            )
+        )
+    return poll
@@ -1,3 +1,20 @@
-from .presentation.paul import Paul
+from typing import TYPE_CHECKING, Any
+
+from dotenv import load_dotenv
+
+# The environment must be loaded before the bot is constructed, since some settings are read at import time.
+load_dotenv()
+
+if TYPE_CHECKING:
+    from .presentation.paul import Paul
 
 __all__ = ("Paul",)
+
+
+def __getattr__(name: str) -> Any:
+    # The presentation layer is only imported when it is first used, so that importing a lighter part of the package doesn't also import disnake and the whole bot
+    if name == "Paul":
+        from .presentation.paul import Paul
+
+        return Paul
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
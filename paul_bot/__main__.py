@@ -1,15 +1,10 @@
+import argparse
 import asyncio
 import logging
 import os
 
-from discord_lumberjack.handlers import DiscordChannelHandler
-from dotenv import load_dotenv
+from . import startup
 
-from . import application
-from .presentation.paul import bot
-from .utils import EmbedLongMessageCreator
-
-load_dotenv()
 token = os.environ["BOT_TOKEN"]
 
 logger = logging.getLogger("paul_bot")
@@ -21,27 +16,68 @@ file_handler = logging.FileHandler("output.log")
 file_handler.setLevel(logging.DEBUG)
 logger.addHandler(file_handler)
 if err_channel := os.environ.get("ERR_CHANNEL"):
-    logger.addHandler(
-        DiscordChannelHandler(
-            token, int(err_channel), logging.ERROR, EmbedLongMessageCreator()
-        )
-    )
+    from .log_handlers import channel_handler
+
+    logger.addHandler(channel_handler(token, int(err_channel), logging.ERROR))
 if dbg_channel := os.environ.get("DBG_CHANNEL"):
-    logger.addHandler(
-        DiscordChannelHandler(
-            token, int(dbg_channel), logging.DEBUG, EmbedLongMessageCreator()
-        )
-    )
+    from .log_handlers import channel_handler
 
+    logger.addHandler(channel_handler(token, int(dbg_channel), logging.DEBUG))
+
+
+async def async_main(*, profile_startup: bool = False) -> None:
+    # Imported here rather than at the top so that `startup.import_timed` in main can time them first
+    from . import application, metrics
+    from .presentation.paul import bot, shard_ownership
+    from .utils import background, pending_background_tasks
 
-async def async_main() -> None:
     logger.info("Starting Paul...")
-    await application.init()
-    await bot.start(token)
+    with startup.phase("application.init()"):
+        await application.init(shard_ownership)
+    if metrics_port := os.environ.get("METRICS_PORT"):
+        metrics.background_tasks.set_function(pending_background_tasks)
+        await metrics.serve(os.getenv("METRICS_HOST", "127.0.0.1"), int(metrics_port))
+    if profile_startup:
+        background(_profile_startup())
+    try:
+        await bot.start(token)
+    finally:
+        await application.close()
+
+
+async def _profile_startup() -> None:
+    """Print the startup phases once the gateway is ready and the first command sync is done, then stop the bot."""
+    from .presentation.paul import bot
+
+    synced = asyncio.Event()
+    sync = bot._sync_application_commands  # noqa: SLF001
+
+    async def timed_sync() -> None:
+        with startup.phase("command sync"):
+            await sync()
+        synced.set()
+
+    # disnake has no event or public hook for when commands are synced, so wrap the method it syncs them with on this instance only
+    bot._sync_application_commands = timed_sync  # type: ignore[method-assign]  # noqa: SLF001
+    await bot.wait_until_ready()
+    startup.milestone("gateway READY")
+    await synced.wait()
+    logger.info(f"Startup profile:\n{startup.report()}")
+    await bot.close()
 
 
 def main() -> None:
-    asyncio.run(async_main())
+    parser = argparse.ArgumentParser(prog="paul", description="Run the Paul bot.")
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="print how long each phase of starting up took once the bot is ready and its commands are synced, then exit",
+    )
+    args = parser.parse_args()
+    startup.import_timed(
+        "disnake", "paul_bot.data", "paul_bot.application", "paul_bot.presentation.paul"
+    )
+    asyncio.run(async_main(profile_startup=args.profile_startup))
 
 
 if __name__ == "__main__":
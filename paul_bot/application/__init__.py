@@ -1,10 +1,57 @@
-from .. import data
+import os
+from functools import partial
+
+from paul_bot import data, metrics
+
+from . import poll_cache, shards
+from .acl import Acl
 from .mention import Mention
 from .option import Option
 from .poll import Poll
+from .poll_cache import PollCache
+from .shards import ShardOwnership
+
+__all__ = (
+    "Acl",
+    "Poll",
+    "Mention",
+    "Option",
+    "PollCache",
+    "ShardOwnership",
+    "close",
+    "data",
+    "init",
+)
 
-__all__ = ("Poll", "Mention", "Option", "data", "init")
 
+async def init(ownership: ShardOwnership | None = None) -> None:
+    """Connect to the storage backend and configure the poll cache.
 
-async def init() -> None:
+    Args:
+        ownership: The shards run by this process. If not given, they are read from the environment.
+    """
+    shards.ownership = ownership if ownership is not None else ShardOwnership.from_env()
+    ttl = float(os.getenv("POLL_CACHE_TTL", "3600"))
+    poll_cache.cache = PollCache(
+        max_size=int(os.getenv("POLL_CACHE_SIZE", "1000")), ttl=ttl if ttl > 0 else None
+    )
+    __register_metrics()
     await data.init()
+    if os.getenv("LISTEN_FOR_POLL_CHANGES", "1") != "0":
+        await data.watch_poll_changes(
+            poll_cache.cache.mark_changed, poll_cache.cache.clear
+        )
+
+
+async def close() -> None:
+    await data.close()
+
+
+def __register_metrics() -> None:
+    for stat in ("hits", "misses", "evictions"):
+        metrics.poll_cache.set_function(partial(__read_cache_stat, stat), stat=stat)
+    metrics.poll_cache_size.set_function(lambda: len(poll_cache.cache))
+
+
+def __read_cache_stat(stat: str) -> int:
+    return getattr(poll_cache.cache.stats, stat)
@@ -0,0 +1,51 @@
+from collections.abc import Iterable, Iterator
+
+import disnake
+
+from .mention import Mention
+
+
+class Acl:
+    """The members and roles allowed to do something, compiled from their mentions into sets of IDs.
+
+    Checking a member costs a lookup of their ID plus one lookup per role they have, rather than a scan of their roles for every mention.
+    """
+
+    __slots__ = ("__member_ids", "__mentions", "__role_ids")
+
+    def __init__(self, mentions: Iterable[Mention]) -> None:
+        self.__mentions = tuple(mentions)
+        self.__member_ids = frozenset(
+            mention.mentioned_id for mention in self.__mentions if mention.prefix == "@"
+        )
+        self.__role_ids = frozenset(
+            mention.mentioned_id
+            for mention in self.__mentions
+            if mention.prefix == "@&"
+        )
+
+    @property
+    def mentions(self) -> tuple[Mention, ...]:
+        """The mentions the ACL was compiled from."""
+        return self.__mentions
+
+    def __iter__(self) -> Iterator[Mention]:
+        return iter(self.__mentions)
+
+    def __bool__(self) -> bool:
+        return bool(self.__mentions)
+
+    def includes_member(self, member: disnake.User | disnake.Member) -> bool:
+        """Check whether the given member, or any of their roles, is allowed.
+
+        Args:
+            member: The member to check.
+        """
+        if member.id in self.__member_ids:
+            return True
+        if not self.__role_ids or not isinstance(member, disnake.Member):
+            return False
+        # The @everyone role's ID is the guild's ID, and it isn't among the member's role IDs. The role IDs are read directly because Member.roles looks up and sorts a Role for each of them.
+        return member.guild.id in self.__role_ids or not self.__role_ids.isdisjoint(
+            member._roles  # noqa: SLF001
+        )
@@ -3,7 +3,8 @@ from dataclasses import dataclass
 from typing import Self, override
 
 import disnake
-import disnake.utils
+
+from . import name_index
 
 
 @dataclass(slots=True, frozen=True)
@@ -54,24 +55,12 @@ class Mention:
         name = name.removeprefix("@")
         if name == "everyone":
             return cls(prefix="@&", mentioned_id=guild.default_role.id)
-        if member := guild.get_member_named(name):
-            return cls(prefix="@", mentioned_id=member.id)
-        if role := disnake.utils.get(guild.roles, name=name):
-            return cls(prefix="@&", mentioned_id=role.id)
-        return None
-
-    def includes_member(self, member: disnake.User | disnake.Member) -> bool:
-        """Check if this mention mentions the given member or any of their roles.
-
-        Args:
-            member: The member to check.
-
-        Returns:
-            Whether this mention includes the given member.
-        """
-        return self.mentioned_id == member.id or (
-            isinstance(member, disnake.Member)
-            and self.mentioned_id in (role.id for role in member.roles)
+        found = name_index.resolve(guild, name)
+        if found is None:
+            return None
+        return cls(
+            prefix="@" if isinstance(found, disnake.Member) else "@&",
+            mentioned_id=found.id,
         )
 
     @override
@@ -0,0 +1,128 @@
+"""Indexes of the names of guilds' members and roles, so that named mentions resolve without scanning the guild.
+
+A guild's index is built the first time a name is resolved in it, and the presentation layer keeps it current by forwarding member and role events to the functions here. Every hit is checked against the guild's cache before it is returned, so an event which was missed can at worst cost a fallback to a scan, never a wrong result.
+"""
+
+from collections.abc import Iterable
+
+import disnake
+
+
+class _Names:
+    """A mapping from names to the IDs of the things which have them, in order of insertion."""
+
+    __slots__ = ("__ids", "__names")
+
+    def __init__(self) -> None:
+        self.__ids: dict[str, dict[int, None]] = {}
+        self.__names: dict[int, tuple[str, ...]] = {}
+
+    def add(self, object_id: int, names: Iterable[str]) -> None:
+        """Index an object under the given names, replacing the names it was indexed under before."""
+        self.remove(object_id)
+        self.__names[object_id] = tuple(names)
+        for name in self.__names[object_id]:
+            self.__ids.setdefault(name, {})[object_id] = None
+
+    def remove(self, object_id: int) -> None:
+        for name in self.__names.pop(object_id, ()):
+            ids = self.__ids[name]
+            del ids[object_id]
+            if not ids:
+                del self.__ids[name]
+
+    def candidates(self, name: str) -> list[int]:
+        """Get the IDs indexed under a name, in the order they were indexed."""
+        return list(self.__ids.get(name, ()))
+
+
+class _GuildIndex:
+    __slots__ = ("members", "roles")
+
+    def __init__(self, guild: disnake.Guild) -> None:
+        self.members = _Names()
+        self.roles = _Names()
+        for member in guild.members:
+            self.members.add(member.id, _member_names(member))
+        for role in guild.roles:
+            self.roles.add(role.id, (role.name,))
+
+
+_indexes: dict[int, _GuildIndex] = {}
+
+
+def resolve(guild: disnake.Guild, name: str) -> disnake.Member | disnake.Role | None:
+    """Find the member or role of a guild with the given name.
+
+    Members are matched by nickname, global name or username, and take precedence over roles. A name which matches neither index is looked for with a scan of the guild's members, in case a member was cached without an event (which also handles "name#discriminator").
+
+    Args:
+        guild: The guild to search.
+        name: The name to look for, without the @.
+    """
+    index = _indexes.get(guild.id)
+    if index is None:
+        index = _indexes[guild.id] = _GuildIndex(guild)
+    for member_id in index.members.candidates(name):
+        member = guild.get_member(member_id)
+        if member is None:
+            index.members.remove(member_id)
+        elif name in _member_names(member):
+            return member
+        else:
+            index.members.add(member.id, _member_names(member))
+    for role_id in index.roles.candidates(name):
+        role = guild.get_role(role_id)
+        if role is None:
+            index.roles.remove(role_id)
+        elif role.name == name:
+            return role
+        else:
+            index.roles.add(role.id, (role.name,))
+    if member := guild.get_member_named(name):
+        index.members.add(member.id, _member_names(member))
+        return member
+    return None
+
+
+def add_member(member: disnake.Member) -> None:
+    """Index a member who joined a guild, or update the names a member is indexed under."""
+    if index := _indexes.get(member.guild.id):
+        index.members.add(member.id, _member_names(member))
+
+
+def remove_member(member: disnake.Member) -> None:
+    """Stop indexing a member who left a guild."""
+    if index := _indexes.get(member.guild.id):
+        index.members.remove(member.id)
+
+
+def remove_user(user_id: int) -> None:
+    """Stop indexing a user in every guild, e.g. because their username or global name changed. They are indexed again under their new names the next time they are resolved."""
+    for index in _indexes.values():
+        index.members.remove(user_id)
+
+
+def add_role(role: disnake.Role) -> None:
+    """Index a role which was created, or update the name a role is indexed under."""
+    if index := _indexes.get(role.guild.id):
+        index.roles.add(role.id, (role.name,))
+
+
+def remove_role(role: disnake.Role) -> None:
+    """Stop indexing a role which was deleted."""
+    if index := _indexes.get(role.guild.id):
+        index.roles.remove(role.id)
+
+
+def forget_guild(guild_id: int) -> None:
+    """Drop the index of a guild the bot is no longer in."""
+    _indexes.pop(guild_id, None)
+
+
+def _member_names(member: disnake.Member) -> tuple[str, ...]:
+    return tuple(
+        dict.fromkeys(
+            name for name in (member.nick, member.global_name, member.name) if name
+        )
+    )
@@ -4,7 +4,6 @@ from collections.abc import Iterable
 from typing import TYPE_CHECKING
 
 from paul_bot import data
-from paul_bot.utils import background
 
 if TYPE_CHECKING:
     from paul_bot.application.poll import Poll
@@ -17,14 +16,24 @@ class Option:
         self,
         option_id: int | None,
         label: str,
-        votes: Iterable[int],
+        vote_count: int,
         poll: Poll,
         index: int,
         author_id: int | None,
     ) -> None:
+        """Construct an option.
+
+        Args:
+            option_id: The ID of the option, or None if it hasn't been added to the database yet.
+            label: The label of the option.
+            vote_count: The number of votes for the option.
+            poll: The poll that the option belongs to.
+            index: The index of the option in the poll.
+            author_id: The ID of the member who added the option, or None if the option existed from poll creation.
+        """
         self.__option_id = option_id
         self.__label = label
-        self.__votes = set(votes)
+        self.__vote_count = vote_count
         self.__poll = poll
         self.__index = index
         self.__author_id = author_id
@@ -43,11 +52,6 @@ class Option:
         """The label of the option."""
         return self.__label
 
-    @property
-    def votes(self) -> set[int]:
-        """The set of IDs of members who voted on this option."""
-        return self.__votes.copy()
-
     @property
     def poll(self) -> Poll:
         """The Poll that the option belongs to."""
@@ -66,54 +70,51 @@ class Option:
     @property
     def vote_count(self) -> int:
         """Get the number of votes for this option."""
-        return len(self.__votes)
+        return self.__vote_count
 
-    def remove_vote(self, voter_id: int) -> None:
-        """Remove a vote from the given user on this option. If no such vote exists, nothing happens.
+    def sync_vote_count(self, vote_count: int) -> None:
+        """Update the option's number of votes from the database's state after a vote on the poll changed.
 
-        This method does not remove the vote from the database. To remove the vote from the database, use the `delete_vote` method.
+        This method does not affect the database.
 
         Args:
-            voter_id: The ID of the user whose vote is to be removed.
+            vote_count: The option's number of votes according to the database.
         """
-        self.__votes.discard(voter_id)
+        self.__vote_count = vote_count
 
-    def delete_vote(self, voter_id: int) -> None:
-        """Delete a vote from the given user on this option. If no such vote exists, nothing happens.
+    async def toggle_vote(self, voter_id: int) -> None:
+        """Toggle a user's vote on this option. If the poll doesn't allow multiple votes, adding the vote removes the user's other votes on the poll.
 
-        This method deletes the vote from the database. To remove the vote from the option without affecting the database (for example if the vote has already been removed from the database), use the `remove_vote` method instead.
+        The database toggles the vote atomically in a single round trip, and the vote counts of the poll's options are then updated from its result, so they can't disagree with it. A result which arrives after that of a later toggle of the poll is ignored.
 
         Args:
-            voter_id: The ID of the user whose vote is to be deleted.
-        """
-        background(
-            data.cruds.votes_crud.delete_users_votes_from_option(
-                self.option_id, voter_id
-            )
-        )
-        self.remove_vote(voter_id)
-
-    def add_vote(self, voter_id: int) -> None:
-        """Add a vote from the given user on this option. If such a vote already exists, nothing happens. If the poll cannot have more than one vote per user, all other votes from this user are removed.
-
-        Args:
-            voter_id: The ID of the user whose vote is to be added.
+            voter_id: The ID of the user to toggle the vote of.
         """
-        if not self.poll.allow_multiple_votes:
-            self.poll.remove_votes_from(voter_id)
-        background(data.cruds.votes_crud.add(self.option_id, voter_id))
-        self.__votes.add(voter_id)
-
-    def toggle_vote(self, voter_id: int) -> None:
-        """Toggle a user's vote on this option. If adding their vote would cause too many votes from the same user, the rest of their votes are removed.
+        result = await data.cruds.votes_crud.toggle(self.option_id, voter_id)
+        # Syncing the version also keeps the announcement of this toggle from making the cache reload the poll
+        if not self.poll.sync_version(
+            result.previous_poll_version, result.poll_version
+        ):
+            return
+        for option in self.poll.options:
+            if (state := result.options.get(option.option_id)) is not None:
+                option.sync_vote_count(state[0])
+
+    async def fetch_voter_page(
+        self, limit: int, *, after: int | None = None, before: int | None = None
+    ) -> list[int]:
+        """Get one page of the IDs of the members who voted on this option from the database, in ascending order.
+
+        Voters are paginated by ID, so the cost doesn't depend on how many members voted.
 
         Args:
-            voter_id: The ID of the user to toggle the vote of.
+            limit: The most IDs to get.
+            after: Get the first IDs greater than this one. If neither this nor `before` is given, the page starts at the lowest ID.
+            before: Get the last IDs smaller than this one.
         """
-        if voter_id in self.__votes:
-            self.delete_vote(voter_id)
-        else:
-            self.add_vote(voter_id)
+        return await data.cruds.votes_crud.fetch_voter_page(
+            self.option_id, limit, after=after, before=before
+        )
 
     @classmethod
     async def create_option(
@@ -146,7 +147,7 @@ class Option:
             The new Option objects.
         """
         options = [
-            Option(None, label, (), poll, index, author_id)
+            Option(None, label, 0, poll, index, author_id)
             for index, label in enumerate(
                 labels,
                 start=max((option.index for option in poll.options), default=-1) + 1,
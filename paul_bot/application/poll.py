@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import logging
 from collections.abc import Iterable
+from contextlib import aclosing
 from datetime import UTC, datetime
 from typing import TYPE_CHECKING, Any
 
@@ -10,6 +11,8 @@ from disnake import Message
 from paul_bot import data
 from paul_bot.utils import background
 
+from . import poll_cache, shards
+from .acl import Acl
 from .mention import Mention
 from .option import Option
 
@@ -31,11 +34,17 @@ class Poll:
         "__author_id",
         "__channel_id",
         "__closed",
+        "__editors_acl",
         "__expires",
+        "__guild_id",
         "__message_id",
         "__options",
         "__poll_id",
         "__question",
+        "__synced_version",
+        "__version",
+        "__vote_viewers_acl",
+        "__voters_acl",
     )
 
     def __init__(
@@ -52,6 +61,8 @@ class Poll:
         message_id: int,
         channel_id: int,
         closed: bool,
+        guild_id: int | None,
+        version: int = 0,
     ) -> None:
         self.__poll_id = poll_id
         self.__question = question
@@ -61,9 +72,15 @@ class Poll:
         self.__allowed_vote_viewers = tuple(allowed_vote_viewers)
         self.__allowed_editors = tuple(allowed_editors)
         self.__allowed_voters = tuple(allowed_voters)
+        self.__vote_viewers_acl = Acl(self.__allowed_vote_viewers)
+        self.__editors_acl = Acl(self.__allowed_editors)
+        self.__voters_acl = Acl(self.__allowed_voters)
         self.__message_id = message_id
         self.__channel_id = channel_id
         self.__closed = closed
+        self.__guild_id = guild_id
+        self.__version = version
+        self.__synced_version = version
         self.__options: list[Option] = []
 
     @property
@@ -115,6 +132,21 @@ class Poll:
         """The mentions of the users or roles who are allowed to vote on the poll."""
         return self.__allowed_voters
 
+    @property
+    def vote_viewers_acl(self) -> Acl:
+        """The allowed vote viewers, compiled for checking members against."""
+        return self.__vote_viewers_acl
+
+    @property
+    def editors_acl(self) -> Acl:
+        """The allowed editors, compiled for checking members against."""
+        return self.__editors_acl
+
+    @property
+    def voters_acl(self) -> Acl:
+        """The allowed voters, compiled for checking members against."""
+        return self.__voters_acl
+
     @property
     def is_expired(self) -> bool:
         """True if the poll has expired, False otherwise."""
@@ -140,6 +172,35 @@ class Poll:
         """The ID of the channel containing the poll."""
         return self.__channel_id
 
+    @property
+    def guild_id(self) -> int | None:
+        """The ID of the guild containing the poll, or None if it isn't in a guild or was created before guilds were recorded."""
+        return self.__guild_id
+
+    @property
+    def version(self) -> int:
+        """The number of changes made to the poll in the database when it was loaded, advanced by `sync_version`. Used to tell whether a cached poll is out of date."""
+        return self.__version
+
+    def sync_version(self, previous_version: int, version: int) -> bool:
+        """Record that the poll was brought from one version to another by a change whose result is about to be applied to this object, such as toggling a vote on it.
+
+        If the poll had also changed elsewhere since this object's version, the version is kept, so that the poll is still known to be out of date.
+
+        Args:
+            previous_version: The poll's version in the database just before the change.
+            version: The poll's version in the database after the change.
+
+        Returns:
+            Whether the change's result should be applied. The results of concurrent changes can arrive in any order, so this is False if the result isn't newer than the poll as loaded and every result applied since, since applying it would overwrite newer state with stale state.
+        """
+        if version <= self.__synced_version:
+            return False
+        self.__synced_version = version
+        if previous_version == self.__version:
+            self.__version = version
+        return True
+
     async def new_option(self, label: str, author_id: int) -> Option:
         """Add an option to the poll.
 
@@ -152,43 +213,43 @@ class Poll:
         """
         option = await Option.create_option(label, self, author_id)
         self.add_option(option)
+        poll_cache.cache.index_options(self)
         return option
 
     def close(self) -> None:
         """Close the poll.
 
-        This function will mark it as closed and expired in the database and update the message accordingly.
+        This function will mark it as closed and expired in the database. The message is not updated.
+        """
+        Poll.close_all((self,))
+
+    @classmethod
+    def close_all(cls, polls: Iterable[Poll]) -> None:
+        """Close several polls at once, marking them as closed and expired in a single database update.
+
+        Polls which haven't expired yet have their expiry set to the current time. The polls' messages are not updated.
 
         Args:
-            bot: The bot to use to update the message.
+            polls: The polls to close.
         """
-        if not self.is_expired:
-            self.__expires = datetime.now(UTC)
-        assert self.__expires is not None
-        self.__closed = True
-        background(
-            data.cruds.polls_crud.update_expiry(self, self.__expires, closed=True)
-        )
+        now = datetime.now(UTC)
+        poll_ids: list[int] = []
+        for poll in polls:
+            if not poll.is_expired:
+                poll.__expires = now  # noqa: SLF001
+            poll.__closed = True  # noqa: SLF001
+            poll_ids.append(poll.poll_id)
+        if poll_ids:
+            background(data.cruds.polls_crud.close_all(poll_ids, now))
 
     def delete(self) -> None:
         """Delete the poll from the database.
 
         This function will delete the poll from the database and remove the message from the channel.
         """
+        poll_cache.cache.discard(self.poll_id)
         background(data.cruds.polls_crud.delete(self.poll_id))
 
-    def remove_votes_from(self, voter_id: int) -> None:
-        """Remove all votes from the given user on this poll.
-
-        Args:
-            voter_id: The ID of the user whose votes should be removed.
-        """
-        background(
-            data.cruds.votes_crud.delete_users_votes_from_poll(self.poll_id, voter_id)
-        )
-        for option in self.options:
-            option.remove_vote(voter_id)
-
     def add_option(self, option: Option) -> None:
         """Add option objects to the poll."""
         self.__options.append(option)
@@ -222,6 +283,7 @@ class Poll:
             message_id=message.id,
             channel_id=message.channel.id,
             closed=False,
+            guild_id=message.guild.id if message.guild else None,
         )
         poll.__poll_id = await data.cruds.polls_crud.add(poll)
         for option in await Option.create_options(params.options, poll):
@@ -232,19 +294,24 @@ class Poll:
             )
             poll.delete()
             raise RuntimeError("Could not options to the poll.")
-        return poll
+        return poll_cache.cache.put(poll)
 
     @classmethod
     async def fetch_by_id(cls, poll_id: int) -> Poll | None:
         """Get a poll by its ID.
 
+        If the poll is resident in the poll cache, the cached object is returned without querying the database.
+
         Args:
             poll_id: The ID of the poll to get.
 
         Returns:
             The poll with the given ID.
         """
-        return await data.cruds.polls_crud.fetch_by_id(poll_id)
+        if (poll := poll_cache.cache.get(poll_id)) is not None:
+            return poll
+        poll = await data.cruds.polls_crud.fetch_by_id(poll_id)
+        return poll_cache.cache.put(poll) if poll else None
 
     @classmethod
     async def fetch_option(cls, option_id: int) -> Option | None:
@@ -256,16 +323,19 @@ class Poll:
         Returns:
             The option with the given ID.
         """
-        poll = await data.cruds.polls_crud.fetch_by_option_id(option_id)
+        poll = poll_cache.cache.get_by_option(option_id)
         if poll is None:
-            return None
+            poll = await data.cruds.polls_crud.fetch_by_option_id(option_id)
+            if poll is None:
+                return None
+            poll = poll_cache.cache.put(poll)
         return next(
             (option for option in poll.options if option.option_id == option_id), None
         )
 
     @classmethod
     async def count(cls, **conditions: Any) -> int:
-        """Get the number of polls in the database.
+        """Get the number of polls in the database from guilds owned by this process's shards.
 
         Args:
             conditions: The conditions to filter the polls by.
@@ -273,13 +343,91 @@ class Poll:
         Returns:
             The number of polls.
         """
-        return await data.cruds.polls_crud.count(**conditions)
+        return await data.cruds.polls_crud.count(shards.ownership, **conditions)
+
+    @classmethod
+    async def fetch_many(cls, poll_ids: Iterable[int]) -> list[Poll]:
+        """Get several polls by their IDs, loading all those which aren't cached in a single query.
+
+        Args:
+            poll_ids: The IDs of the polls to get.
+
+        Returns:
+            The polls which were found, in no particular order.
+        """
+        polls: list[Poll] = []
+        missing: list[int] = []
+        for poll_id in poll_ids:
+            if (poll := poll_cache.cache.get(poll_id)) is not None:
+                polls.append(poll)
+            else:
+                missing.append(poll_id)
+        if missing:
+            polls.extend(
+                poll_cache.cache.put(poll)
+                for poll in await data.cruds.polls_crud.fetch_by_ids(missing)
+            )
+        return polls
+
+    @classmethod
+    async def preload_open(cls, batch_size: int, max_memory: int | None = None) -> int:
+        """Load the open polls owned by this process's shards into the poll cache, newest first, so that the first clicks after a restart don't each need a query.
+
+        Loading stops once the cache is full, so that older polls don't push newer ones out, or once the process uses more than `max_memory` bytes.
+
+        Args:
+            batch_size: The number of polls loaded from the database at a time.
+            max_memory: The most memory the process may use, in bytes, checked after each batch. None means there is no limit besides the cache's size.
+
+        Returns:
+            The number of polls which were added to the cache.
+        """
+        process = None
+        if max_memory is not None:
+            # psutil is only needed to enforce the memory limit
+            import psutil
+
+            process = psutil.Process()
+        loaded = 0
+        async with aclosing(
+            data.cruds.polls_crud.stream_open(shards.ownership, batch_size)
+        ) as batches:
+            async for batch in batches:
+                for poll in batch:
+                    if len(poll_cache.cache) >= poll_cache.cache.max_size:
+                        return loaded
+                    if poll_cache.cache.put(poll) is poll:
+                        loaded += 1
+                if (
+                    max_memory is not None
+                    and process is not None
+                    and process.memory_info().rss > max_memory
+                ):
+                    logger.warning(
+                        f"Stopped preloading polls after {loaded} since the memory limit of {max_memory // (1024 * 1024)} MB was reached."
+                    )
+                    return loaded
+        return loaded
+
+    @classmethod
+    async def close_expired(cls) -> list[int]:
+        """Close every open poll owned by this process's shards whose expiry date has passed, in a single database update.
+
+        This is meant for catching up on polls which expired while the bot was offline. The closed polls are dropped from the poll cache so that they are reloaded in their closed state, but their messages are not updated.
+
+        Returns:
+            The IDs of the polls which were closed.
+        """
+        poll_ids = await data.cruds.polls_crud.close_expired(shards.ownership)
+        for poll_id in poll_ids:
+            poll_cache.cache.discard(poll_id)
+        return poll_ids
 
     @classmethod
-    async def next_to_expire(cls) -> Poll | None:
-        """Get the poll that will expire next.
+    async def pending_expiries(cls) -> list[tuple[int, datetime]]:
+        """Get the ID and expiry time of every poll owned by this process's shards which is open but will expire.
 
         Returns:
-            The poll that will expire next.
+            A list of (poll ID, expiry time) pairs.
         """
-        return await data.cruds.polls_crud.next_to_expire()
+        return await data.cruds.polls_crud.pending_expiries(shards.ownership)
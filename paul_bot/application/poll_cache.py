@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from time import monotonic
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .poll import Poll
+
+
+@dataclass(slots=True)
+class CacheStats:
+    """Counters describing how effective a PollCache is."""
+
+    hits: int = 0
+    """The number of lookups that were served from the cache."""
+
+    misses: int = 0
+    """The number of lookups that had to go to the database."""
+
+    evictions: int = 0
+    """The number of polls that were dropped because the cache was full or they expired."""
+
+
+class PollCache:
+    """A bounded in-memory cache of live Poll objects.
+
+    Polls are keyed by their ID, with a secondary index from option ID to poll ID. The same Poll object is handed out for as long as it is resident, so any mutation made through it (votes, new options, closing) is seen by every subsequent lookup without going back to the database.
+
+    Polls are evicted in least recently used order once more than `max_size` are resident, and a poll which hasn't been accessed for `ttl` seconds is evicted on its next lookup. A poll is also evicted on its next lookup once a newer version of it than the resident one is announced with `mark_changed`, e.g. because another bot process changed it.
+    """
+
+    def __init__(self, max_size: int = 1000, ttl: float | None = 3600) -> None:
+        """Construct an empty cache.
+
+        Args:
+            max_size: The maximum number of polls to keep in memory. If 0, nothing is cached.
+            ttl: The number of seconds a poll may go without being accessed before it is evicted, or None to keep polls until they are pushed out by newer ones.
+        """
+        self.__max_size = max_size
+        self.__ttl = ttl
+        self.__polls: OrderedDict[int, tuple[Poll, float]] = OrderedDict()
+        self.__option_index: dict[int, int] = {}
+        # The latest announced version of each recently changed poll. Polls which aren't resident are included, since one may be loaded from before the change after the announcement arrives.
+        self.__changed: OrderedDict[int, int] = OrderedDict()
+        self.stats = CacheStats()
+
+    @property
+    def max_size(self) -> int:
+        """The maximum number of polls that may be resident at once."""
+        return self.__max_size
+
+    def __len__(self) -> int:
+        return len(self.__polls)
+
+    def get(self, poll_id: int) -> Poll | None:
+        """Get a resident poll by its ID, marking it as recently used.
+
+        Args:
+            poll_id: The ID of the poll to get.
+
+        Returns:
+            The cached poll, or None if it isn't resident.
+        """
+        entry = self.__polls.get(poll_id)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+        poll, last_access = entry
+        now = monotonic()
+        if self.__ttl is not None and now - last_access > self.__ttl:
+            self.__evict(poll_id)
+            self.stats.misses += 1
+            return None
+        if (version := self.__changed.get(poll_id)) is not None:
+            if version > poll.version:
+                self.__evict(poll_id)
+                self.stats.misses += 1
+                return None
+            del self.__changed[poll_id]
+        self.__polls[poll_id] = (poll, now)
+        self.__polls.move_to_end(poll_id)
+        self.stats.hits += 1
+        return poll
+
+    def get_by_option(self, option_id: int) -> Poll | None:
+        """Get the resident poll containing the given option.
+
+        Args:
+            option_id: The ID of the option whose poll to get.
+
+        Returns:
+            The cached poll, or None if it isn't resident.
+        """
+        poll_id = self.__option_index.get(option_id)
+        if poll_id is None:
+            self.stats.misses += 1
+            return None
+        return self.get(poll_id)
+
+    def put(self, poll: Poll) -> Poll:
+        """Make a poll resident in the cache.
+
+        If a poll with the same ID is already resident, that poll is kept and returned instead, so that callers which raced to load the same poll all end up sharing one object.
+
+        Args:
+            poll: The poll to cache.
+
+        Returns:
+            The resident poll with the given poll's ID.
+        """
+        if (entry := self.__polls.get(poll.poll_id)) is not None:
+            self.__polls.move_to_end(poll.poll_id)
+            return entry[0]
+        if self.__max_size <= 0:
+            return poll
+        self.__polls[poll.poll_id] = (poll, monotonic())
+        self.index_options(poll)
+        while len(self.__polls) > self.__max_size:
+            self.__evict(next(iter(self.__polls)))
+        return poll
+
+    def index_options(self, poll: Poll) -> None:
+        """Add the poll's options to the option index. This should be called whenever a resident poll gains an option.
+
+        Args:
+            poll: The poll whose options to index.
+        """
+        if poll.poll_id not in self.__polls:
+            return
+        for option in poll.options:
+            self.__option_index[option.option_id] = poll.poll_id
+
+    def mark_changed(self, poll_id: int, version: int) -> None:
+        """Record that a poll was changed in the database, so that it is evicted on its next lookup unless the resident poll is already up to date with the change.
+
+        The announcement of a change made by this process may arrive before the change's result is applied with `Poll.sync_version`. The poll is then still kept if the sync brings it up to the announced version, and evicted if another change was announced since.
+
+        Args:
+            poll_id: The ID of the changed poll.
+            version: The poll's version after the change.
+        """
+        if self.__max_size <= 0 or version <= self.__changed.get(poll_id, 0):
+            return
+        self.__changed[poll_id] = version
+        self.__changed.move_to_end(poll_id)
+        while len(self.__changed) > self.__max_size:
+            # A poll can't be checked against an announcement that is no longer kept, so drop it too
+            self.discard(self.__changed.popitem(last=False)[0])
+
+    def discard(self, poll_id: int) -> None:
+        """Remove a poll from the cache if it is resident.
+
+        Args:
+            poll_id: The ID of the poll to remove.
+        """
+        if (entry := self.__polls.pop(poll_id, None)) is not None:
+            self.__unindex(entry[0])
+
+    def clear(self) -> None:
+        """Remove every poll from the cache."""
+        self.__polls.clear()
+        self.__option_index.clear()
+        self.__changed.clear()
+
+    def __evict(self, poll_id: int) -> None:
+        self.discard(poll_id)
+        self.stats.evictions += 1
+
+    def __unindex(self, poll: Poll) -> None:
+        for option in poll.options:
+            self.__option_index.pop(option.option_id, None)
+
+
+cache = PollCache()
+"""The process-wide poll cache. It is replaced with a configured instance by `application.init()`."""
@@ -0,0 +1,58 @@
+import os
+from dataclasses import dataclass
+from typing import Self
+
+
+@dataclass(slots=True, frozen=True)
+class ShardOwnership:
+    """Which of the bot's gateway shards this process runs, and therefore which guilds' polls it is responsible for."""
+
+    shard_count: int | None = None
+    """The total number of shards across all processes, or None if this process runs every shard."""
+
+    shard_ids: frozenset[int] | None = None
+    """The IDs of the shards run by this process, or None if this process runs every shard."""
+
+    def owns(self, guild_id: int | None) -> bool:
+        """Check whether polls from the given guild are handled by this process.
+
+        Polls without a guild (i.e. those created before guilds were recorded) are handled by whichever process runs shard 0.
+
+        Args:
+            guild_id: The ID of the guild, or None if it is unknown.
+
+        Returns:
+            Whether this process owns the guild.
+        """
+        if self.shard_count is None or self.shard_ids is None:
+            return True
+        if guild_id is None:
+            return 0 in self.shard_ids
+        return (guild_id >> 22) % self.shard_count in self.shard_ids
+
+    @classmethod
+    def from_env(cls) -> Self:
+        """Read the shard configuration from the SHARD_COUNT and SHARD_IDS (comma separated) environment variables.
+
+        Raises:
+            ValueError: If SHARD_IDS is set without SHARD_COUNT, or contains an ID outside of the shard count.
+        """
+        shard_count = os.getenv("SHARD_COUNT")
+        shard_ids = os.getenv("SHARD_IDS")
+        if shard_count is None:
+            if shard_ids is not None:
+                raise ValueError("SHARD_IDS requires SHARD_COUNT to be set.")
+            return cls()
+        count = int(shard_count)
+        ids = (
+            frozenset(int(shard_id) for shard_id in shard_ids.split(","))
+            if shard_ids
+            else frozenset(range(count))
+        )
+        if any(shard_id not in range(count) for shard_id in ids):
+            raise ValueError(f"SHARD_IDS must be between 0 and {count - 1}.")
+        return cls(count, ids)
+
+
+ownership = ShardOwnership()
+"""The shards run by this process. It is replaced with the configured ownership by `application.init()`."""
@@ -1,19 +1,52 @@
 import os
+from collections.abc import Callable
 
-import asyncpg
+from paul_bot import startup
 
-from . import cruds
-from .options_crud import OptionsCrud
-from .polls_crud import PollsCrud
-from .votes_crud import VotesCrud
+from . import backend, cruds
+from .backend import Backend
 
 
 async def init() -> None:
-    pool = await asyncpg.create_pool(
-        os.environ["DATABASE_URL"],
-        min_size=1,
-        max_size=int(os.getenv("MAX_DB_CONNECTIONS", "5")),
-    )
-    cruds.polls_crud = PollsCrud(pool)
-    cruds.options_crud = OptionsCrud(pool)
-    cruds.votes_crud = VotesCrud(pool)
+    """Connect to the storage backend named by STORAGE_BACKEND and set up the cruds."""
+    name = os.getenv("STORAGE_BACKEND", "postgres")
+    with startup.phase(f"import {name} backend"):
+        backend_class = __backend_class(name)
+    with startup.phase(f"connect to {name} backend"):
+        backend.current = await backend_class.from_env()
+    cruds.polls_crud = backend.current.polls_crud
+    cruds.options_crud = backend.current.options_crud
+    cruds.votes_crud = backend.current.votes_crud
+
+
+async def watch_poll_changes(
+    on_change: Callable[[int, int], None], on_missed: Callable[[], None]
+) -> None:
+    """Start reporting changes which other bot processes make to polls, if the storage backend announces them (see `Backend.watch_poll_changes`)."""
+    await backend.current.watch_poll_changes(on_change, on_missed)
+
+
+async def close() -> None:
+    """Close the storage backend."""
+    await backend.current.close()
+
+
+def __backend_class(name: str) -> type[Backend]:
+    # Backends are imported lazily so that a backend's driver is only needed if it is used
+    match name:
+        case "postgres":
+            from .postgres import PostgresBackend
+
+            return PostgresBackend
+        case "sqlite":
+            from .sqlite import SqliteBackend
+
+            return SqliteBackend
+        case "memory":
+            from .memory import MemoryBackend
+
+            return MemoryBackend
+        case _:
+            raise ValueError(
+                f"Unknown STORAGE_BACKEND {name!r}. Expected postgres, sqlite or memory."
+            )
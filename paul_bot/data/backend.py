@@ -0,0 +1,43 @@
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from typing import Self
+
+from .cruds import OptionsCrud, PollsCrud, VotesCrud
+
+
+class Backend(ABC):
+    """Somewhere to store polls, providing a crud for each kind of data.
+
+    A backend is selected with the STORAGE_BACKEND environment variable when `paul_bot.data.init` is called.
+    """
+
+    def __init__(
+        self, polls_crud: PollsCrud, options_crud: OptionsCrud, votes_crud: VotesCrud
+    ) -> None:
+        self.polls_crud = polls_crud
+        self.options_crud = options_crud
+        self.votes_crud = votes_crud
+
+    @classmethod
+    @abstractmethod
+    async def from_env(cls) -> Self:
+        """Connect to the storage configured by environment variables, creating its schema if needed."""
+
+    async def watch_poll_changes(  # noqa: B027
+        self, on_change: Callable[[int, int], None], on_missed: Callable[[], None]
+    ) -> None:
+        """Start reporting changes which any process sharing the storage makes to polls, so that cached copies of them can be dropped.
+
+        Backends which don't announce changes ignore this, which is only correct if a single process uses the storage.
+
+        Args:
+            on_change: Called with the ID and new version of each changed poll.
+            on_missed: Called when changes may have gone unreported, e.g. after reconnecting.
+        """
+
+    async def close(self) -> None:  # noqa: B027
+        """Release the backend's resources."""
+
+
+current: Backend
+"""The backend in use, set by `paul_bot.data.init`."""
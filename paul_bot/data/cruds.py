@@ -1,19 +1,282 @@
-from abc import ABC
-from typing import TYPE_CHECKING
+from __future__ import annotations
 
-import asyncpg
+from abc import ABC, abstractmethod
+from collections.abc import AsyncGenerator, Callable, Coroutine, Iterable, Mapping
+from dataclasses import dataclass
+from datetime import datetime
+from functools import wraps
+from inspect import iscoroutinefunction
+from typing import TYPE_CHECKING, Any
+
+from paul_bot import metrics
+from paul_bot.application.mention import Mention
+from paul_bot.application.option import Option
 
 if TYPE_CHECKING:
-    from .options_crud import OptionsCrud
-    from .polls_crud import PollsCrud
-    from .votes_crud import VotesCrud
+    from paul_bot.application.poll import Poll
+    from paul_bot.application.shards import ShardOwnership
 
 
-polls_crud: "PollsCrud"
-options_crud: "OptionsCrud"
-votes_crud: "VotesCrud"
+polls_crud: PollsCrud
+options_crud: OptionsCrud
+votes_crud: VotesCrud
 
 
 class Crud(ABC):
-    def __init__(self, pool: asyncpg.Pool) -> None:
-        self.pool = pool
+    def __init_subclass__(cls) -> None:
+        # Time every public coroutine method so the metrics show where storage latency goes
+        super().__init_subclass__()
+        for name, value in list(vars(cls).items()):
+            if not name.startswith("_") and iscoroutinefunction(value):
+                setattr(cls, name, _timed(value, name))
+
+
+def _timed[**P, T](
+    method: Callable[P, Coroutine[Any, Any, T]], name: str
+) -> Callable[P, Coroutine[Any, Any, T]]:
+    @wraps(method)
+    async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+        with metrics.crud_latency.time(crud=type(args[0]).__name__, method=name):
+            return await method(*args, **kwargs)
+
+    return wrapper
+
+
+@dataclass(frozen=True, slots=True)
+class ToggledVote:
+    """The state of a poll after a vote on it was toggled."""
+
+    options: dict[int, tuple[int, bool]]
+    """The vote count of each of the poll's options, and whether the user votes on it now, by option ID. Empty if the option doesn't exist."""
+    previous_poll_version: int = 0
+    """The poll's version just before the toggle, or 0 if the option doesn't exist."""
+    poll_version: int = 0
+    """The poll's version after the toggle, which is greater than any version returned for earlier toggles of the poll, or 0 if the option doesn't exist."""
+
+
+class PollsCrud(Crud):
+    """Stores polls along with their options and permissions."""
+
+    @abstractmethod
+    async def add(self, poll: Poll) -> int:
+        """Add a poll, without its options.
+
+        Args:
+            poll: The poll to add.
+
+        Returns:
+            The poll's ID.
+        """
+
+    @abstractmethod
+    async def delete(self, poll_id: int) -> None:
+        """Delete a poll along with its options and votes.
+
+        Args:
+            poll_id: The ID of the poll to delete.
+        """
+
+    @abstractmethod
+    async def fetch_by_id(self, poll_id: int) -> Poll | None:
+        """Get a poll by its ID.
+
+        Args:
+            poll_id: The ID of the poll to fetch.
+
+        Returns:
+            The poll with the given ID, if found.
+        """
+
+    @abstractmethod
+    async def fetch_by_option_id(self, option_id: int) -> Poll | None:
+        """Get a poll by the ID of one of its options.
+
+        Args:
+            option_id: The ID of the option to fetch the poll for.
+
+        Returns:
+            The poll containing the given option, if found.
+        """
+
+    @abstractmethod
+    async def fetch_by_ids(self, poll_ids: Iterable[int]) -> list[Poll]:
+        """Get several polls by their IDs.
+
+        Args:
+            poll_ids: The IDs of the polls to fetch.
+
+        Returns:
+            The polls which were found, in no particular order.
+        """
+
+    @abstractmethod
+    async def close_all(self, poll_ids: Iterable[int], closed_at: datetime) -> None:
+        """Mark polls as closed, setting the expiry date of those which haven't expired yet to the closing time.
+
+        Args:
+            poll_ids: The IDs of the polls to close.
+            closed_at: The time at which the polls were closed.
+        """
+
+    @abstractmethod
+    async def close_expired(self, ownership: ShardOwnership) -> list[int]:
+        """Mark every open poll whose expiry date has passed as closed.
+
+        Args:
+            ownership: Only polls from guilds owned by these shards are closed.
+
+        Returns:
+            The IDs of the polls which were closed.
+        """
+
+    @abstractmethod
+    async def pending_expiries(
+        self, ownership: ShardOwnership
+    ) -> list[tuple[int, datetime]]:
+        """Get the ID and expiry date of every open poll which has an expiry date.
+
+        Args:
+            ownership: Only polls from guilds owned by these shards are included.
+        """
+
+    @abstractmethod
+    def stream_open(
+        self, ownership: ShardOwnership, batch_size: int
+    ) -> AsyncGenerator[list[Poll]]:
+        """Get every open poll in batches, newest first, without holding all of them in memory at once.
+
+        Args:
+            ownership: Only polls from guilds owned by these shards are included.
+            batch_size: The most polls in each batch.
+        """
+
+    @abstractmethod
+    async def count(self, ownership: ShardOwnership, **conditions: Any) -> int:
+        """Get the number of polls.
+
+        Args:
+            ownership: Only polls from guilds owned by these shards are counted.
+            conditions: Column names of the polls table mapped to the value the counted polls must have, e.g. `closed=True`.
+        """
+
+    @staticmethod
+    def _build_poll(
+        *,
+        poll_id: int,
+        question: str,
+        expires: datetime | None,
+        author_id: int,
+        allow_multiple_votes: bool,
+        allowed_vote_viewers: Iterable[tuple[str, int]],
+        allowed_editors: Iterable[tuple[str, int]],
+        allowed_voters: Iterable[tuple[str, int]],
+        message_id: int,
+        channel_id: int,
+        closed: bool,
+        guild_id: int | None,
+        options: Iterable[tuple[int, str, int | None, int, int]],
+        version: int = 0,
+    ) -> Poll:
+        """Construct a poll from stored values.
+
+        Args:
+            poll_id: The poll's ID.
+            question: The poll's question.
+            expires: When the poll expires, or None if it doesn't.
+            author_id: The ID of the member who created the poll.
+            allow_multiple_votes: Whether members may vote for several options.
+            allowed_vote_viewers: The (prefix, ID) pair of each mention allowed to see votes.
+            allowed_editors: The (prefix, ID) pair of each mention allowed to add options.
+            allowed_voters: The (prefix, ID) pair of each mention allowed to vote.
+            message_id: The ID of the poll's message.
+            channel_id: The ID of the channel containing the poll's message.
+            closed: Whether the poll has been closed.
+            guild_id: The ID of the poll's guild, if known.
+            options: The ID, label, author ID (None unless the option was added after the poll's creation), vote count and index of each option, in order of index.
+            version: The number of changes made to the poll.
+
+        Returns:
+            The poll, with its options but without their voters.
+        """
+        # must be imported here to avoid circular imports
+        from paul_bot.application.poll import Poll
+
+        poll = Poll(
+            poll_id=poll_id,
+            question=question,
+            expires=expires,
+            author_id=author_id,
+            allow_multiple_votes=allow_multiple_votes,
+            allowed_vote_viewers=(Mention(*m) for m in allowed_vote_viewers),
+            allowed_editors=(Mention(*m) for m in allowed_editors),
+            allowed_voters=(Mention(*m) for m in allowed_voters),
+            message_id=message_id,
+            channel_id=channel_id,
+            closed=closed,
+            guild_id=guild_id,
+            version=version,
+        )
+        for option_id, label, author, vote_count, index in options:
+            poll.add_option(
+                Option(
+                    option_id=option_id,
+                    label=label,
+                    vote_count=vote_count,
+                    poll=poll,
+                    index=index,
+                    author_id=author,
+                )
+            )
+        return poll
+
+
+class OptionsCrud(Crud):
+    """Stores the options of polls."""
+
+    @abstractmethod
+    async def add(self, options: Iterable[Option]) -> Mapping[int, int]:
+        """Add options of a poll.
+
+        Args:
+            options: The options to add.
+
+        Returns:
+            A mapping of the option index to the option's assigned ID.
+        """
+
+
+class VotesCrud(Crud):
+    """Stores votes. Every change is written immediately, as a single atomic toggle."""
+
+    @abstractmethod
+    async def toggle(self, option_id: int, voter_id: int) -> ToggledVote:
+        """Toggle a user's vote on an option in a single atomic change. If the option's poll doesn't allow multiple votes, adding the vote also removes the user's other votes on the poll.
+
+        Args:
+            option_id: The ID of the option to toggle the vote on.
+            voter_id: The ID of the user whose vote to toggle.
+
+        Returns:
+            The vote count of each of the poll's options and whether the user votes on it now, along with the poll's version before and after the toggle.
+        """
+
+    @abstractmethod
+    async def fetch_voter_page(
+        self,
+        option_id: int,
+        limit: int,
+        *,
+        after: int | None = None,
+        before: int | None = None,
+    ) -> list[int]:
+        """Get one page of the IDs of the users who voted on an option, paginated by voter ID so that the cost doesn't depend on how many users voted.
+
+        Args:
+            option_id: The ID of the option whose voters to fetch.
+            limit: The most voter IDs to get.
+            after: Get the first voters whose IDs are greater than this. If neither this nor `before` is given, the page starts at the first voter.
+            before: Get the last voters whose IDs are smaller than this.
+
+        Returns:
+            The voter IDs, in ascending order.
+        """
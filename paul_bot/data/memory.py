@@ -0,0 +1,290 @@
+from __future__ import annotations
+
+import logging
+from collections.abc import AsyncGenerator, Iterable, Mapping
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from itertools import batched, count
+from typing import TYPE_CHECKING, Any, Self, override
+
+from paul_bot.application.mention import Mention
+from paul_bot.application.option import Option
+
+from .backend import Backend
+from .cruds import OptionsCrud, PollsCrud, ToggledVote, VotesCrud
+
+if TYPE_CHECKING:
+    from paul_bot.application.poll import Poll
+    from paul_bot.application.shards import ShardOwnership
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class _PollRow:
+    # Field names match the columns of the polls table, so that `count` accepts the same conditions as other backends
+    question: str
+    author: int
+    expires: datetime | None
+    allow_multiple_votes: bool
+    message: int
+    channel: int
+    closed: bool
+    guild: int | None
+    allowed_vote_viewers: tuple[tuple[str, int], ...]
+    allowed_editors: tuple[tuple[str, int], ...]
+    allowed_voters: tuple[tuple[str, int], ...]
+    option_ids: list[int] = field(default_factory=list[int])
+    version: int = 0
+
+
+@dataclass(slots=True)
+class _OptionRow:
+    poll_id: int
+    label: str
+    author: int | None
+    index: int
+    voters: set[int] = field(default_factory=set[int])
+
+
+class MemoryStore:
+    """The data of a memory backend, shared by its cruds."""
+
+    def __init__(self) -> None:
+        self.polls: dict[int, _PollRow] = {}
+        self.options: dict[int, _OptionRow] = {}
+        self.__ids = count(1)
+
+    def next_id(self) -> int:
+        """Get an ID which hasn't been assigned to any poll or option yet."""
+        return next(self.__ids)
+
+
+class MemoryPollsCrud(PollsCrud):
+    def __init__(self, store: MemoryStore) -> None:
+        self.__store = store
+
+    @override
+    async def add(self, poll: Poll) -> int:
+        poll_id = self.__store.next_id()
+        self.__store.polls[poll_id] = _PollRow(
+            question=poll.question,
+            author=poll.author_id,
+            expires=poll.expires,
+            allow_multiple_votes=poll.allow_multiple_votes,
+            message=poll.message_id,
+            channel=poll.channel_id,
+            closed=False,
+            guild=poll.guild_id,
+            allowed_vote_viewers=_mention_tuples(poll.allowed_vote_viewers),
+            allowed_editors=_mention_tuples(poll.allowed_editors),
+            allowed_voters=_mention_tuples(poll.allowed_voters),
+        )
+        return poll_id
+
+    @override
+    async def delete(self, poll_id: int) -> None:
+        row = self.__store.polls.pop(poll_id, None)
+        if row is not None:
+            for option_id in row.option_ids:
+                del self.__store.options[option_id]
+
+    @override
+    async def fetch_by_id(self, poll_id: int) -> Poll | None:
+        return self.__build(poll_id)
+
+    @override
+    async def fetch_by_option_id(self, option_id: int) -> Poll | None:
+        option = self.__store.options.get(option_id)
+        return self.__build(option.poll_id) if option else None
+
+    @override
+    async def fetch_by_ids(self, poll_ids: Iterable[int]) -> list[Poll]:
+        return [poll for poll_id in poll_ids if (poll := self.__build(poll_id))]
+
+    @override
+    async def close_all(self, poll_ids: Iterable[int], closed_at: datetime) -> None:
+        for poll_id in poll_ids:
+            if row := self.__store.polls.get(poll_id):
+                if not row.closed:
+                    row.closed = True
+                    row.version += 1
+                if row.expires is None or row.expires > closed_at:
+                    row.expires = closed_at
+
+    @override
+    async def close_expired(self, ownership: ShardOwnership) -> list[int]:
+        now = datetime.now(UTC)
+        closed: list[int] = []
+        for poll_id, row in self.__store.polls.items():
+            if (
+                not row.closed
+                and row.expires is not None
+                and row.expires <= now
+                and ownership.owns(row.guild)
+            ):
+                row.closed = True
+                row.version += 1
+                closed.append(poll_id)
+        return closed
+
+    @override
+    async def pending_expiries(
+        self, ownership: ShardOwnership
+    ) -> list[tuple[int, datetime]]:
+        return [
+            (poll_id, row.expires)
+            for poll_id, row in self.__store.polls.items()
+            if row.expires is not None and not row.closed and ownership.owns(row.guild)
+        ]
+
+    @override
+    async def stream_open(
+        self, ownership: ShardOwnership, batch_size: int
+    ) -> AsyncGenerator[list[Poll]]:
+        poll_ids = [
+            poll_id
+            for poll_id, row in self.__store.polls.items()
+            if not row.closed and ownership.owns(row.guild)
+        ]
+        for batch in batched(sorted(poll_ids, reverse=True), batch_size, strict=False):
+            yield [poll for poll_id in batch if (poll := self.__build(poll_id))]
+
+    @override
+    async def count(self, ownership: ShardOwnership, **conditions: Any) -> int:
+        return sum(
+            ownership.owns(row.guild)
+            and all(
+                getattr(row, column) == value for column, value in conditions.items()
+            )
+            for row in self.__store.polls.values()
+        )
+
+    def __build(self, poll_id: int) -> Poll | None:
+        row = self.__store.polls.get(poll_id)
+        if row is None:
+            return None
+        options: list[tuple[int, str, int | None, int, int]] = []
+        for option_id in row.option_ids:
+            option = self.__store.options[option_id]
+            options.append(
+                (
+                    option_id,
+                    option.label,
+                    option.author,
+                    len(option.voters),
+                    option.index,
+                )
+            )
+        return self._build_poll(
+            poll_id=poll_id,
+            question=row.question,
+            expires=row.expires,
+            author_id=row.author,
+            allow_multiple_votes=row.allow_multiple_votes,
+            allowed_vote_viewers=row.allowed_vote_viewers,
+            allowed_editors=row.allowed_editors,
+            allowed_voters=row.allowed_voters,
+            message_id=row.message,
+            channel_id=row.channel,
+            closed=row.closed,
+            guild_id=row.guild,
+            options=sorted(options, key=lambda option: option[4]),
+            version=row.version,
+        )
+
+
+class MemoryOptionsCrud(OptionsCrud):
+    def __init__(self, store: MemoryStore) -> None:
+        self.__store = store
+
+    @override
+    async def add(self, options: Iterable[Option]) -> Mapping[int, int]:
+        ids: dict[int, int] = {}
+        for option in options:
+            poll = self.__store.polls[option.poll.poll_id]
+            if any(
+                self.__store.options[option_id].index == option.index
+                for option_id in poll.option_ids
+            ):
+                raise ValueError(
+                    f"Poll {option.poll.poll_id} already has an option at index {option.index}."
+                )
+            option_id = self.__store.next_id()
+            self.__store.options[option_id] = _OptionRow(
+                option.poll.poll_id, option.label, option.author_id, option.index
+            )
+            poll.option_ids.append(option_id)
+            poll.version += 1
+            ids[option.index] = option_id
+        return ids
+
+
+class MemoryVotesCrud(VotesCrud):
+    def __init__(self, store: MemoryStore) -> None:
+        self.__store = store
+
+    @override
+    async def toggle(self, option_id: int, voter_id: int) -> ToggledVote:
+        option = self.__store.options.get(option_id)
+        if option is None:
+            return ToggledVote({})
+        poll = self.__store.polls[option.poll_id]
+        if voter_id in option.voters:
+            option.voters.discard(voter_id)
+        else:
+            if not poll.allow_multiple_votes:
+                for other_id in poll.option_ids:
+                    self.__store.options[other_id].voters.discard(voter_id)
+            option.voters.add(voter_id)
+        previous_version = poll.version
+        poll.version += 1
+        result: dict[int, tuple[int, bool]] = {}
+        for other_id in poll.option_ids:
+            voters = self.__store.options[other_id].voters
+            result[other_id] = (len(voters), voter_id in voters)
+        return ToggledVote(
+            result, previous_poll_version=previous_version, poll_version=poll.version
+        )
+
+    @override
+    async def fetch_voter_page(
+        self,
+        option_id: int,
+        limit: int,
+        *,
+        after: int | None = None,
+        before: int | None = None,
+    ) -> list[int]:
+        option = self.__store.options.get(option_id)
+        if option is None:
+            return []
+        if before is not None:
+            return sorted(voter for voter in option.voters if voter < before)[-limit:]
+        return sorted(
+            voter for voter in option.voters if after is None or voter > after
+        )[:limit]
+
+
+class MemoryBackend(Backend):
+    """Keeps polls in memory, so they are lost when the bot stops. Meant for tests and benchmarks."""
+
+    def __init__(self, store: MemoryStore | None = None) -> None:
+        self.store = store or MemoryStore()
+        super().__init__(
+            MemoryPollsCrud(self.store),
+            MemoryOptionsCrud(self.store),
+            MemoryVotesCrud(self.store),
+        )
+
+    @override
+    @classmethod
+    async def from_env(cls) -> Self:
+        logger.warning(
+            "Polls are stored in memory and will be lost when the bot stops."
+        )
+        return cls()
+
+
+def _mention_tuples(mentions: Iterable[Mention]) -> tuple[tuple[str, int], ...]:
+    return tuple((mention.prefix, mention.mentioned_id) for mention in mentions)
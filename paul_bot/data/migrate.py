@@ -0,0 +1,122 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from importlib import resources
+
+import asyncpg
+
+logger = logging.getLogger(__name__)
+
+_LOCK_KEY = 0x7061756C  # "paul"
+_LOCK_RETRY_INTERVAL = 0.5
+_NO_TRANSACTION = "-- paul: no-transaction"
+
+EXPECTED_INDEXES = {
+    "unique_options_poll_id_index": "options (poll_id, index)",
+    "votes_pkey": "votes (option_id, voter_id)",
+    "votes_voter_id_index": "votes (voter_id)",
+    "open_polls_expires_index": "polls (expires) WHERE NOT closed",
+}
+"""The indexes that the hot paths rely on, mapped to a description of what they cover."""
+
+
+@dataclass(slots=True, frozen=True)
+class Migration:
+    """A numbered SQL script which brings the schema from one version to the next."""
+
+    version: int
+    """The number of the migration. Migrations are applied in ascending order of version."""
+
+    name: str
+    """The name of the migration's file, without the extension."""
+
+    sql: str
+    """The SQL to execute."""
+
+    @property
+    def transactional(self) -> bool:
+        """Whether the migration should run in a transaction. Migrations whose first line is `-- paul: no-transaction` (e.g. ones which create indexes concurrently) must contain a single statement."""
+        return not self.sql.startswith(_NO_TRANSACTION)
+
+
+def migrations() -> list[Migration]:
+    """Load the migrations bundled in the `migrations` directory.
+
+    Returns:
+        The migrations, sorted by version.
+    """
+    directory = resources.files(__package__) / "migrations"
+    return sorted(
+        (
+            Migration(
+                int(file.name.split("_", 1)[0]),
+                file.name.removesuffix(".sql"),
+                file.read_text(),
+            )
+            for file in directory.iterdir()
+            if file.name.endswith(".sql")
+        ),
+        key=lambda migration: migration.version,
+    )
+
+
+async def migrate(conn: asyncpg.Connection) -> None:
+    """Apply all migrations which haven't been applied yet.
+
+    An advisory lock is held while migrating so that several instances starting at once don't apply the same migration twice. Instances waiting for the lock poll for it rather than blocking on it, because a blocked `pg_advisory_lock` call is an open transaction, which a `CREATE INDEX CONCURRENTLY` run by the lock's holder would wait for forever.
+
+    Args:
+        conn: The connection to migrate through. Statements prepared on other connections before migrating may be invalidated, so this should run before the pool is created.
+    """
+    # The lock is held by another process, so there is no event to wait on
+    while not await conn.fetchval("SELECT pg_try_advisory_lock($1)", _LOCK_KEY):  # noqa: ASYNC110
+        await asyncio.sleep(_LOCK_RETRY_INTERVAL)
+    try:
+        await conn.execute(
+            "CREATE TABLE IF NOT EXISTS public.schema_migrations (version integer PRIMARY KEY, name text NOT NULL, applied_at timestamp with time zone DEFAULT now() NOT NULL)"
+        )
+        applied = {
+            record["version"]
+            for record in await conn.fetch("SELECT version FROM schema_migrations")
+        }
+        for migration in migrations():
+            if migration.version not in applied:
+                await __apply(conn, migration)
+    finally:
+        await conn.execute("SELECT pg_advisory_unlock($1)", _LOCK_KEY)
+
+
+async def __apply(conn: asyncpg.Connection, migration: Migration) -> None:
+    logger.info(f"Applying migration {migration.name}...")
+    record = "INSERT INTO schema_migrations (version, name) VALUES ($1, $2)"
+    if migration.transactional:
+        async with conn.transaction():
+            await conn.execute(migration.sql)
+            await conn.execute(record, migration.version, migration.name)
+    else:
+        await conn.execute(migration.sql)
+        await conn.execute(record, migration.version, migration.name)
+
+
+async def check_indexes(conn: asyncpg.Connection) -> None:
+    """Log a warning for each of the `EXPECTED_INDEXES` which is missing or invalid (e.g. because building it concurrently failed).
+
+    A failed `CREATE INDEX CONCURRENTLY` leaves an INVALID index behind, which Postgres still maintains on every write but never uses for queries. Because of `IF NOT EXISTS`, retrying the migration on the next start skips the leftover and records the migration as applied anyway, so it has to be dropped by hand.
+
+    Args:
+        conn: The connection to query.
+    """
+    records = await conn.fetch(
+        "SELECT c.relname AS name, i.indisvalid AS valid FROM pg_index AS i JOIN pg_class AS c ON c.oid = i.indexrelid WHERE c.relname = ANY($1::text[])",
+        list(EXPECTED_INDEXES),
+    )
+    valid = {record["name"]: record["valid"] for record in records}
+    for name, description in EXPECTED_INDEXES.items():
+        if name not in valid:
+            logger.warning(
+                f"Index {name} on {description} is missing. Queries relying on it will be slow."
+            )
+        elif not valid[name]:
+            logger.warning(
+                f"Index {name} on {description} is invalid. Drop it and remove its migration from schema_migrations so it is rebuilt on the next start."
+            )
@@ -0,0 +1,3 @@
+-- paul: no-transaction
+-- Speeds up looking up a user's votes, e.g. when removing their other votes from a single-vote poll.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS votes_voter_id_index ON public.votes (voter_id);
@@ -0,0 +1,3 @@
+-- paul: no-transaction
+-- Speeds up finding the open polls which expire next.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS open_polls_expires_index ON public.polls (expires) WHERE NOT closed;
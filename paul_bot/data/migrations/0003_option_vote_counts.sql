@@ -0,0 +1,40 @@
+-- Store the number of votes of each option alongside it, so that rendering a poll doesn't need to load every vote.
+ALTER TABLE public.options ADD COLUMN vote_count integer DEFAULT 0 NOT NULL;
+
+CREATE FUNCTION public.update_option_vote_counts() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+    UPDATE public.options
+    SET vote_count = options.vote_count + changes.delta
+    FROM (
+        SELECT option_id, (COUNT(*) * CASE TG_OP WHEN 'INSERT' THEN 1 ELSE -1 END)::integer AS delta
+        FROM changed_votes
+        GROUP BY option_id
+    ) AS changes
+    WHERE options.id = changes.option_id;
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER votes_inserted_update_option_vote_counts AFTER INSERT ON public.votes
+    REFERENCING NEW TABLE AS changed_votes
+    FOR EACH STATEMENT EXECUTE FUNCTION public.update_option_vote_counts();
+
+CREATE TRIGGER votes_deleted_update_option_vote_counts AFTER DELETE ON public.votes
+    REFERENCING OLD TABLE AS changed_votes
+    FOR EACH STATEMENT EXECUTE FUNCTION public.update_option_vote_counts();
+
+-- The triggers block concurrent votes until this transaction commits, so the counts can't drift while being backfilled.
+UPDATE public.options
+SET vote_count = counts.vote_count
+FROM (SELECT option_id, COUNT(*)::integer AS vote_count FROM public.votes GROUP BY option_id) AS counts
+WHERE options.id = counts.option_id;
+
+CREATE TYPE public.option_summary AS (
+    id integer,
+    label text,
+    author bigint,
+    vote_count integer,
+    index integer
+);
@@ -0,0 +1,2 @@
+-- Record which guild each poll belongs to, so that each shard only handles polls from the guilds it owns. Polls created before this migration have no guild.
+ALTER TABLE public.polls ADD COLUMN guild bigint;
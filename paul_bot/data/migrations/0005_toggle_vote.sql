@@ -0,0 +1,36 @@
+-- Toggle a member's vote on an option in a single round trip. If the option's poll doesn't allow multiple votes, adding the vote also removes the member's other votes on the poll.
+-- Toggles of the same poll are serialized by locking the poll's row, so two clicks can't both see the vote missing and the single vote rule can't be raced.
+-- Returns the vote count of each of the poll's options and whether the member votes on it now, or nothing if the option doesn't exist.
+CREATE FUNCTION public.toggle_vote(toggled_option_id integer, toggling_voter_id bigint)
+    RETURNS TABLE (option_id integer, vote_count integer, voted boolean)
+    LANGUAGE plpgsql
+    AS $$
+#variable_conflict use_column
+DECLARE
+    toggled_poll_id integer;
+    single_vote boolean;
+BEGIN
+    SELECT polls.id, NOT polls.allow_multiple_votes INTO toggled_poll_id, single_vote
+    FROM public.options JOIN public.polls ON polls.id = options.poll_id
+    WHERE options.id = toggled_option_id
+    FOR NO KEY UPDATE OF polls;
+    IF NOT FOUND THEN
+        RETURN;
+    END IF;
+    DELETE FROM public.votes WHERE votes.option_id = toggled_option_id AND votes.voter_id = toggling_voter_id;
+    IF NOT FOUND THEN
+        IF single_vote THEN
+            DELETE FROM public.votes USING public.options
+            WHERE votes.option_id = options.id AND options.poll_id = toggled_poll_id AND votes.voter_id = toggling_voter_id;
+        END IF;
+        INSERT INTO public.votes (option_id, voter_id) VALUES (toggled_option_id, toggling_voter_id)
+            -- Every vote is written by this function under the poll's lock, so a conflict isn't expected; this only keeps one from failing the toggle
+            ON CONFLICT DO NOTHING;
+    END IF;
+    -- The vote count triggers have run by now, since each statement's triggers fire when it finishes
+    RETURN QUERY
+        SELECT options.id, options.vote_count, EXISTS (SELECT FROM public.votes WHERE votes.option_id = options.id AND votes.voter_id = toggling_voter_id)
+        FROM public.options
+        WHERE options.poll_id = toggled_poll_id;
+END;
+$$;
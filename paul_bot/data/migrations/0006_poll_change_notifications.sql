@@ -0,0 +1,115 @@
+-- Number the changes to each poll, and announce every change on the poll_changes channel as "<poll ID>:<version>" once it commits, so that other bot processes can drop their cached copy of the poll.
+ALTER TABLE public.polls ADD COLUMN version bigint DEFAULT 0 NOT NULL;
+
+CREATE FUNCTION public.bump_poll_versions(poll_ids integer[]) RETURNS void
+    LANGUAGE plpgsql
+    AS $$
+DECLARE
+    changed record;
+BEGIN
+    -- Lock the polls in a consistent order, so that two writes which each change several polls can't deadlock
+    PERFORM 1 FROM public.polls WHERE polls.id = ANY(poll_ids) ORDER BY polls.id FOR NO KEY UPDATE;
+    FOR changed IN
+        UPDATE public.polls SET version = polls.version + 1 WHERE polls.id = ANY(poll_ids) RETURNING polls.id, polls.version
+    LOOP
+        PERFORM pg_notify('poll_changes', changed.id || ':' || changed.version);
+    END LOOP;
+END;
+$$;
+
+CREATE FUNCTION public.votes_changed_bump_poll_versions() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+    PERFORM public.bump_poll_versions(ARRAY(
+        SELECT DISTINCT options.poll_id FROM changed_votes JOIN public.options ON options.id = changed_votes.option_id
+    ));
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER votes_inserted_bump_poll_versions AFTER INSERT ON public.votes
+    REFERENCING NEW TABLE AS changed_votes
+    FOR EACH STATEMENT EXECUTE FUNCTION public.votes_changed_bump_poll_versions();
+
+CREATE TRIGGER votes_deleted_bump_poll_versions AFTER DELETE ON public.votes
+    REFERENCING OLD TABLE AS changed_votes
+    FOR EACH STATEMENT EXECUTE FUNCTION public.votes_changed_bump_poll_versions();
+
+CREATE FUNCTION public.options_inserted_bump_poll_versions() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+    PERFORM public.bump_poll_versions(ARRAY(SELECT DISTINCT poll_id FROM inserted_options));
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER options_inserted_bump_poll_versions AFTER INSERT ON public.options
+    REFERENCING NEW TABLE AS inserted_options
+    FOR EACH STATEMENT EXECUTE FUNCTION public.options_inserted_bump_poll_versions();
+
+-- Transition tables can't be combined with a column list, so closing is handled row by row. Bumping the version in the row being updated needs no extra update.
+CREATE FUNCTION public.poll_closed_bump_version() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+    NEW.version := OLD.version + 1;
+    PERFORM pg_notify('poll_changes', NEW.id || ':' || NEW.version);
+    RETURN NEW;
+END;
+$$;
+
+CREATE TRIGGER poll_closed_bump_version BEFORE UPDATE OF closed ON public.polls
+    FOR EACH ROW WHEN (OLD.closed IS DISTINCT FROM NEW.closed)
+    EXECUTE FUNCTION public.poll_closed_bump_version();
+
+CREATE FUNCTION public.poll_deleted_notify() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+    PERFORM pg_notify('poll_changes', OLD.id || ':' || (OLD.version + 1));
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER poll_deleted_notify AFTER DELETE ON public.polls
+    FOR EACH ROW EXECUTE FUNCTION public.poll_deleted_notify();
+
+-- Also return the poll's version before and after the toggle, so that the process which toggled the vote can tell whether its cached poll is up to date, or whether the poll also changed elsewhere in between.
+DROP FUNCTION public.toggle_vote(integer, bigint);
+
+CREATE FUNCTION public.toggle_vote(toggled_option_id integer, toggling_voter_id bigint)
+    RETURNS TABLE (option_id integer, vote_count integer, voted boolean, previous_poll_version bigint, poll_version bigint)
+    LANGUAGE plpgsql
+    AS $$
+#variable_conflict use_column
+DECLARE
+    toggled_poll_id integer;
+    single_vote boolean;
+    previous_version bigint;
+BEGIN
+    SELECT polls.id, NOT polls.allow_multiple_votes, polls.version INTO toggled_poll_id, single_vote, previous_version
+    FROM public.options JOIN public.polls ON polls.id = options.poll_id
+    WHERE options.id = toggled_option_id
+    FOR NO KEY UPDATE OF polls;
+    IF NOT FOUND THEN
+        RETURN;
+    END IF;
+    DELETE FROM public.votes WHERE votes.option_id = toggled_option_id AND votes.voter_id = toggling_voter_id;
+    IF NOT FOUND THEN
+        IF single_vote THEN
+            DELETE FROM public.votes USING public.options
+            WHERE votes.option_id = options.id AND options.poll_id = toggled_poll_id AND votes.voter_id = toggling_voter_id;
+        END IF;
+        INSERT INTO public.votes (option_id, voter_id) VALUES (toggled_option_id, toggling_voter_id)
+            -- Every vote is written by this function under the poll's lock, so a conflict isn't expected; this only keeps one from failing the toggle
+            ON CONFLICT DO NOTHING;
+    END IF;
+    -- The vote count and version triggers have run by now, since each statement's triggers fire when it finishes
+    RETURN QUERY
+        SELECT options.id, options.vote_count, EXISTS (SELECT FROM public.votes WHERE votes.option_id = options.id AND votes.voter_id = toggling_voter_id), previous_version, polls.version
+        FROM public.options JOIN public.polls ON polls.id = options.poll_id
+        WHERE options.poll_id = toggled_poll_id;
+END;
+$$;
@@ -0,0 +1,89 @@
+import asyncio
+import logging
+from asyncio import Task
+from collections.abc import Callable
+
+import asyncpg
+
+from paul_bot.utils import background
+
+logger = logging.getLogger(__name__)
+
+
+class PollChangeListener:
+    """Listens on a dedicated connection for the changes to polls which the database announces on the poll_changes channel (see migration 0006).
+
+    If the connection is lost, it is reopened with exponential backoff. Changes made in the meantime were never delivered, so `on_missed` is called once listening resumes.
+    """
+
+    CHANNEL = "poll_changes"
+    MAX_RECONNECT_DELAY = 60
+
+    def __init__(
+        self,
+        dsn: str,
+        on_change: Callable[[int, int], None],
+        on_missed: Callable[[], None],
+    ) -> None:
+        """Construct a listener. It doesn't listen until `start` is awaited.
+
+        Args:
+            dsn: The database to listen to. It must be a direct connection rather than one through a transaction pooler, which can't keep a session listening.
+            on_change: Called with the ID and new version of each changed poll.
+            on_missed: Called after reconnecting, since any change may have been missed.
+        """
+        self.__dsn = dsn
+        self.__on_change = on_change
+        self.__on_missed = on_missed
+        self.__conn: asyncpg.Connection | None = None
+        self.__reconnector: Task[None] | None = None
+        self.__closed = False
+
+    async def start(self) -> None:
+        """Connect and start listening."""
+        await self.__connect()
+
+    async def close(self) -> None:
+        """Stop listening and close the connection."""
+        self.__closed = True
+        if self.__reconnector is not None:
+            self.__reconnector.cancel()
+        if self.__conn is not None:
+            await self.__conn.close()
+
+    async def __connect(self) -> None:
+        conn = await asyncpg.connect(self.__dsn)
+        conn.add_termination_listener(self.__on_terminated)
+        await conn.add_listener(self.CHANNEL, self.__on_notification)
+        self.__conn = conn
+
+    def __on_notification(
+        self, _conn: object, _pid: int, channel: str, payload: object
+    ) -> None:
+        poll_id, _, version = str(payload).partition(":")
+        try:
+            self.__on_change(int(poll_id), int(version))
+        except ValueError:
+            logger.warning(f"Ignoring malformed {channel} notification {payload!r}.")
+
+    def __on_terminated(self, _conn: object) -> None:
+        if self.__closed:
+            return
+        logger.warning("Lost the connection listening for poll changes. Reconnecting.")
+        self.__conn = None
+        self.__reconnector = background(self.__reconnect())
+
+    async def __reconnect(self) -> None:
+        delay = 1
+        while True:
+            try:
+                await self.__connect()
+                break
+            except (OSError, asyncpg.PostgresError) as e:
+                logger.warning(
+                    f"Failed to reconnect to listen for poll changes, retrying in {delay}s: {e}"
+                )
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.MAX_RECONNECT_DELAY)
+        logger.info("Listening for poll changes again.")
+        self.__on_missed()
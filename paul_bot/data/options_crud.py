@@ -1,12 +1,24 @@
 from collections.abc import Iterable, Mapping
+from typing import override
+
+import asyncpg
 
 from paul_bot.application.option import Option
 
-from . import sql
-from .cruds import Crud
+from .cruds import OptionsCrud
+from .sql import prepared
+
+
+class PostgresOptionsCrud(OptionsCrud):
+    _INSERT = prepared.register(
+        "insert_options",
+        "INSERT INTO options (label, poll_id, author, index) SELECT * FROM unnest($1::text[], $2::integer[], $3::bigint[], $4::integer[]) RETURNING id, index",
+    )
 
+    def __init__(self, pool: asyncpg.Pool) -> None:
+        self.pool = pool
 
-class OptionsCrud(Crud):
+    @override
     async def add(self, options: Iterable[Option]) -> Mapping[int, int]:
         """Add options of a poll to the database.
 
@@ -16,14 +28,13 @@ class OptionsCrud(Crud):
         Returns:
             A mapping of the option index to the option's ID as assigned by the database.
         """
-        records = await sql.insert.many(
+        options = list(options)
+        records = await prepared.fetch(
             self.pool,
-            "options",
-            ("label", "poll_id", "author", "index"),
-            [
-                (option.label, option.poll.poll_id, option.author_id, option.index)
-                for option in options
-            ],
-            returning=("id", "index"),
+            self._INSERT,
+            [option.label for option in options],
+            [option.poll.poll_id for option in options],
+            [option.author_id for option in options],
+            [option.index for option in options],
         )
         return {r["index"]: r["id"] for r in records}
@@ -1,17 +1,20 @@
 from __future__ import annotations
 
 import logging
-from collections.abc import Iterable
+from collections.abc import AsyncGenerator, Iterable, Sequence
+from contextlib import aclosing
 from datetime import datetime
-from typing import TYPE_CHECKING, Any, cast
+from typing import TYPE_CHECKING, Any, ClassVar, cast, override
 
 import asyncpg
 
 from paul_bot.application.mention import Mention
-from paul_bot.application.option import Option
+from paul_bot.application.shards import ShardOwnership
 
 from . import sql
-from .cruds import Crud
+from .cruds import PollsCrud
+from .sql import prepared
+from .sql.util import split_dict
 
 if TYPE_CHECKING:
     from paul_bot.application.poll import Poll
@@ -19,24 +22,84 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
-class PollsCrud(Crud):
-    _TABLE = "polls"
-    _VIEW = "polls_extended_view"
-    _COLUMNS = (
-        "id",
-        "question",
-        "expires",
-        "author",
-        "allow_multiple_votes",
-        "message",
-        "channel",
-        "closed",
-        "options",
-        "allowed_editors",
-        "allowed_vote_viewers",
-        "allowed_voters",
+class PostgresPollsCrud(PollsCrud):
+    # Selects the polls owned by the shards given as the shard count ($1) and shard IDs ($2). If the shard count is NULL, every poll is selected.
+    _OWNED = "($1::integer IS NULL OR (polls.guild IS NULL AND 0 = ANY($2::integer[])) OR (polls.guild >> 22) % $1 = ANY($2::integer[]))"
+    # Unlike polls_extended_view, options and permissions are aggregated in correlated subqueries, so only the rows belonging to the polls selected by the appended WHERE clause are ever aggregated. Options carry only their vote count; voters are fetched a page at a time by Option.fetch_voter_page.
+    _HYDRATE_QUERY = """
+        SELECT
+            polls.id,
+            polls.question,
+            polls.expires,
+            polls.author,
+            polls.allow_multiple_votes,
+            polls.message,
+            polls.channel,
+            polls.closed,
+            polls.guild,
+            polls.version,
+            (
+                SELECT COALESCE(array_agg(ROW(options.id, options.label, options.author, options.vote_count, options.index)::option_summary ORDER BY options.index), '{}')
+                FROM options
+                WHERE options.poll_id = polls.id
+            ) AS options,
+            (
+                SELECT COALESCE(array_agg(ROW(mention_prefix, mention_id)::mention), '{}')
+                FROM allowed_editors WHERE allowed_editors.poll_id = polls.id
+            ) AS allowed_editors,
+            (
+                SELECT COALESCE(array_agg(ROW(mention_prefix, mention_id)::mention), '{}')
+                FROM allowed_vote_viewers WHERE allowed_vote_viewers.poll_id = polls.id
+            ) AS allowed_vote_viewers,
+            (
+                SELECT COALESCE(array_agg(ROW(mention_prefix, mention_id)::mention), '{}')
+                FROM allowed_voters WHERE allowed_voters.poll_id = polls.id
+            ) AS allowed_voters
+        FROM polls
+    """
+    _INSERT = prepared.register(
+        "insert_poll",
+        "INSERT INTO polls (question, author, expires, allow_multiple_votes, message, channel, guild) VALUES ($1, $2, $3, $4, $5, $6, $7) RETURNING id",
     )
+    _INSERT_PERMISSIONS: ClassVar[dict[str, str]] = {
+        table: prepared.register(
+            f"insert_{table}",
+            f"INSERT INTO {table} (poll_id, mention_prefix, mention_id) SELECT $1, * FROM unnest($2::varchar[], $3::bigint[]) ON CONFLICT DO NOTHING",
+        )
+        for table in ("allowed_vote_viewers", "allowed_editors", "allowed_voters")
+    }
+    _DELETE = prepared.register("delete_poll", "DELETE FROM polls WHERE id = $1")
+    _FETCH_BY_ID = prepared.register(
+        "fetch_poll_by_id", f"{_HYDRATE_QUERY} WHERE polls.id = $1"
+    )
+    _FETCH_BY_OPTION_ID = prepared.register(
+        "fetch_poll_by_option_id",
+        f"{_HYDRATE_QUERY} WHERE polls.id = (SELECT poll_id FROM options WHERE id = $1)",
+    )
+    _FETCH_BY_IDS = prepared.register(
+        "fetch_polls_by_ids", f"{_HYDRATE_QUERY} WHERE polls.id = ANY($1::integer[])"
+    )
+    _CLOSE_ALL = prepared.register(
+        "close_polls",
+        "UPDATE polls SET closed = true, expires = LEAST(expires, $2) WHERE id = ANY($1::integer[])",
+    )
+    _CLOSE_EXPIRED = prepared.register(
+        "close_expired_polls",
+        f"UPDATE polls SET closed = true WHERE NOT closed AND expires <= now() AND {_OWNED} RETURNING id",
+    )
+    _PENDING_EXPIRIES = prepared.register(
+        "pending_poll_expiries",
+        f"SELECT id, expires FROM polls WHERE expires IS NOT NULL AND NOT closed AND {_OWNED}",
+    )
+    # Streamed through a cursor rather than prepared up front, since it only runs once per start
+    _OPEN = (
+        f"{_HYDRATE_QUERY} WHERE NOT polls.closed AND {_OWNED} ORDER BY polls.id DESC"
+    )
+
+    def __init__(self, pool: asyncpg.Pool) -> None:
+        self.pool = pool
 
+    @override
     async def add(self, poll: Poll) -> int:
         """Add a poll to the database.
 
@@ -46,34 +109,37 @@ class PollsCrud(Crud):
         Returns:
             The poll's ID.
         """
-        poll_id: int = await sql.insert.one(
-            self.pool,
-            self._TABLE,
-            returning="id",
-            question=poll.question,
-            author=poll.author_id,
-            expires=poll.expires,
-            allow_multiple_votes=poll.allow_multiple_votes,
-            message=poll.message_id,
-            channel=poll.channel_id,
-        )
-        await self.__insert_permissions(
-            "allowed_vote_viewers", poll.allowed_vote_viewers, poll_id
-        )
-        await self.__insert_permissions(
-            "allowed_editors", poll.allowed_editors, poll_id
-        )
-        await self.__insert_permissions("allowed_voters", poll.allowed_voters, poll_id)
+        async with self.pool.acquire() as connection, connection.transaction():  # pyright: ignore[reportUnknownVariableType, reportUnknownMemberType]
+            conn = cast(prepared.Connection, connection)
+            poll_id: int = await prepared.fetchval(
+                conn,
+                self._INSERT,
+                poll.question,
+                poll.author_id,
+                poll.expires,
+                poll.allow_multiple_votes,
+                poll.message_id,
+                poll.channel_id,
+                poll.guild_id,
+            )
+            for table, mentions in (
+                ("allowed_vote_viewers", poll.allowed_vote_viewers),
+                ("allowed_editors", poll.allowed_editors),
+                ("allowed_voters", poll.allowed_voters),
+            ):
+                await self.__insert_permissions(conn, table, mentions, poll_id)
         return poll_id
 
+    @override
     async def delete(self, poll_id: int) -> None:
         """Delete a poll from the database.
 
         Args:
                 poll_id (int): The ID of the poll to delete.
         """
-        await sql.delete(self.pool, "polls", id=poll_id)
+        await prepared.fetch(self.pool, self._DELETE, poll_id)
 
+    @override
     async def fetch_by_id(self, poll_id: int) -> Poll | None:
         """Get a poll from the database by its ID.
 
@@ -83,9 +149,9 @@ class PollsCrud(Crud):
         Returns:
             The poll with the given ID.
         """
-        record = await sql.select.one(self.pool, self._VIEW, self._COLUMNS, id=poll_id)
-        return self.__init_poll(record) if record else None
+        return await self.__fetch_one(self._FETCH_BY_ID, poll_id)
 
+    @override
     async def fetch_by_option_id(self, option_id: int) -> Poll | None:
         """Get a poll from the database by an option ID.
 
@@ -95,111 +161,166 @@ class PollsCrud(Crud):
         Returns:
             The poll containing the given option, if found.
         """
-        record = cast(
-            asyncpg.Record | None,
-            await self.pool.fetchrow(
-                f"SELECT {', '.join(self._COLUMNS)} FROM {self._VIEW} WHERE id = (SELECT poll_id FROM options WHERE id = $1)",
-                option_id,
-            ),
-        )
-        return self.__init_poll(record) if record else None
+        return await self.__fetch_one(self._FETCH_BY_OPTION_ID, option_id)
+
+    @override
+    async def fetch_by_ids(self, poll_ids: Iterable[int]) -> list[Poll]:
+        """Get several polls from the database by their IDs.
+
+        Args:
+            poll_ids: The IDs of the polls to fetch.
 
-    async def update_expiry(self, poll: Poll, expires: datetime, closed: bool) -> None:
-        """Update the expiry date of a poll and set its closed status accordingly.
+        Returns:
+            The polls which were found, in no particular order.
+        """
+        records = await prepared.fetch(self.pool, self._FETCH_BY_IDS, list(poll_ids))
+        return [self.__init_poll(record) for record in records]
+
+    @override
+    async def close_all(self, poll_ids: Iterable[int], closed_at: datetime) -> None:
+        """Mark polls as closed, setting the expiry date of those which haven't expired yet to the closing time.
 
         Args:
-            poll: The poll to update.
-            expires: The new expiry date.
-            closed: Whether the poll has been closed.
+            poll_ids: The IDs of the polls to close.
+            closed_at: The time at which the polls were closed.
         """
-        await sql.update(
-            self.pool,
-            self._TABLE,
-            set={"expires": expires, "closed": closed},
-            where={"id": poll.poll_id},
+        await prepared.fetch(self.pool, self._CLOSE_ALL, list(poll_ids), closed_at)
+
+    @override
+    async def close_expired(self, ownership: ShardOwnership) -> list[int]:
+        """Mark every open poll whose expiry date has passed as closed.
+
+        Args:
+            ownership: Only polls from guilds owned by these shards are closed.
+
+        Returns:
+            The IDs of the polls which were closed.
+        """
+        # Run once at startup, when every poll which expired while the bot was offline is closed at once
+        async with prepared.untimed_transaction(self.pool) as conn:
+            records = await prepared.fetch(
+                conn, self._CLOSE_EXPIRED, *self.__shard_args(ownership)
+            )
+        return [record["id"] for record in records]
+
+    @override
+    async def pending_expiries(
+        self, ownership: ShardOwnership
+    ) -> list[tuple[int, datetime]]:
+        """Get the ID and expiry date of every open poll which has an expiry date.
+
+        Args:
+            ownership: Only polls from guilds owned by these shards are included.
+        """
+        records = await prepared.fetch(
+            self.pool, self._PENDING_EXPIRIES, *self.__shard_args(ownership)
         )
+        return [(record["id"], record["expires"]) for record in records]
+
+    @override
+    async def stream_open(
+        self, ownership: ShardOwnership, batch_size: int
+    ) -> AsyncGenerator[list[Poll]]:
+        """Get every open poll from the database in batches, newest first, through a server-side cursor.
+
+        Args:
+            ownership: Only polls from guilds owned by these shards are included.
+            batch_size: The most polls in each batch, which is also how many rows are fetched from the server at a time.
+        """
+        batch: list[Poll] = []
+        async with aclosing(
+            sql.select.stream(
+                self.pool,
+                self._OPEN,
+                *self.__shard_args(ownership),
+                prefetch=batch_size,
+            )
+        ) as records:
+            async for record in records:
+                batch.append(self.__init_poll(record))
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+        if batch:
+            yield batch
 
-    async def count(self, **conditions: Any) -> int:
+    @override
+    async def count(self, ownership: ShardOwnership, **conditions: Any) -> int:
         """Get the number of polls in the database.
 
         Args:
+            ownership: Only polls from guilds owned by these shards are counted.
             conditions: The conditions to filter the polls by.
         """
-        return await sql.select.value(self.pool, self._TABLE, "COUNT(*)", **conditions)
+        columns, values = split_dict(conditions)
+        # The placeholders of the conditions follow the two in _OWNED
+        filters = "".join(
+            f" AND polls.{column} = ${i}" for i, column in enumerate(columns, start=3)
+        )
+        # Scans every poll, so it can't be bounded by the hot path's statement timeout
+        async with prepared.untimed_transaction(self.pool, readonly=True) as conn:
+            return cast(
+                int,
+                await conn.fetchval(
+                    f"SELECT COUNT(*) FROM polls WHERE {self._OWNED}{filters}",
+                    *self.__shard_args(ownership),
+                    *values,
+                ),
+            )
 
     async def __insert_permissions(
-        self, table: str, mentions: Iterable[Mention], poll_id: int
+        self,
+        conn: prepared.Connection,
+        table: str,
+        mentions: Sequence[Mention],
+        poll_id: int,
     ) -> None:
-        await sql.insert.many(
-            self.pool,
-            table,
-            ("poll_id", "mention_prefix", "mention_id"),
-            [(poll_id, mention.prefix, mention.mentioned_id) for mention in mentions],
-            on_conflict="DO NOTHING",
-        )
+        prefixes = [mention.prefix for mention in mentions]
+        if prefixes:
+            await prepared.fetch(
+                conn,
+                self._INSERT_PERMISSIONS[table],
+                poll_id,
+                prefixes,
+                [mention.mentioned_id for mention in mentions],
+            )
 
-    async def next_to_expire(self) -> Poll | None:
-        """Get the poll that will expire next."""
-        record = cast(
-            asyncpg.Record | None,
-            await self.pool.fetchrow(
-                f"SELECT {', '.join(self._COLUMNS)} FROM {self._VIEW} WHERE expires IS NOT NULL AND NOT closed ORDER BY expires LIMIT 1"
-            ),
+    @staticmethod
+    def __shard_args(ownership: ShardOwnership) -> tuple[int | None, list[int] | None]:
+        """Get the values of the placeholders in `_OWNED` for the given shards."""
+        return (
+            ownership.shard_count,
+            list(ownership.shard_ids) if ownership.shard_ids is not None else None,
         )
-        return self.__init_poll(record) if record else None
-
-    def __parse_options(
-        self,
-        poll: Poll,
-        options: list[tuple[int, str, int | None, Iterable[int] | None, int]],
-    ) -> list[Option]:
-        """Construct a list of options for a poll given a list of tuples returned from the database.
 
-        The format of these tuples is as follows. The first element is the option' ID. The second element is the option's label. The third is the author's id if the option was added after the poll's creation. The fourth element is a collection of the IDs of the people who voted on the option. The fifth element is the index of the option within the poll.
+    async def __fetch_one(self, statement: str, *args: Any) -> Poll | None:
+        """Fetch a single poll with a registered hydration statement.
 
         Args:
-            poll: The polls that these options belong to.
-            options: The list of options to construct. Each option is a tuple in the format mentioned above.
+            statement: The name of the statement to run.
+            *args: The values of the statement's placeholders.
 
         Returns:
-            A list of the options of the given poll.
+            The first poll the statement returns, or None if there is none.
         """
-        return [
-            Option(
-                option_id=option[0],
-                label=option[1],
-                votes=option[3] or (),
-                poll=poll,
-                index=option[4],
-                author_id=option[2],
-            )
-            for option in options
-        ]
+        record = await prepared.fetchrow(self.pool, statement, *args)
+        return self.__init_poll(record) if record else None
 
     def __init_poll(self, record: asyncpg.Record) -> Poll:
-        # must be imported here to avoid circular imports
-        from paul_bot.application.poll import Poll
-
-        poll = Poll(
+        return self._build_poll(
             poll_id=record["id"],
             question=record["question"],
             expires=record["expires"],
             author_id=record["author"],
             allow_multiple_votes=record["allow_multiple_votes"],
-            allowed_vote_viewers=(
-                Mention(mention[0], mention[1])
-                for mention in record["allowed_vote_viewers"]
-            ),
-            allowed_editors=(
-                Mention(mention[0], mention[1]) for mention in record["allowed_editors"]
-            ),
-            allowed_voters=(
-                Mention(mention[0], mention[1]) for mention in record["allowed_voters"]
-            ),
+            allowed_vote_viewers=record["allowed_vote_viewers"],
+            allowed_editors=record["allowed_editors"],
+            allowed_voters=record["allowed_voters"],
             message_id=record["message"],
             channel_id=record["channel"],
             closed=record["closed"],
+            guild_id=record["guild"],
+            # Each option_summary is (id, label, author, vote_count, index)
+            options=record["options"],
+            version=record["version"],
         )
-        for option in self.__parse_options(poll, record["options"]):
-            poll.add_option(option)
-        return poll
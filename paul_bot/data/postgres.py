@@ -0,0 +1,147 @@
+import asyncio
+import logging
+import os
+from collections.abc import Callable
+from typing import Self, override
+
+import asyncpg
+
+from paul_bot import metrics, startup
+from paul_bot.utils import background
+
+from . import migrate
+from .backend import Backend
+from .notifications import PollChangeListener
+from .options_crud import PostgresOptionsCrud
+from .polls_crud import PostgresPollsCrud
+from .sql import prepared
+from .votes_crud import PostgresVotesCrud
+
+logger = logging.getLogger(__name__)
+
+
+class PostgresBackend(Backend):
+    """Stores polls in the Postgres database at DATABASE_URL. Migrations are applied when connecting.
+
+    Every pooled connection is opened with the settings from DB_JIT and DB_STATEMENT_TIMEOUT as startup parameters, and prepares the cruds' hot-path statements (see `paul_bot.data.sql.prepared`). With DB_POOL_MODE=transaction, for a pooler such as PgBouncer in transaction mode, connections neither prepare named statements nor send the settings, which the pooler would drop, and migrations run on DIRECT_DATABASE_URL since they need a session-level lock.
+    """
+
+    def __init__(
+        self, pool: asyncpg.Pool, connection_lifetime: float | None = None
+    ) -> None:
+        """Construct a backend which uses the given pool.
+
+        Args:
+            pool: The connection pool to run queries on.
+            connection_lifetime: The number of seconds after which every pooled connection is replaced, or None to keep connections until they are idle for too long.
+        """
+        super().__init__(
+            PostgresPollsCrud(pool), PostgresOptionsCrud(pool), PostgresVotesCrud(pool)
+        )
+        self.pool = pool
+        self.__recycler = (
+            background(self.__recycle_connections(connection_lifetime))
+            if connection_lifetime
+            else None
+        )
+        self.__listener: PollChangeListener | None = None
+
+    @override
+    @classmethod
+    async def from_env(cls) -> Self:
+        dsn = os.environ["DATABASE_URL"]
+        match pool_mode := os.getenv("DB_POOL_MODE", "session"):
+            case "session" | "transaction":
+                transaction_pooling = pool_mode == "transaction"
+            case _:
+                raise ValueError(
+                    f"Unknown DB_POOL_MODE {pool_mode!r}. Expected session or transaction."
+                )
+        with startup.phase("database migrations"):
+            conn = await asyncpg.connect(os.getenv("DIRECT_DATABASE_URL", dsn))
+            try:
+                await migrate.migrate(conn)
+                await migrate.check_indexes(conn)
+            finally:
+                await conn.close()
+        settings = _session_settings()
+        if transaction_pooling and settings:
+            logger.info(
+                f"Not applying {', '.join(f'{name}={value}' for name, value in settings.items())} to connections, since a transaction pooler drops startup parameters and may run each transaction on a different server connection. Set them on the database role instead, e.g. with ALTER ROLE ... SET."
+            )
+        # Migrating first means the statements prepared as each connection opens are planned against the final schema
+        with startup.phase("connection pool creation"):
+            pool = await asyncpg.create_pool(
+                dsn,
+                min_size=1,
+                max_size=int(os.getenv("MAX_DB_CONNECTIONS", "5")),
+                max_inactive_connection_lifetime=float(
+                    os.getenv("DB_IDLE_TIMEOUT", "300")
+                ),
+                # asyncpg's own statement cache names its statements too, which a transaction pooler can't keep
+                statement_cache_size=0 if transaction_pooling else 100,
+                connection_class=prepared.UnnamedConnection
+                if transaction_pooling
+                else prepared.Connection,
+                # Startup parameters become the session's defaults, so unlike SET they survive the RESET ALL run when a connection is released
+                server_settings=None if transaction_pooling else settings,
+                init=None if transaction_pooling else prepared.prepare_all,
+            )
+        _register_metrics(pool)
+        lifetime = float(os.getenv("DB_CONNECTION_LIFETIME", "0"))
+        return cls(pool, lifetime if lifetime > 0 else None)
+
+    @override
+    async def watch_poll_changes(
+        self, on_change: Callable[[int, int], None], on_missed: Callable[[], None]
+    ) -> None:
+        # LISTEN holds the session, which a transaction pooler can't give a client
+        self.__listener = PollChangeListener(
+            os.getenv("DIRECT_DATABASE_URL", os.environ["DATABASE_URL"]),
+            on_change,
+            on_missed,
+        )
+        with startup.phase("listen for poll changes"):
+            await self.__listener.start()
+
+    @override
+    async def close(self) -> None:
+        if self.__recycler is not None:
+            self.__recycler.cancel()
+        if self.__listener is not None:
+            await self.__listener.close()
+        await self.pool.close()
+
+    async def __recycle_connections(self, lifetime: float) -> None:
+        while True:
+            await asyncio.sleep(lifetime)
+            # Idle connections are replaced on their next acquire, and ones in use once they are released
+            await self.pool.expire_connections()
+
+
+def _session_settings() -> dict[str, str]:
+    """Get the settings to apply to each pooled connection. Settings whose environment variable is empty are left at the server's defaults."""
+    return {
+        name: value
+        for name, value in (
+            # JIT compilation costs more than it saves on short queries
+            ("jit", os.getenv("DB_JIT", "off")),
+            # Give up on queries which couldn't finish before an interaction's response deadline anyway
+            ("statement_timeout", os.getenv("DB_STATEMENT_TIMEOUT", "3s")),
+        )
+        if value
+    }
+
+
+def _register_metrics(pool: asyncpg.Pool) -> None:
+    metrics.db_pool_connections.set_function(pool.get_size, state="total")
+    metrics.db_pool_connections.set_function(pool.get_idle_size, state="idle")
+    metrics.db_pool_connections.set_function(
+        lambda: _waiting_for_connection(pool), state="waiting"
+    )
+
+
+def _waiting_for_connection(pool: asyncpg.Pool) -> int:
+    # asyncpg has no public API for this, so count the waiters on its internal connection queue
+    queue = getattr(pool, "_queue", None)
+    return len(getattr(queue, "_getters", ()))
@@ -1,5 +1,3 @@
-from . import insert, select
-from .delete import delete
-from .update import update
+from . import prepared, select
 
-__all__ = ("delete", "update", "insert", "select")
+__all__ = ("prepared", "select")
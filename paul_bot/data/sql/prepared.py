@@ -0,0 +1,158 @@
+"""Named statements which are prepared once on each pooled connection.
+
+Hot-path queries are registered with `register` when their module is imported. A pool created with `Connection` as its connection class and `prepare_all` as its init callback prepares every registered statement as soon as it opens a connection, and callers then run statements by name with `fetch`, `fetchrow` and `fetchval`. Postgres therefore parses and plans each statement once per connection instead of once per call.
+
+Behind a pooler in transaction mode, such as PgBouncer, consecutive transactions may run on different server connections, so named statements can't be kept. A pool using `UnnamedConnection` instead runs the same registered statements by name through the same helpers, but sends their text as unnamed statements each time.
+"""
+
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any, ClassVar, cast
+
+import asyncpg
+from asyncpg.prepared_stmt import PreparedStatement
+
+_queries: dict[str, str] = {}
+
+
+def register(name: str, query: str) -> str:
+    """Register a statement to be prepared on every connection.
+
+    Args:
+        name: The name to run the statement by. It must be unique.
+        query: The statement's SQL. Its text must not depend on the arguments, so statements which handle several rows should take arrays and `unnest` them rather than generating a VALUES list.
+
+    Returns:
+        The name, so that it can be kept in a constant.
+    """
+    if _queries.setdefault(name, query) != query:
+        raise ValueError(f"A different statement named {name!r} is already registered.")
+    return name
+
+
+class _UnnamedStatement:
+    """Runs a registered statement's text, in place of a prepared statement."""
+
+    __slots__ = ("__conn", "__query")
+
+    def __init__(self, conn: asyncpg.Connection, query: str) -> None:
+        self.__conn = conn
+        self.__query = query
+
+    async def fetch(self, *args: Any) -> list[asyncpg.Record]:
+        return await self.__conn.fetch(self.__query, *args)
+
+    async def fetchrow(self, *args: Any) -> asyncpg.Record | None:
+        return await self.__conn.fetchrow(self.__query, *args)
+
+    async def fetchval(self, *args: Any) -> Any:
+        return await self.__conn.fetchval(self.__query, *args)
+
+
+class Connection(asyncpg.Connection):
+    """A connection which keeps the registered statements prepared on it."""
+
+    named_statements: ClassVar[bool] = True
+    """Whether statements are prepared once and kept on the connection."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.__statements: dict[str, PreparedStatement] = {}
+
+    async def statement(self, name: str) -> PreparedStatement | _UnnamedStatement:
+        """Get a registered statement, preparing it first if it hasn't been prepared on this connection yet.
+
+        Args:
+            name: The name the statement was registered with.
+        """
+        if not self.named_statements:
+            return _UnnamedStatement(self, _queries[name])
+        if (statement := self.__statements.get(name)) is None:
+            statement = await self.prepare(_queries[name])
+            self.__statements[name] = statement
+        return statement
+
+
+class UnnamedConnection(Connection):
+    """A connection for use behind a pooler in transaction mode, which runs the registered statements without preparing them. Pools using it must also be created with `statement_cache_size=0`, so that asyncpg doesn't name the statements it prepares either."""
+
+    named_statements = False
+
+
+async def prepare_all(conn: Connection) -> None:
+    """Prepare every registered statement on a connection. Pass this as the `init` callback of a pool whose connection class is `Connection`. Nothing is prepared on an `UnnamedConnection`."""
+    if not conn.named_statements:
+        return
+    for name in _queries:
+        await conn.statement(name)
+
+
+async def fetch(
+    executor: asyncpg.Pool | Connection, name: str, *args: Any
+) -> list[asyncpg.Record]:
+    """Run a registered statement and get all of the rows it returns.
+
+    Args:
+        executor: The connection to run the statement on, or a pool to take one from.
+        name: The name the statement was registered with.
+        *args: The values of the statement's placeholders.
+    """
+    async with __statement(executor, name) as statement:
+        return cast(list[asyncpg.Record], await statement.fetch(*args))
+
+
+async def fetchrow(
+    executor: asyncpg.Pool | Connection, name: str, *args: Any
+) -> asyncpg.Record | None:
+    """Run a registered statement and get the first row it returns, if any.
+
+    Args:
+        executor: The connection to run the statement on, or a pool to take one from.
+        name: The name the statement was registered with.
+        *args: The values of the statement's placeholders.
+    """
+    async with __statement(executor, name) as statement:
+        return cast(asyncpg.Record | None, await statement.fetchrow(*args))
+
+
+async def fetchval(executor: asyncpg.Pool | Connection, name: str, *args: Any) -> Any:
+    """Run a registered statement and get the first column of the first row it returns, if any.
+
+    Args:
+        executor: The connection to run the statement on, or a pool to take one from.
+        name: The name the statement was registered with.
+        *args: The values of the statement's placeholders.
+    """
+    async with __statement(executor, name) as statement:
+        return cast(Any, await statement.fetchval(*args))
+
+
+@asynccontextmanager
+async def untimed_transaction(
+    pool: asyncpg.Pool, *, readonly: bool = False
+) -> AsyncIterator[Connection]:
+    """Take a connection from a pool and start a transaction on it in which statements aren't subject to statement_timeout.
+
+    Pooled connections are given a statement_timeout (see DB_STATEMENT_TIMEOUT) which suits the hot path, so bulk statements such as those run once at startup, which may take longer the more polls there are, should run in this transaction instead.
+
+    Args:
+        pool: The pool to take the connection from.
+        readonly: Whether the transaction is read-only.
+    """
+    async with pool.acquire() as connection:  # pyright: ignore[reportUnknownVariableType]
+        conn = cast(Connection, connection)
+        async with conn.transaction(readonly=readonly):
+            # Only lasts until the end of the transaction, so it also holds behind a pooler in transaction mode
+            await conn.execute("SET LOCAL statement_timeout = 0")
+            yield conn
+
+
+@asynccontextmanager
+async def __statement(
+    executor: asyncpg.Pool | Connection, name: str
+) -> AsyncIterator[PreparedStatement | _UnnamedStatement]:
+    if isinstance(executor, asyncpg.Pool):
+        async with executor.acquire() as connection:  # pyright: ignore[reportUnknownVariableType]
+            yield await cast(Connection, connection).statement(name)
+    else:
+        yield await executor.statement(name)
@@ -1,53 +1,30 @@
-from collections.abc import AsyncIterator, Iterable
+from collections.abc import AsyncGenerator, Iterable
 from typing import Any, cast
 
 import asyncpg
 
-from . import util
+from . import prepared, util
 
 
-async def many(
-    pool: asyncpg.Pool, table: str, columns: Iterable[str] = ("*",), **conditions: Any
-) -> AsyncIterator[asyncpg.Record]:
-    """Select all rows in a table matching the kwargs `conditions`.
+async def stream(
+    pool: asyncpg.Pool, query: str, *values: Any, prefetch: int = 50
+) -> AsyncGenerator[asyncpg.Record]:
+    """Run a query through a server-side cursor, so that its rows are fetched as they are consumed rather than all at once.
 
-    For security reasons it is important that the only user input passed into this function is via the values of `**conditions`.
+    A pooled connection is held until the generator is exhausted or closed, so close it (e.g. with `contextlib.aclosing`) if it may not be exhausted. Streamed queries are bulk reads, so the cursor isn't subject to statement_timeout.
 
     Args:
-        pool: The connection pool to select rows from.
-        table: The name of the table to select from.
-        columns: The names of columns to select. Defaults to all columns.
-        **conditions: Keyword arguments specifying constraints on the select statement. For a kwarg A=B, the select statement will only match rows where the column named A has the value B.
-
-    Returns:
-        An async generator yielding the selected rows.
-    """
-    query, values = __build_query(table, columns, **conditions)
-    async with pool.acquire() as connection:  # pyright: ignore[reportUnknownVariableType]
-        conn = cast(asyncpg.Connection, connection)
-        async with conn.transaction(readonly=True):
-            async for record in conn.cursor(query, *values):  # pyright: ignore[reportUnknownVariableType]
-                yield record
-
-
-async def one(
-    pool: asyncpg.Pool, table: str, columns: Iterable[str] = ("*",), **conditions: Any
-) -> asyncpg.Record | None:
-    """Select a single row from a table matching the kwargs `conditions`.
-
-    For security reasons it is important that the only user input passed into this function is via the values of `**conditions`.
-
-    Args:
-        pool: The connection pool to select from.
-        table: The name of the table to select from.
-        columns: The names of the columns to select. Defaults to all columns.
-        **conditions: Keyword arguments specifying constraints on the select statement. For a kwarg A=B, the select statement will only match rows where the column named A has the value B.
+        pool: The connection pool to run the query on.
+        query: The query to run. For security reasons it must not contain user input.
+        *values: The values of the query's placeholders.
+        prefetch: The number of rows fetched from the server at a time.
 
     Returns:
-        The selected row if one was found, or None otherwise.
+        An async generator yielding the rows.
     """
-    query, values = __build_query(table, columns, **conditions)
-    return cast(asyncpg.Record | None, await pool.fetchrow(query, *values))
+    async with prepared.untimed_transaction(pool, readonly=True) as conn:
+        async for record in conn.cursor(query, *values, prefetch=prefetch):  # pyright: ignore[reportUnknownVariableType]
+            yield record
 
 
 async def value(
@@ -1,5 +1,4 @@
-from collections.abc import Generator, Sequence
-from itertools import count
+from collections.abc import Sequence
 from typing import Any
 
 
@@ -32,15 +31,3 @@ def split_dict(dictionary: dict[str, Any]) -> tuple[tuple[str, ...], tuple[Any,
     keys = tuple(dictionary.keys())
     values = tuple(dictionary[key] for key in keys)
     return keys, values
-
-
-def placeholders(n: int | None = None) -> Generator[str]:
-    """Get n placeholders for asyncpg. E.g. $1, $2, etc.
-
-    Args:
-        n: The number of placeholders to get. Default is unlimited.
-
-    Returns:
-        A generator yielding placeholders as strings.
-    """
-    return (f"${i + 1}" for i in (range(n) if n is not None else count()))
@@ -0,0 +1,32 @@
+"""A storage backend for small, single-process deployments which keeps polls in a local SQLite file. It needs the `sqlite` extra (aiosqlite)."""
+
+import os
+from typing import Self, override
+
+from paul_bot.data.backend import Backend
+
+from .database import Database
+from .options_crud import SqliteOptionsCrud
+from .polls_crud import SqlitePollsCrud
+from .votes_crud import SqliteVotesCrud
+
+__all__ = ("SqliteBackend",)
+
+
+class SqliteBackend(Backend):
+    """Stores polls in the SQLite database at SQLITE_PATH. The schema is created when connecting."""
+
+    def __init__(self, db: Database) -> None:
+        super().__init__(
+            SqlitePollsCrud(db), SqliteOptionsCrud(db), SqliteVotesCrud(db)
+        )
+        self.db = db
+
+    @override
+    @classmethod
+    async def from_env(cls) -> Self:
+        return cls(await Database.open(os.getenv("SQLITE_PATH", "paul.sqlite3")))
+
+    @override
+    async def close(self) -> None:
+        await self.db.close()
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from asyncio import Lock
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime
+from importlib import resources
+from typing import Any
+
+import aiosqlite
+
+
+class Database:
+    """A single SQLite connection shared by the SQLite cruds.
+
+    The connection is in autocommit mode and every access holds a lock, so a transaction started by one coroutine is never interleaved with statements from another.
+    """
+
+    def __init__(self, connection: aiosqlite.Connection) -> None:
+        self.__connection = connection
+        self.__lock = Lock()
+
+    @classmethod
+    async def open(cls, path: str) -> Database:
+        """Open the database at the given path, creating it and its schema if needed.
+
+        Args:
+            path: The path of the database file, or ":memory:" for a temporary database.
+        """
+        connection = await aiosqlite.connect(path, isolation_level=None)
+        await connection.execute("PRAGMA foreign_keys = ON")
+        await connection.execute("PRAGMA journal_mode = WAL")
+        await connection.execute("PRAGMA synchronous = NORMAL")
+        await connection.executescript(
+            (resources.files(__package__) / "schema.sql").read_text()
+        )
+        return cls(connection)
+
+    async def fetch(self, query: str, *args: Any) -> list[aiosqlite.Row]:
+        """Run a query and get all of its rows."""
+        async with self.reading() as conn:
+            return list(await conn.execute_fetchall(query, args))
+
+    @asynccontextmanager
+    async def reading(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Get the connection for running several queries which must see the same state, without a transaction."""
+        async with self.__lock:
+            yield self.__connection
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Run the statements executed on the yielded connection in a transaction, which is rolled back if an exception is raised."""
+        async with self.__lock:
+            await self.__connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield self.__connection
+            except BaseException:
+                await self.__connection.execute("ROLLBACK")
+                raise
+            await self.__connection.execute("COMMIT")
+
+    async def close(self) -> None:
+        await self.__connection.close()
+
+
+def to_timestamp(value: datetime | None) -> float | None:
+    """Convert a datetime to the number of seconds since the Unix epoch, as stored in the database."""
+    return value.timestamp() if value is not None else None
+
+
+def from_timestamp(value: float | None) -> datetime | None:
+    """Convert a number of seconds since the Unix epoch, as stored in the database, to an aware datetime."""
+    return datetime.fromtimestamp(value, UTC) if value is not None else None
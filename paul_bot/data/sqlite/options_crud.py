@@ -0,0 +1,25 @@
+from collections.abc import Iterable, Mapping
+from typing import override
+
+from paul_bot.application.option import Option
+from paul_bot.data.cruds import OptionsCrud
+
+from .database import Database
+
+
+class SqliteOptionsCrud(OptionsCrud):
+    def __init__(self, db: Database) -> None:
+        self.__db = db
+
+    @override
+    async def add(self, options: Iterable[Option]) -> Mapping[int, int]:
+        ids: dict[int, int] = {}
+        async with self.__db.transaction() as conn:
+            for option in options:
+                cursor = await conn.execute(
+                    'INSERT INTO options (label, poll_id, author, "index") VALUES (?, ?, ?, ?)',
+                    (option.label, option.poll.poll_id, option.author_id, option.index),
+                )
+                assert cursor.lastrowid is not None
+                ids[option.index] = cursor.lastrowid
+        return ids
@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import json
+from collections import defaultdict
+from collections.abc import AsyncGenerator, Iterable
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any, override
+
+from paul_bot.data.cruds import PollsCrud
+
+from .database import Database, from_timestamp, to_timestamp
+
+if TYPE_CHECKING:
+    from paul_bot.application.poll import Poll
+    from paul_bot.application.shards import ShardOwnership
+
+_PERMISSION_TABLES = ("allowed_vote_viewers", "allowed_editors", "allowed_voters")
+_COLUMNS = frozenset(
+    (
+        "id",
+        "question",
+        "author",
+        "expires",
+        "allow_multiple_votes",
+        "message",
+        "channel",
+        "closed",
+        "guild",
+        "version",
+    )
+)
+"""The columns of the polls table, which are the only ones `count` may filter by."""
+# json_each lets a whole list of IDs be passed as a single parameter
+_IN_IDS = "IN (SELECT value FROM json_each(?))"
+
+
+class SqlitePollsCrud(PollsCrud):
+    def __init__(self, db: Database) -> None:
+        self.__db = db
+
+    @override
+    async def add(self, poll: Poll) -> int:
+        async with self.__db.transaction() as conn:
+            cursor = await conn.execute(
+                "INSERT INTO polls (question, author, expires, allow_multiple_votes, message, channel, guild) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    poll.question,
+                    poll.author_id,
+                    to_timestamp(poll.expires),
+                    poll.allow_multiple_votes,
+                    poll.message_id,
+                    poll.channel_id,
+                    poll.guild_id,
+                ),
+            )
+            poll_id = cursor.lastrowid
+            assert poll_id is not None
+            for table, mentions in zip(
+                _PERMISSION_TABLES,
+                (poll.allowed_vote_viewers, poll.allowed_editors, poll.allowed_voters),
+                strict=True,
+            ):
+                await conn.executemany(
+                    f"INSERT OR IGNORE INTO {table} (poll_id, mention_prefix, mention_id) VALUES (?, ?, ?)",
+                    [(poll_id, m.prefix, m.mentioned_id) for m in mentions],
+                )
+        return poll_id
+
+    @override
+    async def delete(self, poll_id: int) -> None:
+        async with self.__db.transaction() as conn:
+            await conn.execute("DELETE FROM polls WHERE id = ?", (poll_id,))
+
+    @override
+    async def fetch_by_id(self, poll_id: int) -> Poll | None:
+        return next(iter(await self.__fetch("id = ?", poll_id)), None)
+
+    @override
+    async def fetch_by_option_id(self, option_id: int) -> Poll | None:
+        return next(
+            iter(
+                await self.__fetch(
+                    "id = (SELECT poll_id FROM options WHERE id = ?)", option_id
+                )
+            ),
+            None,
+        )
+
+    @override
+    async def fetch_by_ids(self, poll_ids: Iterable[int]) -> list[Poll]:
+        return await self.__fetch(f"id {_IN_IDS}", json.dumps(list(poll_ids)))
+
+    @override
+    async def close_all(self, poll_ids: Iterable[int], closed_at: datetime) -> None:
+        async with self.__db.transaction() as conn:
+            await conn.execute(
+                "UPDATE polls SET closed = 1, expires = MIN(COALESCE(expires, ?2), ?2) WHERE id IN (SELECT value FROM json_each(?1))",
+                (json.dumps(list(poll_ids)), to_timestamp(closed_at)),
+            )
+
+    @override
+    async def close_expired(self, ownership: ShardOwnership) -> list[int]:
+        async with self.__db.transaction() as conn:
+            rows = await conn.execute_fetchall(
+                "SELECT id, guild FROM polls WHERE NOT closed AND expires <= ?",
+                (datetime.now(UTC).timestamp(),),
+            )
+            poll_ids = [row[0] for row in rows if ownership.owns(row[1])]
+            await conn.execute(
+                f"UPDATE polls SET closed = 1 WHERE id {_IN_IDS}",
+                (json.dumps(poll_ids),),
+            )
+        return poll_ids
+
+    @override
+    async def pending_expiries(
+        self, ownership: ShardOwnership
+    ) -> list[tuple[int, datetime]]:
+        rows = await self.__db.fetch(
+            "SELECT id, expires, guild FROM polls WHERE expires IS NOT NULL AND NOT closed"
+        )
+        return [
+            (row[0], datetime.fromtimestamp(row[1], UTC))
+            for row in rows
+            if ownership.owns(row[2])
+        ]
+
+    @override
+    async def stream_open(
+        self, ownership: ShardOwnership, batch_size: int
+    ) -> AsyncGenerator[list[Poll]]:
+        # Paginated by ID, so that each batch is a separate short read
+        before: int | None = None
+        while polls := await self.__fetch(
+            "NOT closed AND id < COALESCE(?, id + 1) ORDER BY id DESC LIMIT ?",
+            before,
+            batch_size,
+        ):
+            before = polls[-1].poll_id
+            if owned := [poll for poll in polls if ownership.owns(poll.guild_id)]:
+                yield owned
+
+    @override
+    async def count(self, ownership: ShardOwnership, **conditions: Any) -> int:
+        if unknown := conditions.keys() - _COLUMNS:
+            raise ValueError(f"Unknown poll columns: {', '.join(sorted(unknown))}")
+        where = " AND ".join(f"{column} IS ?" for column in conditions) or "1"
+        values = (
+            to_timestamp(value) if isinstance(value, datetime) else value
+            for value in conditions.values()
+        )
+        rows = await self.__db.fetch(f"SELECT guild FROM polls WHERE {where}", *values)
+        return sum(ownership.owns(row[0]) for row in rows)
+
+    async def __fetch(self, condition: str, *args: Any) -> list[Poll]:
+        """Fetch the polls matching a condition along with their options and permissions.
+
+        Args:
+            condition: The WHERE clause to select the polls with. This must not contain user input.
+            *args: The values of the placeholders in the condition.
+        """
+        options: defaultdict[int, list[tuple[int, str, int | None, int, int]]] = (
+            defaultdict(list)
+        )
+        mentions: defaultdict[tuple[str, int], list[tuple[str, int]]] = defaultdict(
+            list
+        )
+        async with self.__db.reading() as conn:
+            polls = list(
+                await conn.execute_fetchall(
+                    f"SELECT id, question, expires, author, allow_multiple_votes, message, channel, closed, guild, version FROM polls WHERE {condition}",
+                    args,
+                )
+            )
+            if not polls:
+                return []
+            poll_ids = json.dumps([row[0] for row in polls])
+            for row in await conn.execute_fetchall(
+                f'SELECT poll_id, id, label, author, vote_count, "index" FROM options WHERE poll_id {_IN_IDS} ORDER BY "index"',
+                (poll_ids,),
+            ):
+                options[row[0]].append((row[1], row[2], row[3], row[4], row[5]))
+            for row in await conn.execute_fetchall(
+                " UNION ALL ".join(
+                    f"SELECT '{table}', poll_id, mention_prefix, mention_id FROM {table} WHERE poll_id {_IN_IDS}"
+                    for table in _PERMISSION_TABLES
+                ),
+                (poll_ids,) * len(_PERMISSION_TABLES),
+            ):
+                mentions[row[0], row[1]].append((row[2], row[3]))
+        return [
+            self._build_poll(
+                poll_id=row[0],
+                question=row[1],
+                expires=from_timestamp(row[2]),
+                author_id=row[3],
+                allow_multiple_votes=bool(row[4]),
+                allowed_vote_viewers=mentions["allowed_vote_viewers", row[0]],
+                allowed_editors=mentions["allowed_editors", row[0]],
+                allowed_voters=mentions["allowed_voters", row[0]],
+                message_id=row[5],
+                channel_id=row[6],
+                closed=bool(row[7]),
+                guild_id=row[8],
+                options=options[row[0]],
+                version=row[9],
+            )
+            for row in polls
+        ]
@@ -0,0 +1,89 @@
+-- The SQLite schema. Every statement must be idempotent since the whole script runs on every start.
+-- Datetimes are stored as seconds since the Unix epoch.
+
+CREATE TABLE IF NOT EXISTS polls (
+    id INTEGER PRIMARY KEY,
+    question TEXT NOT NULL,
+    author INTEGER NOT NULL,
+    expires REAL,
+    allow_multiple_votes INTEGER NOT NULL,
+    message INTEGER NOT NULL,
+    channel INTEGER NOT NULL,
+    closed INTEGER NOT NULL DEFAULT 0,
+    guild INTEGER,
+    version INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE INDEX IF NOT EXISTS open_polls_expires_index ON polls (expires) WHERE NOT closed;
+
+CREATE TABLE IF NOT EXISTS options (
+    id INTEGER PRIMARY KEY,
+    poll_id INTEGER NOT NULL REFERENCES polls (id) ON DELETE CASCADE,
+    label TEXT NOT NULL,
+    author INTEGER,
+    "index" INTEGER NOT NULL,
+    vote_count INTEGER NOT NULL DEFAULT 0,
+    UNIQUE (poll_id, "index")
+);
+
+CREATE TABLE IF NOT EXISTS votes (
+    option_id INTEGER NOT NULL REFERENCES options (id) ON DELETE CASCADE,
+    voter_id INTEGER NOT NULL,
+    PRIMARY KEY (option_id, voter_id)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS votes_voter_id_index ON votes (voter_id);
+
+-- Keep options.vote_count in step with the votes table. Ignored duplicate inserts and deletes of missing votes don't fire these.
+CREATE TRIGGER IF NOT EXISTS votes_insert_vote_count AFTER INSERT ON votes
+BEGIN
+    UPDATE options SET vote_count = vote_count + 1 WHERE id = NEW.option_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS votes_delete_vote_count AFTER DELETE ON votes
+BEGIN
+    UPDATE options SET vote_count = vote_count - 1 WHERE id = OLD.option_id;
+END;
+
+-- Number the changes to each poll like the Postgres backend does, so that the results of vote toggles can be ordered.
+CREATE TRIGGER IF NOT EXISTS votes_insert_poll_version AFTER INSERT ON votes
+BEGIN
+    UPDATE polls SET version = version + 1 WHERE id = (SELECT poll_id FROM options WHERE id = NEW.option_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS votes_delete_poll_version AFTER DELETE ON votes
+BEGIN
+    UPDATE polls SET version = version + 1 WHERE id = (SELECT poll_id FROM options WHERE id = OLD.option_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS options_insert_poll_version AFTER INSERT ON options
+BEGIN
+    UPDATE polls SET version = version + 1 WHERE id = NEW.poll_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS polls_closed_poll_version AFTER UPDATE OF closed ON polls
+    WHEN OLD.closed IS NOT NEW.closed
+BEGIN
+    UPDATE polls SET version = version + 1 WHERE id = NEW.id;
+END;
+
+CREATE TABLE IF NOT EXISTS allowed_vote_viewers (
+    poll_id INTEGER NOT NULL REFERENCES polls (id) ON DELETE CASCADE,
+    mention_prefix TEXT NOT NULL,
+    mention_id INTEGER NOT NULL,
+    PRIMARY KEY (poll_id, mention_prefix, mention_id)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS allowed_editors (
+    poll_id INTEGER NOT NULL REFERENCES polls (id) ON DELETE CASCADE,
+    mention_prefix TEXT NOT NULL,
+    mention_id INTEGER NOT NULL,
+    PRIMARY KEY (poll_id, mention_prefix, mention_id)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS allowed_voters (
+    poll_id INTEGER NOT NULL REFERENCES polls (id) ON DELETE CASCADE,
+    mention_prefix TEXT NOT NULL,
+    mention_id INTEGER NOT NULL,
+    PRIMARY KEY (poll_id, mention_prefix, mention_id)
+) WITHOUT ROWID;
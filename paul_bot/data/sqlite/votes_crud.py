@@ -0,0 +1,77 @@
+from typing import override
+
+from paul_bot.data.cruds import ToggledVote, VotesCrud
+
+from .database import Database
+
+
+class SqliteVotesCrud(VotesCrud):
+    def __init__(self, db: Database) -> None:
+        self.__db = db
+
+    @override
+    async def fetch_voter_page(
+        self,
+        option_id: int,
+        limit: int,
+        *,
+        after: int | None = None,
+        before: int | None = None,
+    ) -> list[int]:
+        if before is not None:
+            rows = await self.__db.fetch(
+                "SELECT voter_id FROM (SELECT voter_id FROM votes WHERE option_id = ? AND voter_id < ? ORDER BY voter_id DESC LIMIT ?) ORDER BY voter_id",
+                option_id,
+                before,
+                limit,
+            )
+        else:
+            rows = await self.__db.fetch(
+                "SELECT voter_id FROM votes WHERE option_id = ? AND voter_id > ? ORDER BY voter_id LIMIT ?",
+                option_id,
+                after if after is not None else -1,
+                limit,
+            )
+        return [row[0] for row in rows]
+
+    @override
+    async def toggle(self, option_id: int, voter_id: int) -> ToggledVote:
+        async with self.__db.transaction() as conn:
+            rows = list(
+                await conn.execute_fetchall(
+                    "SELECT options.poll_id, polls.allow_multiple_votes, polls.version FROM options JOIN polls ON polls.id = options.poll_id WHERE options.id = ?",
+                    (option_id,),
+                )
+            )
+            if not rows:
+                return ToggledVote({})
+            poll_id, allow_multiple_votes, previous_version = rows[0]
+            cursor = await conn.execute(
+                "DELETE FROM votes WHERE option_id = ? AND voter_id = ?",
+                (option_id, voter_id),
+            )
+            if cursor.rowcount == 0:
+                if not allow_multiple_votes:
+                    await conn.execute(
+                        "DELETE FROM votes WHERE voter_id = ? AND option_id IN (SELECT id FROM options WHERE poll_id = ?)",
+                        (voter_id, poll_id),
+                    )
+                await conn.execute(
+                    "INSERT INTO votes (option_id, voter_id) VALUES (?, ?)",
+                    (option_id, voter_id),
+                )
+            rows = list(
+                await conn.execute_fetchall(
+                    "SELECT id, vote_count, EXISTS (SELECT 1 FROM votes WHERE option_id = options.id AND voter_id = ?) FROM options WHERE poll_id = ?",
+                    (voter_id, poll_id),
+                )
+            )
+            # The triggers have counted the toggle's changes in the poll's version
+            ((version,),) = await conn.execute_fetchall(
+                "SELECT version FROM polls WHERE id = ?", (poll_id,)
+            )
+        return ToggledVote(
+            {row[0]: (row[1], bool(row[2])) for row in rows},
+            previous_poll_version=previous_version,
+            poll_version=version,
+        )
@@ -1,48 +1,63 @@
-import asyncpg
-
-from . import sql
-from .cruds import Crud
-
-
-class VotesCrud(Crud):
-    def __init__(self, pool: asyncpg.Pool) -> None:
-        super().__init__(pool)
+from typing import override
 
-    async def add(self, option_id: int, voter_id: int) -> None:
-        await sql.insert.one(
-            self.pool,
-            "votes",
-            on_conflict="DO NOTHING",
-            option_id=option_id,
-            voter_id=voter_id,
-        )
+import asyncpg
 
-    async def delete_users_votes_from_poll(self, poll_id: int, voter_id: int) -> None:
-        """Delete all votes from the given user on the given poll.
+from .cruds import ToggledVote, VotesCrud
+from .sql import prepared
 
-        Args:
-            poll_id: The poll ID to delete votes from.
-            voter_id: The ID of the user whose votes to delete.
-        """
-        await sql.delete(
-            self.pool,
-            "votes",
-            f"option_id in (select id from options where poll_id = {poll_id})",
-            voter_id=voter_id,
-        )
 
-    async def delete_users_votes_from_option(
-        self, option_id: int, voter_id: int
-    ) -> None:
-        """Delete a vote from the given user on the given option.
+class PostgresVotesCrud(VotesCrud):
+    _FETCH_VOTERS_AFTER = prepared.register(
+        "fetch_voters_after",
+        "SELECT voter_id FROM votes WHERE option_id = $1 AND voter_id > $2 ORDER BY voter_id LIMIT $3",
+    )
+    _FETCH_VOTERS_BEFORE = prepared.register(
+        "fetch_voters_before",
+        "SELECT voter_id FROM (SELECT voter_id FROM votes WHERE option_id = $1 AND voter_id < $2 ORDER BY voter_id DESC LIMIT $3) AS page ORDER BY voter_id",
+    )
+    _TOGGLE = prepared.register(
+        "toggle_vote",
+        "SELECT option_id, vote_count, voted, previous_poll_version, poll_version FROM toggle_vote($1, $2)",
+    )
 
-        Args:
-            option_id: The option ID to delete the vote from.
-            voter_id: The ID of the user whose vote to delete.
-        """
-        await sql.delete(
-            self.pool,
-            "votes",
-            option_id=option_id,
-            voter_id=voter_id,
+    def __init__(self, pool: asyncpg.Pool) -> None:
+        self.pool = pool
+
+    @override
+    async def fetch_voter_page(
+        self,
+        option_id: int,
+        limit: int,
+        *,
+        after: int | None = None,
+        before: int | None = None,
+    ) -> list[int]:
+        # Both statements walk the votes primary key, (option_id, voter_id), from the cursor
+        if before is not None:
+            records = await prepared.fetch(
+                self.pool, self._FETCH_VOTERS_BEFORE, option_id, before, limit
+            )
+        else:
+            records = await prepared.fetch(
+                self.pool,
+                self._FETCH_VOTERS_AFTER,
+                option_id,
+                after if after is not None else -1,
+                limit,
+            )
+        return [record["voter_id"] for record in records]
+
+    @override
+    async def toggle(self, option_id: int, voter_id: int) -> ToggledVote:
+        # The toggle_vote function (see migrations 0005 and 0006) does the whole toggle server side
+        records = await prepared.fetch(self.pool, self._TOGGLE, option_id, voter_id)
+        if not records:
+            return ToggledVote({})
+        return ToggledVote(
+            {
+                record["option_id"]: (record["vote_count"], record["voted"])
+                for record in records
+            },
+            previous_poll_version=records[0]["previous_poll_version"],
+            poll_version=records[0]["poll_version"],
         )
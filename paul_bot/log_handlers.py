@@ -0,0 +1,26 @@
+"""Logging handlers which send log records to Discord channels.
+
+This module imports discord_lumberjack, so it should only be imported if a log channel is configured.
+"""
+
+import logging
+from logging import LogRecord
+from typing import override
+
+from discord_lumberjack.handlers import DiscordChannelHandler
+from discord_lumberjack.message_creators import EmbedMessageCreator
+
+
+class EmbedLongMessageCreator(EmbedMessageCreator):
+    @override
+    def get_description(self, record: LogRecord) -> str:
+        return f"**{super().get_title(record)}**"
+
+    @override
+    def get_title(self, record: LogRecord) -> str:
+        return ""
+
+
+def channel_handler(token: str, channel_id: int, level: int) -> logging.Handler:
+    """Create a handler which sends log records of at least the given level to a Discord channel."""
+    return DiscordChannelHandler(token, channel_id, level, EmbedLongMessageCreator())
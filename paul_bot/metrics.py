@@ -0,0 +1,196 @@
+"""A minimal Prometheus metrics registry and HTTP endpoint.
+
+Metrics are always collected, since doing so only costs a few dictionary updates. They are only served if `serve` is called, which happens when the METRICS_PORT environment variable is set.
+"""
+
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from time import perf_counter
+from typing import override
+
+logger = logging.getLogger(__name__)
+
+type _Labels = tuple[tuple[str, str], ...]
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+class Metric(ABC):
+    def __init__(self, name: str, help: str, kind: str) -> None:
+        self.name = name
+        self.help = help
+        self.kind = kind
+        _registry.append(self)
+
+    @abstractmethod
+    def samples(self) -> Iterator[str]:
+        """Generate the lines of the Prometheus text format for this metric's values."""
+
+    def render(self) -> str:
+        """Render this metric in the Prometheus text format."""
+        header = f"# HELP {self.name} {self.help}\n# TYPE {self.name} {self.kind}\n"
+        return header + "".join(f"{sample}\n" for sample in self.samples())
+
+
+class Histogram(Metric):
+    """A histogram of durations in seconds, with a separate series for each combination of labels."""
+
+    def __init__(
+        self, name: str, help: str, buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    ) -> None:
+        super().__init__(name, help, "histogram")
+        self.__buckets = buckets
+        self.__series: dict[_Labels, tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        """Record a value.
+
+        Args:
+            value: The value to record.
+            **labels: The labels of the series to record the value in.
+        """
+        key = tuple(sorted(labels.items()))
+        counts, total = self.__series.setdefault(
+            key, ([0] * (len(self.__buckets) + 1), [0.0])
+        )
+        counts[bisect_left(self.__buckets, value)] += 1
+        total[0] += value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Record how long the body of the with statement takes, even if it raises.
+
+        Args:
+            **labels: The labels of the series to record the duration in.
+        """
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(perf_counter() - start, **labels)
+
+    @override
+    def samples(self) -> Iterator[str]:
+        for key, (counts, total) in self.__series.items():
+            cumulative = 0
+            for bound, count in zip(
+                (*map(str, self.__buckets), "+Inf"), counts, strict=True
+            ):
+                cumulative += count
+                yield f"{self.name}_bucket{_format_labels((*key, ('le', bound)))} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(key)} {total[0]}"
+            yield f"{self.name}_count{_format_labels(key)} {cumulative}"
+
+
+class Gauge(Metric):
+    """A value which is read from a callback whenever the metrics are scraped."""
+
+    def __init__(self, name: str, help: str, kind: str = "gauge") -> None:
+        super().__init__(name, help, kind)
+        self.__functions: dict[_Labels, Callable[[], float | None]] = {}
+
+    def set_function(self, function: Callable[[], float | None], **labels: str) -> None:
+        """Set the callback which reads the value of the series with the given labels.
+
+        Args:
+            function: A function returning the current value, or None to leave the series out.
+            **labels: The labels of the series.
+        """
+        self.__functions[tuple(sorted(labels.items()))] = function
+
+    @override
+    def samples(self) -> Iterator[str]:
+        for key, function in self.__functions.items():
+            try:
+                value = function()
+            except Exception:
+                logger.exception(f"Failed to read metric {self.name}.")
+                continue
+            if value is not None:
+                yield f"{self.name}{_format_labels(key)} {value}"
+
+
+def _format_labels(labels: _Labels) -> str:
+    if not labels:
+        return ""
+    escaped = (
+        f'{name}="{value.replace("\\", "\\\\").replace('"', '\\"')}"'
+        for name, value in labels
+    )
+    return "{" + ",".join(escaped) + "}"
+
+
+_registry: list[Metric] = []
+
+
+def render() -> str:
+    """Render every metric in the Prometheus text format."""
+    return "".join(metric.render() for metric in _registry)
+
+
+async def serve(host: str, port: int) -> asyncio.Server:
+    """Start an HTTP server which responds to every request with the current metrics.
+
+    Args:
+        host: The address to listen on.
+        port: The port to listen on.
+
+    Returns:
+        The running server.
+    """
+
+    async def handle(
+        reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            await reader.readuntil(b"\r\n\r\n")
+            body = render().encode()
+            writer.write(
+                b"HTTP/1.1 200 OK\r\nContent-Type: text/plain; version=0.0.4\r\n"
+                + f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode()
+                + body
+            )
+            await writer.drain()
+        except asyncio.IncompleteReadError, asyncio.LimitOverrunError, OSError:
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, host, port)
+    logger.info(f"Serving metrics on http://{host}:{port}/metrics")
+    return server
+
+
+button_latency = Histogram(
+    "paul_button_click_seconds", "Time taken to handle a button click."
+)
+select_latency = Histogram(
+    "paul_select_seconds", "Time taken to handle a choice in a select menu."
+)
+command_latency = Histogram(
+    "paul_command_seconds", "Time taken to handle a slash command."
+)
+crud_latency = Histogram("paul_crud_seconds", "Time taken by database CRUD methods.")
+message_edit_latency = Histogram(
+    "paul_message_edit_seconds", "Time taken to edit a poll's message."
+)
+db_pool_connections = Gauge(
+    "paul_db_pool_connections", "Connections in the database pool."
+)
+background_tasks = Gauge(
+    "paul_background_tasks", "Background tasks which haven't finished yet."
+)
+polls = Gauge("paul_polls", "Number of polls.")
+poll_cache = Gauge(
+    "paul_poll_cache_total", "Poll cache hits, misses and evictions.", kind="counter"
+)
+poll_cache_size = Gauge("paul_poll_cache_size", "Polls resident in the poll cache.")
+coalesced_edits = Gauge(
+    "paul_coalesced_edits_total",
+    "Poll message edits skipped because a newer edit superseded them.",
+    kind="counter",
+)
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
-from asyncio import CancelledError, Event, Task, create_task, sleep
-from datetime import UTC, datetime
+import logging
+from asyncio import Event, sleep, wait_for
+from contextlib import suppress
+from datetime import UTC, datetime, timedelta
+from heapq import heappop, heappush
 from typing import TYPE_CHECKING
 
 from paul_bot.application import Poll
@@ -10,60 +13,90 @@ from paul_bot.utils import background
 if TYPE_CHECKING:
     from .paul import Paul
 
+logger = logging.getLogger(__name__)
+
 
 class CloseLoop:
-    """A background task that closes polls when they expire."""
+    """A background task that closes polls when they expire.
+
+    The expiry times of all open polls are loaded once when the loop starts and kept in a min-heap. Polls which are registered or closed later update the heap in O(log n) without querying the database. All polls due within `batch_window` of each other are closed together.
+    """
+
+    def __init__(self, paul: Paul, batch_window: float = 1.0) -> None:
+        """Construct a close loop.
 
-    def __init__(self, paul: Paul) -> None:
+        Args:
+            paul: The Paul instance to close polls with.
+            batch_window: The number of seconds after the next expiry within which other expiring polls are closed in the same batch.
+        """
         self.__paul = paul
-        self.__next_expire: datetime = datetime.max.replace(tzinfo=UTC)
-        self.__wait_task: Task[None] | None = None
-        self.__poll_added = Event()
-        self.__closing: set[int] = set()
+        self.__batch_window = timedelta(seconds=batch_window)
+        self.__heap: list[tuple[datetime, int]] = []
+        self.__scheduled: dict[int, datetime] = {}
+        """The expiry time of each scheduled poll. Heap entries which don't match this are stale and skipped."""
+        self.__rescheduled = Event()
 
     def register(self, poll: Poll) -> None:
-        """Check if the newly added poll is scheduled to expire sooner than the current next expiration."""
+        """Schedule a newly added poll to be closed when it expires."""
         if poll.closed or not poll.expires:
             return
-        if poll.expires < self.__next_expire:
-            if self.__wait_task is not None:
-                self.__wait_task.cancel()
-            self.__poll_added.set()
+        self.__schedule(poll.poll_id, poll.expires)
+
+    def unregister(self, poll: Poll) -> None:
+        """Stop tracking a poll, for example because it was closed manually."""
+        self.__scheduled.pop(poll.poll_id, None)
 
     def start(self) -> None:
         """Start the loop."""
         background(self.__loop())
 
+    def __schedule(self, poll_id: int, expires: datetime) -> None:
+        self.__scheduled[poll_id] = expires
+        heappush(self.__heap, (expires, poll_id))
+        if self.__heap[0] == (expires, poll_id):
+            self.__rescheduled.set()
+
     async def __loop(self) -> None:
+        for poll_id, expires in await Poll.pending_expiries():
+            self.__schedule(poll_id, expires)
+        logger.debug(f"Scheduled {len(self.__scheduled)} polls to close.")
         while True:
-            poll = await Poll.next_to_expire()
-            if poll is None or poll.expires is None:
-                self.__poll_added.clear()
-                await self.__poll_added.wait()
+            self.__discard_stale()
+            self.__rescheduled.clear()
+            if not self.__heap:
+                await self.__rescheduled.wait()
                 continue
-            self.__next_expire = poll.expires
-            try:
-                await self.__wait()
-            except CancelledError:
+            delay = (self.__heap[0][0] - datetime.now(UTC)).total_seconds()
+            if delay > 0:
+                with suppress(TimeoutError):
+                    await wait_for(self.__rescheduled.wait(), delay)
                 continue
-            if poll.closed:
-                continue
-            background(self.__close_poll(poll))
+            background(self.__close_polls(self.__pop_due()))
 
-    async def __wait(self) -> None:
-        """Wait for the next poll to expire, updating the wait task. If the wait task is cancelled while waiting, CancelledError will be raised."""
-        self.__wait_task = create_task(self.__wait_for_expire())
-        try:
-            await self.__wait_task
-        finally:
-            self.__wait_task = None
+    def __discard_stale(self) -> None:
+        while self.__heap and not self.__is_current(*self.__heap[0]):
+            heappop(self.__heap)
 
-    async def __wait_for_expire(self) -> None:
-        await sleep((self.__next_expire - datetime.now(UTC)).total_seconds())
+    def __is_current(self, expires: datetime, poll_id: int) -> bool:
+        return self.__scheduled.get(poll_id) == expires
 
-    async def __close_poll(self, poll: Poll) -> None:
-        if poll.poll_id in self.__closing:
-            return
-        self.__closing.add(poll.poll_id)
-        await self.__paul.close_poll_now(poll)
-        self.__closing.remove(poll.poll_id)
+    def __pop_due(self) -> dict[int, datetime]:
+        """Remove every poll which is due within the batch window from the schedule.
+
+        Returns:
+            The expiry time of each removed poll, by poll ID.
+        """
+        horizon = datetime.now(UTC) + self.__batch_window
+        due: dict[int, datetime] = {}
+        while self.__heap and self.__heap[0][0] <= horizon:
+            expires, poll_id = heappop(self.__heap)
+            if self.__is_current(expires, poll_id):
+                due[poll_id] = self.__scheduled.pop(poll_id)
+        return due
+
+    async def __close_polls(self, due: dict[int, datetime]) -> None:
+        # Wait for the last poll in the batch to actually expire so none are closed early
+        await sleep((max(due.values()) - datetime.now(UTC)).total_seconds())
+        polls = [poll for poll in await Poll.fetch_many(due) if not poll.closed]
+        if polls:
+            await self.__paul.close_polls_now(polls)
@@ -1,9 +1,10 @@
 import logging
+import os
 import re
 from collections.abc import Callable
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta, timezone
+from functools import lru_cache
 
-import dateparser
 from disnake import Client
 from disnake.interactions import ApplicationCommandInteraction as Interaction
 
@@ -38,16 +39,107 @@ def parse_options(sep: str = "|") -> Callable[[Interaction[Client], str], list[s
     return converter
 
 
+_DATEPARSER_LANGUAGES = [
+    language.strip()
+    for language in os.getenv("DATEPARSER_LANGUAGES", "en").split(",")
+    if language.strip()
+] or None
 RELATIVE_DATE_PARSE_FIX = re.compile(r"([dhms])(\d)")
 
+_DURATION_UNITS = {
+    "w": timedelta(weeks=1),
+    "d": timedelta(days=1),
+    "h": timedelta(hours=1),
+    "m": timedelta(minutes=1),
+    "s": timedelta(seconds=1),
+}
+_DURATION_PART = re.compile(
+    r"(\d+)\s*(w(?:eeks?)?|d(?:ays?)?|h(?:ours?|rs?)?|m(?:in(?:ute)?s?)?|s(?:ec(?:ond)?s?)?)(?![a-z])[\s,]*"
+)
+_DURATION = re.compile(rf"(?:in\s+)?(?:{_DURATION_PART.pattern})+")
+_ISO_DATE = re.compile(r"\d{4}-\d{2}-\d{2}(?:[t\s].*)?")
+_TIME_OF_DAY = re.compile(
+    r"(\d{1,2}):(\d{2})(?::(\d{2}))?\s*(?:utc|gmt|z)?\s*(?:([+-])(\d{1,2})(?::?(\d{2}))?)?"
+)
+
 
 def parse_expires(inter: Interaction[Client], expires: str) -> datetime | None:
-    # Workaround for https://github.com/scrapinghub/dateparser/issues/1012
-    if expires.lower() == "never":
+    """Parse when a poll should expire.
+
+    Durations such as "1h20m" or "3 days", ISO 8601 timestamps and times of day such as "18:30" or "18:30 +02:00" are parsed directly. Anything else goes through dateparser, which is much slower, so it is only imported once it is needed and only tries the languages in DATEPARSER_LANGUAGES.
+
+    Times without an offset are in UTC, and a time of day which has already passed today means tomorrow.
+    """
+    text = expires.strip().lower()
+    if text == "never":
+        return None
+    now = datetime.now(UTC)
+    try:
+        if (offset := _parse_duration(text)) is not None:
+            return now + offset
+        if (result := _parse_iso(text) or _parse_time_of_day(text, now)) is not None:
+            return result
+    except OverflowError:
+        raise FriendlyError(f'"{expires}" is too far in the future.', inter) from None
+    result = _dateparser_parse(expires)
+    if result is None:
+        raise FriendlyError(f'Could not parse "{expires}" as a date/time.', inter)
+    return result
+
+
+@lru_cache(maxsize=1024)
+def _parse_duration(text: str) -> timedelta | None:
+    """Parse a duration such as "1h20m", "in 3 days" or "2 hours, 5 mins" into the offset from now. Results are cached, since the same few durations are used over and over."""
+    if _DURATION.fullmatch(text) is None:
+        return None
+    return sum(
+        (
+            int(amount) * _DURATION_UNITS[unit[0]]
+            for amount, unit in _DURATION_PART.findall(text)
+        ),
+        timedelta(),
+    )
+
+
+def _parse_iso(text: str) -> datetime | None:
+    if _ISO_DATE.fullmatch(text) is None:
         return None
+    try:
+        result = datetime.fromisoformat(text.upper())
+    except ValueError:
+        return None
+    return (
+        result.replace(tzinfo=UTC) if result.tzinfo is None else result.astimezone(UTC)
+    )
+
+
+def _parse_time_of_day(text: str, now: datetime) -> datetime | None:
+    """Parse a time of day with an optional UTC offset into the next time it occurs."""
+    match = _TIME_OF_DAY.fullmatch(text)
+    if match is None:
+        return None
+    hour, minute, second, sign, offset_hours, offset_minutes = match.groups()
+    offset = timedelta(hours=int(offset_hours or 0), minutes=int(offset_minutes or 0))
+    try:
+        result = now.astimezone(timezone(-offset if sign == "-" else offset)).replace(
+            hour=int(hour), minute=int(minute), second=int(second or 0), microsecond=0
+        )
+    except ValueError:
+        return None
+    if result <= now:
+        result += timedelta(days=1)
+    return result.astimezone(UTC)
+
+
+def _dateparser_parse(expires: str) -> datetime | None:
+    # dateparser takes a while to import and is rarely needed, so it's only imported on first use
+    import dateparser
+
+    # Workaround for https://github.com/scrapinghub/dateparser/issues/1012
     expires = RELATIVE_DATE_PARSE_FIX.sub(r"\1 \2", expires)
     result = dateparser.parse(
         expires,
+        languages=_DATEPARSER_LANGUAGES,
         settings={
             "PREFER_DATES_FROM": "future",
             "RETURN_AS_TIMEZONE_AWARE": True,
@@ -56,7 +148,7 @@ def parse_expires(inter: Interaction[Client], expires: str) -> datetime | None:
         },
     )
     if result is None:
-        raise FriendlyError(f'Could not parse "{expires}" as a date/time.', inter)
+        return None
     return (
         result.replace(tzinfo=UTC)
         if result.tzinfo is None or result.tzinfo.utcoffset(result) is None
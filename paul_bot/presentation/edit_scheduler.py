@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from asyncio import Future, sleep
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from time import monotonic
+
+from disnake.message import Message
+
+from paul_bot.application import Poll
+from paul_bot.utils import background
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class _PollEditState:
+    poll: Poll
+    message: Message | None = None
+    pending: Future[None] | None = None
+    last_edit: float = field(default=-float("inf"))
+
+
+class EditScheduler:
+    """Coalesces edits to poll messages.
+
+    Each poll has at most one edit in flight and at most one edit pending. A request made while an edit is pending is merged into it, and since the pending edit renders the poll only when it is sent, it always shows the latest state. Consecutive edits of the same poll are spaced at least `min_interval` seconds apart.
+    """
+
+    def __init__(
+        self,
+        edit: Callable[[Poll, Message | None], Awaitable[None]],
+        min_interval: float = 1.0,
+    ) -> None:
+        """Construct an edit scheduler.
+
+        Args:
+            edit: The function that renders a poll into its message. If the message is None it should be fetched.
+            min_interval: The minimum number of seconds between two edits of the same poll.
+        """
+        self.__edit = edit
+        self.__min_interval = min_interval
+        self.__states: dict[int, _PollEditState] = {}
+        self.coalesced = 0
+        """The number of edit requests that were merged into an already pending edit."""
+
+    def schedule(self, poll: Poll, message: Message | None = None) -> Future[None]:
+        """Request that the poll's message be updated to reflect its current state.
+
+        Args:
+            poll: The poll whose message should be updated.
+            message: The message containing the poll, if it is at hand. Otherwise it will be fetched.
+
+        Returns:
+            A future which completes once an edit rendered after this request has been sent.
+        """
+        state = self.__states.get(poll.poll_id)
+        if state is None:
+            state = self.__states[poll.poll_id] = _PollEditState(poll)
+            background(self.__run(state))
+        state.poll = poll
+        state.message = message or state.message
+        if state.pending is not None:
+            self.coalesced += 1
+            return state.pending
+        state.pending = asyncio.get_running_loop().create_future()
+        return state.pending
+
+    async def __run(self, state: _PollEditState) -> None:
+        """Send the poll's pending edits one at a time until there are none left."""
+        try:
+            while True:
+                delay = state.last_edit + self.__min_interval - monotonic()
+                if delay > 0:
+                    await sleep(delay)
+                if state.pending is None:
+                    return
+                waiter, message = state.pending, state.message
+                state.pending = state.message = None
+                try:
+                    await self.__edit(state.poll, message)
+                except Exception as e:  # noqa: BLE001
+                    waiter.set_exception(e)
+                else:
+                    waiter.set_result(None)
+                finally:
+                    state.last_edit = monotonic()
+        finally:
+            del self.__states[state.poll.poll_id]
@@ -1,3 +1,5 @@
+from collections.abc import Iterable
+
 from disnake import Embed
 
 from paul_bot.application.option import Option
@@ -6,31 +8,19 @@ from .colours import get_colour
 
 
 class SeeOptionResultsEmbed(Embed):
-    def __init__(self, option: Option, index: int) -> None:
-        mentions = " ".join(f"<@{member_id}>" for member_id in option.votes)
+    """A page of the list of members who voted for an option."""
+
+    def __init__(self, option: Option, index: int, voters: Iterable[int]) -> None:
+        """Construct the embed.
+
+        Args:
+            option: The option whose voters are listed.
+            index: The index of the option in the poll, which determines the embed's colour and is shown, counting from 1, before the option's label.
+            voters: The IDs of the members to mention on this page.
+        """
+        mentions = " ".join(f"<@{voter_id}>" for voter_id in voters)
         super().__init__(
             colour=get_colour(index).colour,
-            title=f"{index}. {option.label}",
-            description=f"*{option.vote_count} votes*\n{mentions}",
+            title=f"{index + 1}. {option.label}",
+            description=f"*{option.vote_count} vote{'s' if option.vote_count != 1 else ''}*\n{mentions}",
         )
-
-    def split(self) -> list[Embed]:
-        limit = 5700  # 6000 actually, but just to be safe and accounting for the title and vote count
-        if len(self) < limit:
-            return [self]
-        desc = str(self.description)
-        embeds: list[Embed] = []
-        start = end = 0
-        while end < len(desc):
-            try:
-                end = next(
-                    (i for i in range(start + limit - 1, -1, -1) if desc[i] == " "),
-                    start + limit,
-                )
-            except IndexError:
-                end = len(desc)
-            embeds.append(
-                Embed(color=self.colour, title=self.title, description=desc[start:end])
-            )
-            start = end + 1
-        return embeds
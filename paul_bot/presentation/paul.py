@@ -1,12 +1,15 @@
+import asyncio
 import logging
-from collections.abc import Iterable
+import os
+from collections.abc import Iterable, Sequence
 from datetime import UTC, datetime, timedelta
+from itertools import batched
+from time import monotonic, perf_counter
 from typing import Any
 
-import psutil
 from disnake import Activity, ActivityType, Client, Event
 from disnake.errors import Forbidden, NotFound
-from disnake.ext.commands.bot import InteractionBot
+from disnake.ext.commands.bot import AutoShardedInteractionBot
 from disnake.ext.commands.params import (
     Param,  # pyright: ignore[reportUnknownVariableType]
 )
@@ -15,44 +18,77 @@ from disnake.interactions import MessageInteraction
 from disnake.interactions.application_command import GuildCommandInteraction
 from disnake.interactions.base import Interaction
 from disnake.interactions.modal import ModalInteraction
+from disnake.member import Member
 from disnake.message import Message
+from disnake.role import Role
+from disnake.user import User
 
-from paul_bot.application import Mention, Poll
+from paul_bot import metrics
+from paul_bot.application import Mention, Poll, ShardOwnership, name_index
 from paul_bot.application.option import Option
+from paul_bot.utils import background
 
 from .close_loop import CloseLoop
 from .command_params import PollCommandParams
 from .converters import length_bound_str, parse_expires, parse_mentions, parse_options
+from .edit_scheduler import EditScheduler
 from .embeds.poll_closed_embed import PollClosedEmbed
 from .embeds.poll_embed import PollEmbed
 from .embeds.poll_embed_base import PollEmbedBase
 from .errors import FriendlyError, handle_error
 from .ui import buttons
 from .ui.poll_buttons import PollButtons
+from .ui.votes_option_select import VotesOptionSelect
 
 logger = logging.getLogger(__name__)
 
 
 class Paul:
-    def __init__(self, bot: InteractionBot) -> None:
+    def __init__(self, bot: AutoShardedInteractionBot) -> None:
         self.__bot = bot
         self.__total_poll_count = 0
         self.__closed_poll_count = 0
         self.__on_ready_triggered = False
         self.__current_presence = ""
-        self.__close_queue = CloseLoop(self)
+        self.__catch_up_concurrency = int(os.getenv("CATCH_UP_CONCURRENCY", "5"))
+        self.__preload_batch_size = int(os.getenv("POLL_PRELOAD_BATCH_SIZE", "0"))
+        self.__preload_max_memory = int(os.getenv("POLL_PRELOAD_MAX_MEMORY_MB", "0"))
+        self.__close_queue = CloseLoop(
+            self, float(os.getenv("CLOSE_BATCH_WINDOW", "1"))
+        )
+        self.__edit_scheduler = EditScheduler(
+            self.__edit_poll_message, float(os.getenv("POLL_EDIT_INTERVAL", "1"))
+        )
+        metrics.polls.set_function(
+            lambda: self.__total_poll_count - self.__closed_poll_count, state="active"
+        )
+        metrics.polls.set_function(lambda: self.__closed_poll_count, state="closed")
+        metrics.coalesced_edits.set_function(lambda: self.coalesced_edits)
+
+    @property
+    def coalesced_edits(self) -> int:
+        """The number of poll message edits that were skipped because a newer edit of the same poll superseded them."""
+        return self.__edit_scheduler.coalesced
 
     async def on_ready(self) -> None:
         if self.__on_ready_triggered:
             return
         self.__on_ready_triggered = True
+        # psutil is only needed for this one log line, so it isn't imported with the bot
+        import psutil
+
         logger.info(
             f"\n{self.__bot.user.name} has connected to Discord! (mem: {psutil.Process().memory_info().rss // (1024 * 1024)} MB)\n"
         )
+        catch_up_start = monotonic()
+        expired_poll_ids = await Poll.close_expired()
         self.__close_queue.start()
         self.__total_poll_count = await Poll.count()
         self.__closed_poll_count = await Poll.count(closed=True)
         await self.__update_presence()
+        background(self.__catch_up(expired_poll_ids, catch_up_start))
+        if self.__preload_batch_size > 0:
+            background(self.__preload_polls())
 
     async def on_guild_join(self, guild: Guild) -> None:
         logger.info(f"Joined guild {guild.name}.")
@@ -60,12 +96,81 @@ class Paul:
 
     async def close_poll_now(self, poll: Poll) -> None:
         """Close a poll immediately."""
-        logger.debug(f"Closing poll {poll.question}.")
-        poll.close()
-        await self.__update_poll_message(poll)
-        self.__closed_poll_count += 1
+        await self.close_polls_now((poll,))
+
+    async def close_polls_now(self, polls: Sequence[Poll]) -> None:
+        """Close several polls immediately, marking them as closed in a single database update.
+
+        Args:
+            polls: The polls to close.
+        """
+        logger.debug(f"Closing polls {', '.join(poll.question for poll in polls)}.")
+        Poll.close_all(polls)
+        for poll in polls:
+            self.__close_queue.unregister(poll)
+        results = await asyncio.gather(
+            *(self.__update_poll_message(poll) for poll in polls),
+            return_exceptions=True,
+        )
+        for poll, result in zip(polls, results, strict=True):
+            if isinstance(result, Exception):
+                logger.error(
+                    f"Failed to update the message of closed poll {poll.poll_id}.",
+                    exc_info=result,
+                )
+        self.__closed_poll_count += len(polls)
         await self.__update_presence()
 
+    async def __catch_up(self, poll_ids: Sequence[int], start: float) -> None:
+        """Update the messages of polls which expired while the bot was offline and have already been closed in the database.
+
+        Args:
+            poll_ids: The IDs of the polls which were closed.
+            start: The time (from `time.monotonic`) at which the catch-up started.
+        """
+        if not poll_ids:
+            return
+        logger.info(
+            f"Catching up on {len(poll_ids)} polls which expired while offline."
+        )
+        semaphore = asyncio.Semaphore(self.__catch_up_concurrency)
+        updated = 0
+
+        async def update(poll: Poll) -> None:
+            nonlocal updated
+            async with semaphore:
+                try:
+                    await self.__update_poll_message(poll)
+                except NotFound:
+                    logger.debug(f"The message of expired poll {poll.poll_id} is gone.")
+                except Exception:
+                    logger.exception(
+                        f"Failed to update the message of expired poll {poll.poll_id}."
+                    )
+            updated += 1
+            if updated % 100 == 0:
+                logger.info(f"Caught up on {updated}/{len(poll_ids)} expired polls.")
+
+        for batch in batched(poll_ids, 500, strict=False):
+            await asyncio.gather(
+                *(update(poll) for poll in await Poll.fetch_many(batch))
+            )
+        logger.info(
+            f"Caught up on {len(poll_ids)} expired polls in {monotonic() - start:.1f} s."
+        )
+
+    async def __preload_polls(self) -> None:
+        start = monotonic()
+        loaded = await Poll.preload_open(
+            self.__preload_batch_size,
+            self.__preload_max_memory * 1024 * 1024
+            if self.__preload_max_memory > 0
+            else None,
+        )
+        logger.info(
+            f"Preloaded {loaded} open polls into the cache in {monotonic() - start:.1f} s."
+        )
+
     async def new_poll(
         self, params: PollCommandParams, author_id: int, message: Message
     ) -> None:
@@ -106,7 +211,7 @@ class Paul:
             option: The option to vote for.
             voter_id: The ID of the user who voted.
         """
-        option.toggle_vote(voter_id)
+        await option.toggle_vote(voter_id)
         await self.__update_poll_message(option.poll)
 
     async def __update_poll_message(
@@ -114,16 +219,22 @@ class Paul:
     ) -> None:
         """Update the poll's message. This should be called after a poll changes.
 
+        Updates are coalesced, so a burst of changes to the same poll results in a single edit showing the latest state.
+
         Args:
             poll: The poll whose message should be updated.
             message: The message containing the poll. If omitted, it will be fetched asynchronously.
         """
+        await self.__edit_scheduler.schedule(poll, message)
+
+    async def __edit_poll_message(self, poll: Poll, message: Message | None) -> None:
         try:
             message = message or await self.__get_poll_message(poll)
-            await message.edit(
-                embed=PollClosedEmbed(poll) if poll.is_expired else PollEmbed(poll),
-                components=PollButtons(self, poll),
-            )
+            with metrics.message_edit_latency.time():
+                await message.edit(
+                    embed=PollClosedEmbed(poll) if poll.is_expired else PollEmbed(poll),
+                    components=PollButtons(self, poll),
+                )
         except Forbidden:
             pass
 
@@ -145,7 +256,13 @@ class Paul:
             self.__current_presence = activity_name
 
 
-bot = InteractionBot()
+shard_ownership = ShardOwnership.from_env()
+bot = AutoShardedInteractionBot(
+    shard_count=shard_ownership.shard_count,
+    shard_ids=sorted(shard_ownership.shard_ids)
+    if shard_ownership.shard_ids is not None
+    else None,
+)
 paul = Paul(bot)
 
 
@@ -159,6 +276,48 @@ async def on_guild_join(guild: Guild) -> None:
     await paul.on_guild_join(guild)
 
 
+@bot.listen(Event.guild_remove)
+async def on_guild_remove(guild: Guild) -> None:
+    name_index.forget_guild(guild.id)
+
+
+# Keep the name index of mentions current. Hits are checked against the cache, so a missed event only costs a scan
+@bot.listen(Event.member_join)
+async def on_member_join(member: Member) -> None:
+    name_index.add_member(member)
+
+
+@bot.listen(Event.member_update)
+async def on_member_update(_: Member, after: Member) -> None:
+    name_index.add_member(after)
+
+
+@bot.listen(Event.member_remove)
+async def on_member_remove(member: Member) -> None:
+    name_index.remove_member(member)
+
+
+@bot.listen(Event.user_update)
+async def on_user_update(before: User, after: User) -> None:
+    if (before.name, before.global_name) != (after.name, after.global_name):
+        name_index.remove_user(after.id)
+
+
+@bot.listen(Event.guild_role_create)
+async def on_guild_role_create(role: Role) -> None:
+    name_index.add_role(role)
+
+
+@bot.listen(Event.guild_role_update)
+async def on_guild_role_update(_: Role, after: Role) -> None:
+    name_index.add_role(after)
+
+
+@bot.listen(Event.guild_role_delete)
+async def on_guild_role_delete(role: Role) -> None:
+    name_index.remove_role(role)
+
+
 @bot.event
 async def on_error(event_method: str, *args: Any, **kwargs: Any) -> None:
     logger.exception(f"Error in {event_method} ({args=}, {kwargs=})")
@@ -208,28 +367,34 @@ async def poll(
         converter=parse_mentions,
     ),
 ) -> None:
-    params = PollCommandParams(
-        question,
-        options,
-        expires,
-        allow_multiple_votes,
-        allowed_vote_viewers,
-        allowed_editors,
-        allowed_voters,
-    )
-    logger.debug(f"{inter.author.name} wants to create a poll: {params}.")
-    await inter.response.send_message(
-        embed=PollEmbedBase(question, "<a:loading:904120454975991828> Creating poll...")
-    )
-    message = await inter.original_message()
-    await paul.new_poll(params, inter.author.id, message)
-    logger.debug(f"{inter.author.name} successfully created a poll {question}.")
+    with metrics.command_latency.time(command="poll"):
+        params = PollCommandParams(
+            question,
+            options,
+            expires,
+            allow_multiple_votes,
+            allowed_vote_viewers,
+            allowed_editors,
+            allowed_voters,
+        )
+        logger.debug(f"{inter.author.name} wants to create a poll: {params}.")
+        await inter.response.send_message(
+            embed=PollEmbedBase(
+                question, "<a:loading:904120454975991828> Creating poll..."
+            )
+        )
+        message = await inter.original_message()
+        await paul.new_poll(params, inter.author.id, message)
+        logger.debug(f"{inter.author.name} successfully created a poll {question}.")
 
 
 @bot.listen(Event.button_click)
-async def on_button_click(inter: MessageInteraction[InteractionBot]) -> None:
+async def on_button_click(inter: MessageInteraction[AutoShardedInteractionBot]) -> None:
+    start = perf_counter()
+    button_class = "unknown"
     try:
         button = await buttons.factory(paul, inter)
+        button_class = type(button).__name__
         await button.callback(inter)
     except FriendlyError as e:
         await e.send()
@@ -240,3 +405,26 @@ async def on_button_click(inter: MessageInteraction[InteractionBot]) -> None:
             )
         else:
             raise
+    finally:
+        metrics.button_latency.observe(perf_counter() - start, button=button_class)
+
+
+@bot.listen(Event.dropdown)
+async def on_dropdown(inter: MessageInteraction[AutoShardedInteractionBot]) -> None:
+    start = perf_counter()
+    select_class = "unknown"
+    try:
+        select = await VotesOptionSelect.from_interaction(inter)
+        select_class = type(select).__name__
+        await select.callback(inter)
+    except FriendlyError as e:
+        await e.send()
+    except NotFound as e:
+        if "unknown interaction" in str(e).lower():
+            logger.warning(
+                f"Select menu interaction took too long to respond to: {e}\nSelect menu ID: {inter.component.custom_id}"
+            )
+        else:
+            raise
+    finally:
+        metrics.select_latency.observe(perf_counter() - start, select=select_class)
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from disnake.ext.commands import InteractionBot
+from disnake.ext.commands import AutoShardedInteractionBot
 from disnake.interactions import MessageInteraction
 
 from .add_option_button import AddOptionButton
@@ -10,6 +10,7 @@ from .base_button import BaseButton, InteractionMismatchError
 from .close_poll_button import ClosePollButton
 from .see_votes_button import SeeVotesButton
 from .vote_button import VoteButton
+from .votes_page_button import VotesPageButton
 
 if TYPE_CHECKING:
     from paul_bot.presentation.paul import Paul
@@ -20,11 +21,20 @@ __all__ = (
     "ClosePollButton",
     "SeeVotesButton",
     "VoteButton",
+    "VotesPageButton",
 )
 
 
-async def factory(paul: Paul, inter: MessageInteraction[InteractionBot]) -> BaseButton:
-    for cls in (AddOptionButton, VoteButton, SeeVotesButton, ClosePollButton):
+async def factory(
+    paul: Paul, inter: MessageInteraction[AutoShardedInteractionBot]
+) -> BaseButton:
+    for cls in (
+        AddOptionButton,
+        VoteButton,
+        SeeVotesButton,
+        ClosePollButton,
+        VotesPageButton,
+    ):
         try:
             return await cls.from_interaction(paul, inter)
         except InteractionMismatchError:
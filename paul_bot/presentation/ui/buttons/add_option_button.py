@@ -4,7 +4,7 @@ import logging
 from typing import TYPE_CHECKING, Self, override
 
 from disnake.enums import ButtonStyle
-from disnake.ext.commands import InteractionBot
+from disnake.ext.commands import AutoShardedInteractionBot
 from disnake.interactions.message import MessageInteraction
 
 from paul_bot.application.mention import mentions_str
@@ -34,7 +34,7 @@ class AddOptionButton(BaseButton):
         self.__poll = poll
 
         super().__init__(
-            allowed_clickers=poll.allowed_editors,
+            allowed_clickers=poll.editors_acl,
             style=ButtonStyle.grey,
             label="Add Option",
             custom_id=str(poll.poll_id),
@@ -45,7 +45,7 @@ class AddOptionButton(BaseButton):
     @override
     @classmethod
     async def from_interaction(
-        cls, paul: Paul, inter: MessageInteraction[InteractionBot]
+        cls, paul: Paul, inter: MessageInteraction[AutoShardedInteractionBot]
     ) -> Self:
         poll = await Poll.fetch_by_id(cls._parse_custom_id(inter))
         if poll is None:
@@ -55,7 +55,9 @@ class AddOptionButton(BaseButton):
         return cls(paul, poll)
 
     @override
-    async def _on_click(self, inter: MessageInteraction[InteractionBot]) -> None:
+    async def _on_click(
+        self, inter: MessageInteraction[AutoShardedInteractionBot]
+    ) -> None:
         logger.debug(
             f"{inter.author.display_name} wants to add an option to poll {self.__poll.question}."
         )
@@ -1,15 +1,15 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from collections.abc import Iterable
 from typing import TYPE_CHECKING, Self
 
 from disnake import ButtonStyle, Emoji, PartialEmoji
-from disnake.ext.commands import InteractionBot
+from disnake.ext.commands import AutoShardedInteractionBot
 from disnake.interactions import MessageInteraction
 from disnake.ui import Button as DisnakeButton
 
-from paul_bot.application.mention import Mention, mentions_str
+from paul_bot.application.acl import Acl
+from paul_bot.application.mention import mentions_str
 from paul_bot.presentation.errors import FriendlyError
 
 if TYPE_CHECKING:
@@ -34,12 +34,14 @@ class BaseButton(ABC):
 
     def __init__(
         self,
-        allowed_clickers: Iterable[Mention],
+        allowed_clickers: Acl,
         style: ButtonStyle,
         label: str,
         custom_id: str,
         emoji: str | Emoji | PartialEmoji | None = None,
         row: int | None = None,
+        *,
+        disabled: bool = False,
     ) -> None:
         self._style = style
         self._label = label
@@ -50,12 +52,13 @@ class BaseButton(ABC):
         )
         self._emoji = emoji
         self._row = row
+        self._disabled = disabled
         self.allowed_clickers = allowed_clickers
 
     @classmethod
     @abstractmethod
     async def from_interaction(
-        cls, paul: Paul, inter: MessageInteraction[InteractionBot]
+        cls, paul: Paul, inter: MessageInteraction[AutoShardedInteractionBot]
     ) -> Self:
         """Create an instance of the button from an interaction. If the interaction does not match this kind of button, raise an InteractionMismatchError."""
 
@@ -67,25 +70,30 @@ class BaseButton(ABC):
             custom_id=self._custom_id,
             emoji=self._emoji,
             row=self._row,
+            disabled=self._disabled,
         )
 
-    async def callback(self, inter: MessageInteraction[InteractionBot]) -> None:
-        if any(
-            mention.includes_member(inter.author) for mention in self.allowed_clickers
-        ):
+    async def callback(
+        self, inter: MessageInteraction[AutoShardedInteractionBot]
+    ) -> None:
+        if self.allowed_clickers.includes_member(inter.author):
             await self._on_click(inter)
         else:
             raise FriendlyError(self._no_permission_message, inter)
 
     @abstractmethod
-    async def _on_click(self, inter: MessageInteraction[InteractionBot]) -> None: ...
+    async def _on_click(
+        self, inter: MessageInteraction[AutoShardedInteractionBot]
+    ) -> None: ...
 
     @property
     def _no_permission_message(self) -> str:
         return f"You do not have permission to perform this action.\nTo perform this action you must be one of {mentions_str(self.allowed_clickers)}"
 
     @classmethod
-    def _parse_custom_id(cls, inter: MessageInteraction[InteractionBot]) -> int:
+    def _parse_custom_id(
+        cls, inter: MessageInteraction[AutoShardedInteractionBot]
+    ) -> int:
         """Try to parse the numerical ID from the button's custom ID. If the custom ID does not match the expected format, raise an InteractionMismatchError."""
         custom_id = inter.component.custom_id or ""
         if not custom_id.endswith(cls._CUSTOM_ID_SUFFIX):
@@ -98,7 +106,9 @@ class BaseButton(ABC):
 
 class InteractionMismatchError(ValueError):
     def __init__(
-        self, cls: type[BaseButton], inter: MessageInteraction[InteractionBot]
+        self,
+        cls: type[BaseButton],
+        inter: MessageInteraction[AutoShardedInteractionBot],
     ) -> None:
         component_description = f"{type(inter.component).__name__}(custom_id={inter.component.custom_id!r}, label={inter.component.label if isinstance(inter.component, DisnakeButton) else None})"
         super().__init__(
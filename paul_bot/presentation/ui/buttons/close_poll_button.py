@@ -3,9 +3,10 @@ from __future__ import annotations
 from typing import TYPE_CHECKING, override
 
 from disnake.enums import ButtonStyle
-from disnake.ext.commands import InteractionBot
+from disnake.ext.commands import AutoShardedInteractionBot
 from disnake.interactions.message import MessageInteraction
 
+from paul_bot.application.acl import Acl
 from paul_bot.application.mention import Mention
 from paul_bot.application.poll import Poll
 from paul_bot.presentation.errors import FriendlyError
@@ -24,7 +25,7 @@ class ClosePollButton(BaseButton):
         self.__poll = poll
         self.__author_mention = Mention.member(poll.author_id)
         super().__init__(
-            allowed_clickers=(self.__author_mention,),
+            allowed_clickers=Acl((self.__author_mention,)),
             style=ButtonStyle.red,
             label="Close Poll",
             custom_id=str(poll.poll_id),
@@ -34,7 +35,7 @@ class ClosePollButton(BaseButton):
     @override
     @classmethod
     async def from_interaction(
-        cls, paul: Paul, inter: MessageInteraction[InteractionBot]
+        cls, paul: Paul, inter: MessageInteraction[AutoShardedInteractionBot]
     ) -> ClosePollButton:
         poll = await Poll.fetch_by_id(cls._parse_custom_id(inter))
         if poll is None:
@@ -44,7 +45,9 @@ class ClosePollButton(BaseButton):
         return cls(paul, poll)
 
     @override
-    async def _on_click(self, inter: MessageInteraction[InteractionBot]) -> None:
+    async def _on_click(
+        self, inter: MessageInteraction[AutoShardedInteractionBot]
+    ) -> None:
         await inter.response.defer()
         await self.__paul.close_poll_now(self.__poll)
 
@@ -4,14 +4,11 @@ from typing import TYPE_CHECKING, Self, override
 
 import disnake
 from disnake.enums import ButtonStyle
-from disnake.ext.commands import InteractionBot
+from disnake.ext.commands import AutoShardedInteractionBot
 from disnake.interactions.message import MessageInteraction
 
 from paul_bot.application.poll import Poll
-from paul_bot.presentation.embeds.question_results_embed import QuestionResultsEmbed
-from paul_bot.presentation.embeds.see_option_results_embed import SeeOptionResultsEmbed
 from paul_bot.presentation.errors import FriendlyError
-from paul_bot.utils import chunks
 
 from .base_button import BaseButton
 
@@ -25,7 +22,7 @@ class SeeVotesButton(BaseButton):
     def __init__(self, poll: Poll) -> None:
         self.__poll = poll
         super().__init__(
-            allowed_clickers=poll.allowed_vote_viewers,
+            allowed_clickers=poll.vote_viewers_acl,
             style=ButtonStyle.grey,
             label="See Votes",
             custom_id=str(poll.poll_id),
@@ -36,7 +33,7 @@ class SeeVotesButton(BaseButton):
     @override
     @classmethod
     async def from_interaction(
-        cls, paul: Paul, inter: MessageInteraction[InteractionBot]
+        cls, paul: Paul, inter: MessageInteraction[AutoShardedInteractionBot]
     ) -> Self:
         poll = await Poll.fetch_by_id(cls._parse_custom_id(inter))
         if poll is None:
@@ -47,18 +44,15 @@ class SeeVotesButton(BaseButton):
 
     @override
     async def _on_click(self, inter: MessageInteraction[disnake.Client]) -> None:
-        await inter.response.defer(with_message=True, ephemeral=True)
-        embeds: list[disnake.Embed] = [QuestionResultsEmbed(self.__poll)]
-        embeds.extend(
-            embed
-            for index, option in enumerate(self.__poll.options)
-            for embed in SeeOptionResultsEmbed(option, index).split()
+        # must be imported here to avoid circular imports
+        from paul_bot.presentation.ui.votes_browser import VotesBrowser
+
+        if not self.__poll.options:
+            raise FriendlyError("This poll has no options.", inter)
+        browser = await VotesBrowser.load(self.__poll.options[0])
+        await inter.response.send_message(
+            embeds=browser.embeds, components=browser.components, ephemeral=True
         )
-        for ten_embeds in chunks(embeds, 10):
-            await inter.followup.send(
-                embeds=[embed for embed in ten_embeds if embed is not None],
-                ephemeral=True,
-            )
 
     @property
     @override
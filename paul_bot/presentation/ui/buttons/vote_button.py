@@ -4,7 +4,7 @@ from typing import TYPE_CHECKING, override
 
 from disnake import Client
 from disnake.enums import ButtonStyle
-from disnake.ext.commands import InteractionBot
+from disnake.ext.commands import AutoShardedInteractionBot
 from disnake.interactions.message import MessageInteraction
 
 from paul_bot.application.mention import mentions_str
@@ -31,7 +31,7 @@ class VoteButton(BaseButton):
         self.__paul = paul
         self.__option = option
         super().__init__(
-            allowed_clickers=option.poll.allowed_voters,
+            allowed_clickers=option.poll.voters_acl,
             style=ButtonStyle.blurple,
             label=(
                 f"{option.index + 1!s}. {option.label[:30]}{'...' if len(option.label) > 30 else ''}"
@@ -43,7 +43,7 @@ class VoteButton(BaseButton):
     @override
     @classmethod
     async def from_interaction(
-        cls, paul: Paul, inter: MessageInteraction[InteractionBot]
+        cls, paul: Paul, inter: MessageInteraction[AutoShardedInteractionBot]
     ) -> VoteButton:
         option = await Poll.fetch_option(cls._parse_custom_id(inter))
         if option is None:
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Self, override
+
+from disnake.enums import ButtonStyle
+from disnake.ext.commands import AutoShardedInteractionBot
+from disnake.interactions.message import MessageInteraction
+
+from paul_bot.application.option import Option
+from paul_bot.application.poll import Poll
+from paul_bot.presentation.errors import FriendlyError
+
+from .base_button import BaseButton, InteractionMismatchError
+
+if TYPE_CHECKING:
+    from paul_bot.presentation.paul import Paul
+
+
+class VotesPageButton(BaseButton):
+    """Turns the page of a `VotesBrowser`.
+
+    The custom ID holds the option's ID and the voter ID to turn the page from, prefixed with ">" to show the voters after it or "<" to show the voters before it. The voter ID is left out when there is none to turn from, in which case the first page is shown.
+    """
+
+    _CUSTOM_ID_SUFFIX: str = " votes_page"
+
+    def __init__(
+        self,
+        option: Option,
+        *,
+        after: int | None = None,
+        before: int | None = None,
+        previous: bool = False,
+        disabled: bool = False,
+    ) -> None:
+        """Construct the button.
+
+        Args:
+            option: The option whose voters are shown.
+            after: The voter ID to show the voters after.
+            before: The voter ID to show the voters before.
+            previous: Whether the button turns to the previous page, rather than the next. Implied by `before`.
+            disabled: Whether the button is disabled.
+        """
+        previous = previous or before is not None
+        self.__option = option
+        self.__after = after
+        self.__before = before
+        voter_id = before if before is not None else after
+        cursor = f"{'<' if previous else '>'}{'' if voter_id is None else voter_id}"
+        super().__init__(
+            allowed_clickers=option.poll.vote_viewers_acl,
+            style=ButtonStyle.grey,
+            label="Previous" if previous else "Next",
+            custom_id=f"{option.option_id} {cursor}",
+            emoji="◀️" if previous else "▶️",
+            disabled=disabled,
+        )
+
+    @override
+    @classmethod
+    async def from_interaction(
+        cls, paul: Paul, inter: MessageInteraction[AutoShardedInteractionBot]
+    ) -> Self:
+        custom_id = inter.component.custom_id or ""
+        if not custom_id.endswith(cls._CUSTOM_ID_SUFFIX):
+            raise InteractionMismatchError(cls, inter)
+        try:
+            raw_option_id, cursor = custom_id.removesuffix(
+                cls._CUSTOM_ID_SUFFIX
+            ).split()
+            option_id = int(raw_option_id)
+            voter_id = int(cursor[1:]) if cursor[1:] else None
+        except ValueError:
+            raise InteractionMismatchError(cls, inter) from None
+        option = await Poll.fetch_option(option_id)
+        if option is None:
+            raise FriendlyError(
+                "I'm sorry, I could not find this option in the database.", inter
+            )
+        if cursor.startswith("<"):
+            return cls(option, before=voter_id, previous=True)
+        return cls(option, after=voter_id)
+
+    @override
+    async def _on_click(
+        self, inter: MessageInteraction[AutoShardedInteractionBot]
+    ) -> None:
+        # must be imported here to avoid circular imports
+        from paul_bot.presentation.ui.votes_browser import VotesBrowser
+
+        browser = await VotesBrowser.load(
+            self.__option, after=self.__after, before=self.__before
+        )
+        await inter.response.edit_message(
+            embeds=browser.embeds, components=browser.components
+        )
+
+    @property
+    @override
+    def _no_permission_message(self) -> str:
+        return "You do not have permission to view the votes."
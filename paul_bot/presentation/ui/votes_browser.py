@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from typing import Self
+
+from disnake import Embed
+from disnake.ui import ActionRow, MessageUIComponent
+
+from paul_bot.application.option import Option
+from paul_bot.presentation.embeds.question_results_embed import QuestionResultsEmbed
+from paul_bot.presentation.embeds.see_option_results_embed import SeeOptionResultsEmbed
+
+from .buttons.votes_page_button import VotesPageButton
+from .votes_option_select import VotesOptionSelect
+
+PAGE_SIZE = 100
+"""The most voters shown on one page. Their mentions must fit in an embed's description."""
+
+
+class VotesBrowser:
+    """An ephemeral message showing one page of the voters of one of a poll's options, with a select menu to switch option and buttons to turn the page.
+
+    The page's position is kept in the custom IDs of its components, so the browser has no state of its own and keeps working after the bot restarts. Each page is fetched from the database with keyset pagination on the voter ID, so showing a page costs the same no matter how many members voted.
+    """
+
+    def __init__(
+        self, option: Option, voters: list[int], *, has_previous: bool, has_next: bool
+    ) -> None:
+        self.__option = option
+        self.__voters = voters
+        self.__has_previous = has_previous
+        self.__has_next = has_next
+
+    @classmethod
+    async def load(
+        cls, option: Option, *, after: int | None = None, before: int | None = None
+    ) -> Self:
+        """Fetch a page of an option's voters.
+
+        Args:
+            option: The option whose voters to show.
+            after: Show the voters following this voter ID. If neither this nor `before` is given, the first page is shown.
+            before: Show the voters preceding this voter ID.
+        """
+        # Fetching one extra voter tells whether there is another page in the direction being turned
+        voters = await option.fetch_voter_page(
+            PAGE_SIZE + 1, after=after, before=before
+        )
+        if not voters and (after is not None or before is not None):
+            # Everyone on the requested page has removed their vote since it was linked to
+            return await cls.load(option)
+        if before is not None:
+            return cls(
+                option,
+                voters[-PAGE_SIZE:],
+                has_previous=len(voters) > PAGE_SIZE,
+                has_next=True,
+            )
+        return cls(
+            option,
+            voters[:PAGE_SIZE],
+            has_previous=after is not None,
+            has_next=len(voters) > PAGE_SIZE,
+        )
+
+    @property
+    def embeds(self) -> list[Embed]:
+        return [
+            QuestionResultsEmbed(self.__option.poll),
+            SeeOptionResultsEmbed(self.__option, self.__option.index, self.__voters),
+        ]
+
+    @property
+    def components(self) -> list[ActionRow[MessageUIComponent]]:
+        first = self.__voters[0] if self.__voters else None
+        last = self.__voters[-1] if self.__voters else None
+        return [
+            ActionRow(VotesOptionSelect(self.__option.poll, self.__option).select),
+            ActionRow(
+                VotesPageButton(
+                    self.__option,
+                    before=first,
+                    previous=True,
+                    disabled=not self.__has_previous,
+                ).button,
+                VotesPageButton(
+                    self.__option, after=last, disabled=not self.__has_next
+                ).button,
+            ),
+        ]
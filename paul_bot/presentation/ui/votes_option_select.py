@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from typing import Self
+
+from disnake import SelectOption
+from disnake.ext.commands import AutoShardedInteractionBot
+from disnake.interactions import MessageInteraction
+from disnake.ui.select.string import StringSelect
+
+from paul_bot.application.option import Option
+from paul_bot.application.poll import Poll
+from paul_bot.presentation.errors import FriendlyError
+
+
+class VotesOptionSelect:
+    """A select menu which switches the option whose voters a `VotesBrowser` shows. Its custom ID holds the poll's ID."""
+
+    _CUSTOM_ID_SUFFIX: str = " votes_option"
+
+    def __init__(self, poll: Poll, selected: Option | None = None) -> None:
+        self.__poll = poll
+        self.__selected = selected
+
+    @property
+    def select(self) -> StringSelect[None]:
+        return StringSelect(
+            custom_id=f"{self.__poll.poll_id}{self._CUSTOM_ID_SUFFIX}",
+            options=[
+                SelectOption(
+                    # Select option labels are limited to 100 characters
+                    label=f"{option.index + 1}. {option.label}"[:100],
+                    value=str(option.option_id),
+                    description=f"{option.vote_count} vote{'s' if option.vote_count != 1 else ''}",
+                    default=option is self.__selected,
+                )
+                for option in self.__poll.options
+            ],
+        )
+
+    @classmethod
+    async def from_interaction(
+        cls, inter: MessageInteraction[AutoShardedInteractionBot]
+    ) -> Self:
+        """Create the select menu which was used in an interaction.
+
+        Raises:
+            ValueError: If the interaction is not with a select menu of this kind.
+        """
+        custom_id = inter.component.custom_id or ""
+        if not custom_id.endswith(cls._CUSTOM_ID_SUFFIX):
+            raise ValueError(f"Unknown select menu {custom_id!r}.")
+        poll = await Poll.fetch_by_id(
+            int(custom_id.removesuffix(cls._CUSTOM_ID_SUFFIX))
+        )
+        if poll is None:
+            raise FriendlyError(
+                "I'm sorry, I could not find this poll in the database.", inter
+            )
+        return cls(poll)
+
+    async def callback(
+        self, inter: MessageInteraction[AutoShardedInteractionBot]
+    ) -> None:
+        # must be imported here to avoid circular imports
+        from .votes_browser import VotesBrowser
+
+        if not self.__poll.vote_viewers_acl.includes_member(inter.author):
+            raise FriendlyError("You do not have permission to view the votes.", inter)
+        option = next(
+            (
+                option
+                for option in self.__poll.options
+                if str(option.option_id) in (inter.values or ())
+            ),
+            None,
+        )
+        if option is None:
+            raise FriendlyError(
+                "I'm sorry, I could not find this option in the database.", inter
+            )
+        browser = await VotesBrowser.load(option)
+        await inter.response.edit_message(
+            embeds=browser.embeds, components=browser.components
+        )
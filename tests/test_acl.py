@@ -0,0 +1,59 @@
+from unittest import TestCase
+from unittest.mock import Mock
+
+import disnake
+
+from paul_bot.application import Acl, Mention
+
+GUILD_ID = 100
+
+
+def _member(member_id: int, role_ids: tuple[int, ...] = ()) -> disnake.Member:
+    member = Mock(spec=disnake.Member)
+    member.id = member_id
+    member.guild.id = GUILD_ID
+    member._roles = role_ids  # noqa: SLF001
+    return member
+
+
+def _user(user_id: int) -> disnake.User:
+    user = Mock(spec=disnake.User)
+    user.id = user_id
+    return user
+
+
+class AclTest(TestCase):
+    def test_empty(self) -> None:
+        acl = Acl(())
+        self.assertFalse(acl)
+        self.assertFalse(acl.includes_member(_member(1)))
+
+    def test_keeps_mentions(self) -> None:
+        mentions = (Mention.member(1), Mention.role(2))
+        acl = Acl(iter(mentions))
+        self.assertTrue(acl)
+        self.assertEqual(acl.mentions, mentions)
+        self.assertEqual(tuple(acl), mentions)
+
+    def test_includes_mentioned_members(self) -> None:
+        acl = Acl((Mention.member(1),))
+        self.assertTrue(acl.includes_member(_member(1)))
+        self.assertTrue(acl.includes_member(_user(1)))
+        self.assertFalse(acl.includes_member(_member(2)))
+
+    def test_includes_members_with_a_mentioned_role(self) -> None:
+        acl = Acl((Mention.role(10), Mention.role(11)))
+        self.assertTrue(acl.includes_member(_member(1, (5, 11))))
+        self.assertFalse(acl.includes_member(_member(1, (5, 12))))
+        self.assertFalse(acl.includes_member(_member(10)))
+
+    def test_everyone_role_includes_every_member(self) -> None:
+        acl = Acl((Mention.role(GUILD_ID),))
+        self.assertTrue(acl.includes_member(_member(1)))
+
+    def test_roles_dont_include_users(self) -> None:
+        acl = Acl((Mention.role(GUILD_ID),))
+        self.assertFalse(acl.includes_member(_user(1)))
+
+    def test_member_and_role_ids_are_separate(self) -> None:
+        self.assertFalse(Acl((Mention.member(10),)).includes_member(_member(1, (10,))))
@@ -0,0 +1,112 @@
+import asyncio
+from collections.abc import Sequence
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING, cast
+
+from paul_bot.application import Poll
+from paul_bot.presentation.close_loop import CloseLoop
+
+from .utils import MemoryBackendTestCase
+
+if TYPE_CHECKING:
+    from paul_bot.presentation.paul import Paul
+
+
+class _FakePaul:
+    def __init__(self) -> None:
+        self.batches: list[tuple[list[int], datetime]] = []
+        self.closed = asyncio.Event()
+
+    async def close_polls_now(self, polls: Sequence[Poll]) -> None:
+        Poll.close_all(polls)
+        self.batches.append((sorted(poll.poll_id for poll in polls), datetime.now(UTC)))
+        self.closed.set()
+
+
+class CloseLoopTest(MemoryBackendTestCase):
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+        self.paul = _FakePaul()
+
+    async def start(self, batch_window: float = 0) -> CloseLoop:
+        loop = CloseLoop(cast("Paul", self.paul), batch_window)
+        loop.start()
+        # Let the loop load the pending expiries
+        await asyncio.sleep(0.01)
+        return loop
+
+    def in_seconds(self, seconds: float) -> datetime:
+        return datetime.now(UTC) + timedelta(seconds=seconds)
+
+    async def wait_for_batches(self, count: int) -> None:
+        async with asyncio.timeout(2):
+            while len(self.paul.batches) < count:
+                self.paul.closed.clear()
+                await self.paul.closed.wait()
+
+    async def test_closes_pending_polls_in_expiry_order(self) -> None:
+        last = await self.add_poll(expires=self.in_seconds(0.15))
+        first = await self.add_poll(expires=self.in_seconds(0.05))
+        second = await self.add_poll(expires=self.in_seconds(0.1))
+        await self.add_poll()
+        await self.start()
+        await self.wait_for_batches(3)
+        self.assertEqual(
+            [poll_ids for poll_ids, _ in self.paul.batches],
+            [[first.poll_id], [second.poll_id], [last.poll_id]],
+        )
+        for poll, (_, closed_at) in zip(
+            (first, second, last), self.paul.batches, strict=True
+        ):
+            assert poll.expires is not None
+            self.assertGreaterEqual(closed_at, poll.expires)
+
+    async def test_batches_polls_expiring_within_the_window(self) -> None:
+        first = await self.add_poll(expires=self.in_seconds(0.05))
+        second = await self.add_poll(expires=self.in_seconds(0.1))
+        await self.start(batch_window=1)
+        await self.wait_for_batches(1)
+        await asyncio.sleep(0.1)
+        [(poll_ids, closed_at)] = self.paul.batches
+        self.assertEqual(poll_ids, sorted((first.poll_id, second.poll_id)))
+        assert second.expires is not None
+        self.assertGreaterEqual(closed_at, second.expires)
+
+    async def test_registering_an_earlier_poll_wakes_the_loop(self) -> None:
+        await self.add_poll(expires=self.in_seconds(60))
+        loop = await self.start()
+        poll = await self.add_poll(expires=self.in_seconds(0.05))
+        loop.register(poll)
+        await self.wait_for_batches(1)
+        self.assertEqual(self.paul.batches[0][0], [poll.poll_id])
+
+    async def test_unregistered_polls_arent_closed(self) -> None:
+        loop = await self.start()
+        unregistered = await self.add_poll(expires=self.in_seconds(0.05))
+        registered = await self.add_poll(expires=self.in_seconds(0.1))
+        loop.register(unregistered)
+        loop.register(registered)
+        loop.unregister(unregistered)
+        await self.wait_for_batches(1)
+        await asyncio.sleep(0.1)
+        self.assertEqual(
+            [poll_ids for poll_ids, _ in self.paul.batches], [[registered.poll_id]]
+        )
+
+    async def test_skips_polls_closed_in_the_meantime(self) -> None:
+        closed = await self.add_poll(expires=self.in_seconds(0.05))
+        remaining = await self.add_poll(expires=self.in_seconds(0.05))
+        await self.start(batch_window=1)
+        closed.close()
+        await self.wait_for_batches(1)
+        self.assertEqual(self.paul.batches[0][0], [remaining.poll_id])
+
+    async def test_ignores_closed_and_unexpiring_polls(self) -> None:
+        loop = await self.start()
+        unexpiring = await self.add_poll()
+        closed = await self.add_poll(expires=self.in_seconds(0.05))
+        closed.close()
+        loop.register(unexpiring)
+        loop.register(closed)
+        await asyncio.sleep(0.15)
+        self.assertEqual(self.paul.batches, [])
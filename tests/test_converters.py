@@ -0,0 +1,95 @@
+from datetime import UTC, datetime, timedelta
+from typing import Self, override
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from disnake import Client
+from disnake.interactions import ApplicationCommandInteraction as Interaction
+
+from paul_bot.presentation.converters import parse_expires
+from paul_bot.presentation.errors import FriendlyError
+
+NOW = datetime(2026, 10, 18, 12, 0, tzinfo=UTC)
+
+
+class _FrozenDatetime(datetime):
+    @override
+    @classmethod
+    def now(cls, tz: object = None) -> Self:
+        return cls.fromtimestamp(NOW.timestamp(), UTC)
+
+
+class ParseExpiresTest(TestCase):
+    def setUp(self) -> None:
+        self.inter = Mock(spec=Interaction[Client])
+        self.enterContext(
+            patch("paul_bot.presentation.converters.datetime", _FrozenDatetime)
+        )
+        self.dateparser = self.enterContext(
+            patch(
+                "paul_bot.presentation.converters._dateparser_parse", return_value=None
+            )
+        )
+
+    def parse(self, text: str) -> datetime | None:
+        return parse_expires(self.inter, text)
+
+    def test_never(self) -> None:
+        self.assertIsNone(self.parse(" Never "))
+
+    def test_durations(self) -> None:
+        for text, offset in (
+            ("1h20m", timedelta(hours=1, minutes=20)),
+            ("in 3 days", timedelta(days=3)),
+            ("2 hours, 5 mins", timedelta(hours=2, minutes=5)),
+            ("1W 2d", timedelta(weeks=1, days=2)),
+            ("90s", timedelta(seconds=90)),
+        ):
+            with self.subTest(text):
+                self.assertEqual(self.parse(text), NOW + offset)
+        self.dateparser.assert_not_called()
+
+    def test_iso_timestamps(self) -> None:
+        self.assertEqual(self.parse("2030-01-02"), datetime(2030, 1, 2, tzinfo=UTC))
+        self.assertEqual(
+            self.parse("2030-01-02T03:04:05+02:00"),
+            datetime(2030, 1, 2, 1, 4, 5, tzinfo=UTC),
+        )
+        self.assertEqual(
+            self.parse("2030-01-02 03:04"), datetime(2030, 1, 2, 3, 4, tzinfo=UTC)
+        )
+        self.dateparser.assert_not_called()
+
+    def test_times_of_day(self) -> None:
+        for text, expected in (
+            ("18:30", datetime(2026, 10, 18, 18, 30, tzinfo=UTC)),
+            ("18:30:15 UTC", datetime(2026, 10, 18, 18, 30, 15, tzinfo=UTC)),
+            ("18:30 +02:00", datetime(2026, 10, 18, 16, 30, tzinfo=UTC)),
+            ("11:30 -0130", datetime(2026, 10, 18, 13, 0, tzinfo=UTC)),
+            # A time which has already passed today means tomorrow
+            ("11:00", datetime(2026, 10, 19, 11, 0, tzinfo=UTC)),
+            ("12:00", datetime(2026, 10, 19, 12, 0, tzinfo=UTC)),
+            ("13:00 +02", datetime(2026, 10, 19, 11, 0, tzinfo=UTC)),
+        ):
+            with self.subTest(text):
+                self.assertEqual(self.parse(text), expected)
+        self.dateparser.assert_not_called()
+
+    def test_falls_back_to_dateparser(self) -> None:
+        expected = datetime(2026, 10, 23, tzinfo=UTC)
+        self.dateparser.return_value = expected
+        for text in ("next friday", "25:00", "2030-13-01"):
+            with self.subTest(text):
+                self.assertEqual(self.parse(text), expected)
+                self.dateparser.assert_called_with(text)
+
+    def test_unparsable(self) -> None:
+        with self.assertRaises(FriendlyError) as context:
+            self.parse("whenever")
+        self.assertIs(context.exception.inter, self.inter)
+
+    def test_too_far_in_the_future(self) -> None:
+        for text in ("99999999 weeks", "9999999999 days"):
+            with self.subTest(text), self.assertRaises(FriendlyError):
+                self.parse(text)
+        self.dateparser.assert_not_called()
@@ -0,0 +1,84 @@
+import asyncio
+from time import monotonic
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import Mock
+
+from disnake import Message
+
+from paul_bot.application import Poll
+from paul_bot.presentation.edit_scheduler import EditScheduler
+
+from .utils import make_poll
+
+
+class EditSchedulerTest(IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.edits: list[tuple[int, Message | None, float]] = []
+
+    async def edit(self, poll: Poll, message: Message | None) -> None:
+        self.edits.append((poll.poll_id, message, monotonic()))
+        await asyncio.sleep(0)
+
+    async def test_coalesces_pending_requests(self) -> None:
+        scheduler = EditScheduler(self.edit, min_interval=0)
+        poll = make_poll(1)
+        message = Mock(spec=Message)
+        futures = [
+            scheduler.schedule(poll),
+            scheduler.schedule(poll, message),
+            scheduler.schedule(poll),
+        ]
+        await asyncio.gather(*futures)
+        self.assertIs(futures[0], futures[1])
+        self.assertIs(futures[0], futures[2])
+        self.assertEqual(scheduler.coalesced, 2)
+        self.assertEqual([(1, message)], [edit[:2] for edit in self.edits])
+
+    async def test_polls_are_edited_separately(self) -> None:
+        scheduler = EditScheduler(self.edit, min_interval=0)
+        await asyncio.gather(
+            scheduler.schedule(make_poll(1)), scheduler.schedule(make_poll(2))
+        )
+        self.assertEqual(sorted(edit[0] for edit in self.edits), [1, 2])
+        self.assertEqual(scheduler.coalesced, 0)
+
+    async def test_request_during_an_edit_is_sent_after_it(self) -> None:
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def slow_edit(poll: Poll, message: Message | None) -> None:
+            started.set()
+            await release.wait()
+            await self.edit(poll, message)
+
+        scheduler = EditScheduler(slow_edit, min_interval=0)
+        poll = make_poll(1)
+        first = scheduler.schedule(poll)
+        await started.wait()
+        second = scheduler.schedule(poll)
+        self.assertIsNot(first, second)
+        release.set()
+        await asyncio.gather(first, second)
+        self.assertEqual(len(self.edits), 2)
+
+    async def test_edits_are_spaced_by_min_interval(self) -> None:
+        scheduler = EditScheduler(self.edit, min_interval=0.05)
+        poll = make_poll(1)
+        await scheduler.schedule(poll)
+        await scheduler.schedule(poll)
+        self.assertEqual(len(self.edits), 2)
+        self.assertGreaterEqual(self.edits[1][2] - self.edits[0][2], 0.05)
+
+    async def test_failed_edit_is_raised_to_every_waiter(self) -> None:
+        async def failing_edit(_poll: Poll, _message: Message | None) -> None:
+            raise RuntimeError("edit failed")
+
+        scheduler = EditScheduler(failing_edit, min_interval=0)
+        poll = make_poll(1)
+        first, second = scheduler.schedule(poll), scheduler.schedule(poll)
+        with self.assertRaises(RuntimeError):
+            await first
+        with self.assertRaises(RuntimeError):
+            await second
+        with self.assertRaises(RuntimeError):
+            await scheduler.schedule(poll)
@@ -0,0 +1,122 @@
+from typing import cast
+from unittest import TestCase
+from unittest.mock import Mock
+
+import disnake
+
+from paul_bot.application import name_index
+
+
+class _Guild:
+    """Just enough of a guild for the name index, with lookups by name counted."""
+
+    def __init__(self, guild_id: int) -> None:
+        self.id = guild_id
+        self.members: list[disnake.Member] = []
+        self.roles: list[disnake.Role] = []
+        self.scans = 0
+
+    def add_member(
+        self, member_id: int, name: str, nick: str | None = None
+    ) -> disnake.Member:
+        member = Mock(spec=disnake.Member)
+        member.id = member_id
+        member.name = name
+        member.global_name = None
+        member.nick = nick
+        member.guild = self
+        self.members.append(member)
+        return member
+
+    def add_role(self, role_id: int, name: str) -> disnake.Role:
+        role = Mock(spec=disnake.Role)
+        role.id = role_id
+        role.name = name
+        role.guild = self
+        self.roles.append(role)
+        return role
+
+    def rename_member(self, member: disnake.Member, name: str) -> None:
+        """Change a member's username, as Discord would without the cache telling the index."""
+        cast("Mock", member).name = name
+
+    def get_member(self, member_id: int) -> disnake.Member | None:
+        return next((m for m in self.members if m.id == member_id), None)
+
+    def get_role(self, role_id: int) -> disnake.Role | None:
+        return next((r for r in self.roles if r.id == role_id), None)
+
+    def get_member_named(self, name: str) -> disnake.Member | None:
+        self.scans += 1
+        return next(
+            (m for m in self.members if name in (m.nick, m.global_name, m.name)), None
+        )
+
+
+class NameIndexTest(TestCase):
+    def setUp(self) -> None:
+        self.guild = _Guild(1)
+        self.addCleanup(name_index.forget_guild, self.guild.id)
+
+    def resolve(self, name: str) -> disnake.Member | disnake.Role | None:
+        return name_index.resolve(cast("disnake.Guild", self.guild), name)
+
+    def test_resolves_members_by_any_name(self) -> None:
+        member = self.guild.add_member(10, "alice", nick="Al")
+        self.assertIs(self.resolve("alice"), member)
+        self.assertIs(self.resolve("Al"), member)
+        self.assertEqual(self.guild.scans, 0)
+
+    def test_resolves_roles(self) -> None:
+        role = self.guild.add_role(20, "mods")
+        self.assertIs(self.resolve("mods"), role)
+
+    def test_members_take_precedence_over_roles(self) -> None:
+        self.guild.add_role(20, "alice")
+        member = self.guild.add_member(10, "alice")
+        self.assertIs(self.resolve("alice"), member)
+
+    def test_unknown_name(self) -> None:
+        self.guild.add_member(10, "alice")
+        self.assertIsNone(self.resolve("bob"))
+        self.assertEqual(self.guild.scans, 1)
+
+    def test_indexes_members_who_join(self) -> None:
+        self.resolve("anyone")
+        member = self.guild.add_member(10, "alice")
+        name_index.add_member(member)
+        scans = self.guild.scans
+        self.assertIs(self.resolve("alice"), member)
+        self.assertEqual(self.guild.scans, scans)
+
+    def test_member_who_left_without_an_event(self) -> None:
+        member = self.guild.add_member(10, "alice")
+        self.resolve("alice")
+        self.guild.members.remove(member)
+        self.assertIsNone(self.resolve("alice"))
+
+    def test_member_renamed_without_an_event(self) -> None:
+        member = self.guild.add_member(10, "alice")
+        self.resolve("alice")
+        self.guild.rename_member(member, "alicia")
+        self.assertIsNone(self.resolve("alice"))
+        self.assertIs(self.resolve("alicia"), member)
+
+    def test_removed_user_is_reindexed_under_new_names(self) -> None:
+        member = self.guild.add_member(10, "alice")
+        self.resolve("alice")
+        self.guild.rename_member(member, "alicia")
+        name_index.remove_user(member.id)
+        self.assertIs(self.resolve("alicia"), member)
+        scans = self.guild.scans
+        self.assertIs(self.resolve("alicia"), member)
+        self.assertEqual(self.guild.scans, scans)
+
+    def test_role_events(self) -> None:
+        self.resolve("anyone")
+        role = self.guild.add_role(20, "mods")
+        name_index.add_role(role)
+        self.assertIs(self.resolve("mods"), role)
+        self.guild.roles.remove(role)
+        name_index.remove_role(role)
+        self.assertIsNone(self.resolve("mods"))
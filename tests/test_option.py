@@ -0,0 +1,99 @@
+from unittest.mock import patch
+
+from paul_bot import data
+from paul_bot.application import Option, Poll, poll_cache
+from paul_bot.data.cruds import ToggledVote
+
+from .utils import MemoryBackendTestCase
+
+
+def _counts(options: tuple[Option, ...]) -> list[int]:
+    return [option.vote_count for option in options]
+
+
+class ToggleVoteTest(MemoryBackendTestCase):
+    async def test_toggle_adds_and_removes_a_vote(self) -> None:
+        poll = await self.add_poll()
+        yes, _ = poll.options
+        await yes.toggle_vote(1)
+        await yes.toggle_vote(2)
+        self.assertEqual(_counts(poll.options), [2, 0])
+        await yes.toggle_vote(1)
+        self.assertEqual(_counts(poll.options), [1, 0])
+        self.assertEqual(await yes.fetch_voter_page(10), [2])
+
+    async def test_single_vote_moves_the_vote(self) -> None:
+        poll = await self.add_poll()
+        yes, no = poll.options
+        await yes.toggle_vote(1)
+        await no.toggle_vote(1)
+        self.assertEqual(_counts(poll.options), [0, 1])
+        self.assertEqual(await yes.fetch_voter_page(10), [])
+        self.assertEqual(await no.fetch_voter_page(10), [1])
+
+    async def test_multiple_votes_are_kept(self) -> None:
+        poll = await self.add_poll(allow_multiple_votes=True)
+        yes, no = poll.options
+        await yes.toggle_vote(1)
+        await no.toggle_vote(1)
+        self.assertEqual(_counts(poll.options), [1, 1])
+
+    async def test_counts_survive_a_reload(self) -> None:
+        poll = await self.add_poll(("A", "B", "C"))
+        await poll.options[2].toggle_vote(1)
+        poll_cache.cache.clear()
+        option = await Poll.fetch_option(poll.options[2].option_id)
+        assert option is not None
+        self.assertIsNot(option.poll, poll)
+        self.assertEqual(_counts(option.poll.options), [0, 0, 1])
+
+    async def test_toggle_advances_the_version(self) -> None:
+        poll = await self.add_poll()
+        version = poll.version
+        await poll.options[0].toggle_vote(1)
+        await poll.options[1].toggle_vote(1)
+        self.assertEqual(poll.version, version + 2)
+
+    async def test_stale_result_is_skipped(self) -> None:
+        poll = await self.add_poll()
+        yes, no = poll.options
+        version = poll.version
+        # Two concurrent toggles whose results arrive in the reverse order of their writes
+        first = ToggledVote(
+            {yes.option_id: (1, True), no.option_id: (0, False)},
+            previous_poll_version=version,
+            poll_version=version + 1,
+        )
+        second = ToggledVote(
+            {yes.option_id: (1, False), no.option_id: (1, True)},
+            previous_poll_version=version + 1,
+            poll_version=version + 2,
+        )
+        with patch.object(data.cruds.votes_crud, "toggle", side_effect=[second, first]):
+            await no.toggle_vote(2)
+            await yes.toggle_vote(1)
+        self.assertEqual(_counts(poll.options), [1, 1])
+        # The first toggle's change can't be told apart from one made elsewhere, so the poll stays out of date
+        self.assertEqual(poll.version, version)
+
+
+class FetchVoterPageTest(MemoryBackendTestCase):
+    async def test_pages_through_voters_in_order(self) -> None:
+        poll = await self.add_poll(allow_multiple_votes=True)
+        option = poll.options[0]
+        # Discord IDs use all 64 bits, so include the extremes
+        voter_ids = [2**63 - 1, 1, 2**64 - 1, 10**17, 42]
+        for voter_id in voter_ids:
+            await option.toggle_vote(voter_id)
+        expected = sorted(voter_ids)
+        self.assertEqual(await option.fetch_voter_page(2), expected[:2])
+        self.assertEqual(
+            await option.fetch_voter_page(2, after=expected[1]), expected[2:4]
+        )
+        self.assertEqual(
+            await option.fetch_voter_page(2, after=expected[3]), expected[4:]
+        )
+        self.assertEqual(
+            await option.fetch_voter_page(2, before=expected[4]), expected[2:4]
+        )
+        self.assertEqual(await option.fetch_voter_page(10, after=expected[4]), [])
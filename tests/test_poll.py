@@ -0,0 +1,47 @@
+from datetime import UTC, datetime, timedelta
+
+from paul_bot.application import Poll, ShardOwnership, poll_cache, shards
+
+from .utils import MemoryBackendTestCase
+
+
+class CloseExpiredTest(MemoryBackendTestCase):
+    async def test_closes_only_expired_open_polls(self) -> None:
+        now = datetime.now(UTC)
+        expired = await self.add_poll(expires=now - timedelta(hours=1))
+        await self.add_poll(expires=now + timedelta(hours=1))
+        await self.add_poll()
+        already_closed = await self.add_poll(expires=now - timedelta(hours=1))
+        already_closed.close()
+        await self.flush_background_tasks()
+        self.assertEqual(await Poll.close_expired(), [expired.poll_id])
+        self.assertEqual(await Poll.close_expired(), [])
+
+    async def test_reloads_closed_polls(self) -> None:
+        stale = await self.add_poll(expires=datetime.now(UTC) - timedelta(hours=1))
+        await Poll.close_expired()
+        self.assertIsNone(poll_cache.cache.get(stale.poll_id))
+        poll = await Poll.fetch_by_id(stale.poll_id)
+        assert poll is not None
+        self.assertTrue(poll.closed)
+
+    async def test_skips_polls_of_other_shards(self) -> None:
+        # Guild IDs are shifted by 22 bits to get their shard
+        shards.ownership = ShardOwnership(2, frozenset({1}))
+        expired = datetime.now(UTC) - timedelta(hours=1)
+        await self.add_poll(expires=expired, guild_id=0 << 22)
+        owned = await self.add_poll(expires=expired, guild_id=1 << 22)
+        await self.add_poll(expires=expired)
+        self.assertEqual(await Poll.close_expired(), [owned.poll_id])
+
+
+class CountTest(MemoryBackendTestCase):
+    async def test_counts_only_polls_of_this_process(self) -> None:
+        shards.ownership = ShardOwnership(2, frozenset({1}))
+        await self.add_poll(guild_id=0 << 22)
+        owned = await self.add_poll(guild_id=1 << 22)
+        await self.add_poll(guild_id=3 << 22)
+        owned.close()
+        await self.flush_background_tasks()
+        self.assertEqual(await Poll.count(), 2)
+        self.assertEqual(await Poll.count(closed=True), 1)
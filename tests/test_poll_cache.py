@@ -0,0 +1,181 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from paul_bot.application import PollCache
+
+from .utils import make_poll
+
+
+class PollCacheTest(TestCase):
+    def test_get_counts_hits_and_misses(self) -> None:
+        cache = PollCache()
+        poll = cache.put(make_poll(1))
+        self.assertIs(cache.get(1), poll)
+        self.assertIsNone(cache.get(2))
+        self.assertEqual((cache.stats.hits, cache.stats.misses), (1, 1))
+
+    def test_put_keeps_the_resident_poll(self) -> None:
+        cache = PollCache()
+        resident = cache.put(make_poll(1))
+        self.assertIs(cache.put(make_poll(1)), resident)
+        self.assertIs(cache.get(1), resident)
+
+    def test_evicts_least_recently_used(self) -> None:
+        cache = PollCache(max_size=2)
+        cache.put(make_poll(1))
+        cache.put(make_poll(2))
+        cache.get(1)
+        cache.put(make_poll(3))
+        self.assertIsNone(cache.get(2))
+        self.assertIsNotNone(cache.get(1))
+        self.assertIsNotNone(cache.get(3))
+        self.assertEqual(cache.stats.evictions, 1)
+
+    def test_zero_size_caches_nothing(self) -> None:
+        cache = PollCache(max_size=0)
+        poll = make_poll(1, (10,))
+        self.assertIs(cache.put(poll), poll)
+        self.assertEqual(len(cache), 0)
+        self.assertIsNone(cache.get(1))
+        self.assertIsNone(cache.get_by_option(10))
+
+    def test_ttl_expiry(self) -> None:
+        cache = PollCache(ttl=10)
+        with patch("paul_bot.application.poll_cache.monotonic", return_value=100):
+            cache.put(make_poll(1))
+            cache.put(make_poll(2))
+        with patch("paul_bot.application.poll_cache.monotonic", return_value=105):
+            self.assertIsNotNone(cache.get(1))
+        with patch("paul_bot.application.poll_cache.monotonic", return_value=112):
+            # Poll 1 was accessed 7 seconds ago, poll 2 hasn't been for 12
+            self.assertIsNotNone(cache.get(1))
+            self.assertIsNone(cache.get(2))
+        self.assertEqual(cache.stats.evictions, 1)
+        self.assertEqual(len(cache), 1)
+
+    def test_no_ttl(self) -> None:
+        cache = PollCache(ttl=None)
+        with patch("paul_bot.application.poll_cache.monotonic", return_value=0):
+            cache.put(make_poll(1))
+        with patch("paul_bot.application.poll_cache.monotonic", return_value=1e9):
+            self.assertIsNotNone(cache.get(1))
+
+    def test_option_index(self) -> None:
+        cache = PollCache()
+        poll = cache.put(make_poll(1, (10, 11)))
+        self.assertIs(cache.get_by_option(11), poll)
+        self.assertIsNone(cache.get_by_option(12))
+
+    def test_index_options_adds_new_options(self) -> None:
+        cache = PollCache()
+        poll = cache.put(make_poll(1, (10,)))
+        poll.add_option(make_poll(1, (11,)).options[0])
+        self.assertIsNone(cache.get_by_option(11))
+        cache.index_options(poll)
+        self.assertIs(cache.get_by_option(11), poll)
+
+    def test_index_options_ignores_polls_which_arent_resident(self) -> None:
+        cache = PollCache()
+        cache.index_options(make_poll(1, (10,)))
+        self.assertIsNone(cache.get_by_option(10))
+
+    def test_eviction_unindexes_options(self) -> None:
+        cache = PollCache(max_size=1)
+        cache.put(make_poll(1, (10,)))
+        cache.put(make_poll(2, (20,)))
+        self.assertIsNone(cache.get_by_option(10))
+
+    def test_discard(self) -> None:
+        cache = PollCache()
+        cache.put(make_poll(1, (10,)))
+        cache.discard(1)
+        cache.discard(2)
+        self.assertIsNone(cache.get(1))
+        self.assertIsNone(cache.get_by_option(10))
+        self.assertEqual(cache.stats.evictions, 0)
+
+
+class MarkChangedTest(TestCase):
+    def test_newer_version_evicts(self) -> None:
+        cache = PollCache()
+        cache.put(make_poll(1, (10,), version=3))
+        cache.mark_changed(1, 4)
+        self.assertIsNone(cache.get_by_option(10))
+        self.assertIsNone(cache.get(1))
+        self.assertEqual(cache.stats.evictions, 1)
+
+    def test_same_version_keeps_the_poll(self) -> None:
+        cache = PollCache()
+        poll = cache.put(make_poll(1, version=3))
+        cache.mark_changed(1, 3)
+        self.assertIs(cache.get(1), poll)
+
+    def test_announcement_before_the_poll_is_loaded(self) -> None:
+        cache = PollCache()
+        cache.mark_changed(1, 4)
+        cache.put(make_poll(1, version=3))
+        self.assertIsNone(cache.get(1))
+        up_to_date = cache.put(make_poll(1, version=4))
+        self.assertIs(cache.get(1), up_to_date)
+
+    def test_older_announcement_is_ignored(self) -> None:
+        cache = PollCache()
+        cache.mark_changed(1, 5)
+        cache.mark_changed(1, 4)
+        cache.put(make_poll(1, version=4))
+        self.assertIsNone(cache.get(1))
+
+    def test_synced_version_keeps_the_poll(self) -> None:
+        cache = PollCache()
+        poll = cache.put(make_poll(1, version=3))
+        poll.sync_version(3, 4)
+        cache.mark_changed(1, 4)
+        self.assertIs(cache.get(1), poll)
+
+    def test_announcement_during_a_toggle_evicts(self) -> None:
+        # Another process changed the poll between this process's toggle writing version 4 and its result being synced
+        cache = PollCache()
+        poll = cache.put(make_poll(1, version=3))
+        cache.mark_changed(1, 4)
+        cache.mark_changed(1, 5)
+        self.assertTrue(poll.sync_version(3, 4))
+        self.assertEqual(poll.version, 4)
+        self.assertIsNone(cache.get(1))
+
+    def test_own_announcement_before_the_sync_keeps_the_poll(self) -> None:
+        cache = PollCache()
+        poll = cache.put(make_poll(1, version=3))
+        cache.mark_changed(1, 4)
+        self.assertTrue(poll.sync_version(3, 4))
+        self.assertIs(cache.get(1), poll)
+
+    def test_sync_older_than_the_loaded_version_is_skipped(self) -> None:
+        # The poll was reloaded after the announcement, before the toggle's result was synced
+        cache = PollCache()
+        cache.mark_changed(1, 5)
+        poll = cache.put(make_poll(1, version=5))
+        self.assertFalse(poll.sync_version(3, 4))
+        self.assertEqual(poll.version, 5)
+        self.assertIs(cache.get(1), poll)
+
+    def test_zero_size_ignores_announcements(self) -> None:
+        cache = PollCache(max_size=0)
+        cache.mark_changed(1, 4)
+        cache.put(make_poll(1))
+        self.assertEqual(len(cache), 0)
+
+    def test_dropped_announcement_discards_the_poll(self) -> None:
+        cache = PollCache(max_size=2)
+        cache.put(make_poll(1, version=1))
+        cache.mark_changed(1, 2)
+        cache.mark_changed(2, 1)
+        self.assertEqual(len(cache), 1)
+        cache.mark_changed(3, 1)
+        self.assertEqual(len(cache), 0)
+
+    def test_clear_forgets_announcements(self) -> None:
+        cache = PollCache()
+        cache.mark_changed(1, 4)
+        cache.clear()
+        poll = cache.put(make_poll(1, version=3))
+        self.assertIs(cache.get(1), poll)
@@ -0,0 +1,53 @@
+import os
+from unittest import TestCase
+from unittest.mock import patch
+
+from paul_bot.application import ShardOwnership
+
+
+class ShardOwnershipTest(TestCase):
+    def test_owns_every_guild_by_default(self) -> None:
+        ownership = ShardOwnership()
+        self.assertTrue(ownership.owns(None))
+        self.assertTrue(ownership.owns(123 << 22))
+
+    def test_owns_guilds_of_its_shards(self) -> None:
+        ownership = ShardOwnership(4, frozenset({1, 3}))
+        self.assertTrue(ownership.owns(1 << 22))
+        self.assertTrue(ownership.owns((7 << 22) | 12345))
+        self.assertFalse(ownership.owns(2 << 22))
+        self.assertFalse(ownership.owns(4 << 22))
+
+    def test_shard_0_owns_polls_without_a_guild(self) -> None:
+        self.assertTrue(ShardOwnership(2, frozenset({0})).owns(None))
+        self.assertFalse(ShardOwnership(2, frozenset({1})).owns(None))
+
+    def test_from_env(self) -> None:
+        with patch.dict(os.environ, {"SHARD_COUNT": "4", "SHARD_IDS": "0,2"}):
+            self.assertEqual(
+                ShardOwnership.from_env(), ShardOwnership(4, frozenset({0, 2}))
+            )
+
+    def test_from_env_defaults_to_every_shard_of_the_count(self) -> None:
+        with patch.dict(os.environ, {"SHARD_COUNT": "3"}):
+            os.environ.pop("SHARD_IDS", None)
+            self.assertEqual(
+                ShardOwnership.from_env(), ShardOwnership(3, frozenset({0, 1, 2}))
+            )
+
+    def test_from_env_without_sharding(self) -> None:
+        with patch.dict(os.environ):
+            os.environ.pop("SHARD_COUNT", None)
+            os.environ.pop("SHARD_IDS", None)
+            self.assertEqual(ShardOwnership.from_env(), ShardOwnership())
+
+    def test_from_env_rejects_invalid_configuration(self) -> None:
+        with patch.dict(os.environ, {"SHARD_IDS": "0"}):
+            os.environ.pop("SHARD_COUNT", None)
+            with self.assertRaises(ValueError):
+                ShardOwnership.from_env()
+        with (
+            patch.dict(os.environ, {"SHARD_COUNT": "2", "SHARD_IDS": "0,2"}),
+            self.assertRaises(ValueError),
+        ):
+            ShardOwnership.from_env()
@@ -0,0 +1,57 @@
+from disnake.ui import Button
+
+from paul_bot.application import Option
+from paul_bot.presentation.ui.votes_browser import PAGE_SIZE, VotesBrowser
+
+from .utils import MemoryBackendTestCase
+
+
+def _page_buttons(browser: VotesBrowser) -> list[tuple[str | None, bool]]:
+    """Get the custom IDs of the browser's Previous and Next buttons, and whether they are disabled."""
+    buttons = []
+    for component in browser.components[1].children:
+        assert isinstance(component, Button)
+        buttons.append((component.custom_id, component.disabled))
+    return buttons
+
+
+class VotesBrowserTest(MemoryBackendTestCase):
+    async def vote(self, option: Option, count: int) -> None:
+        for voter_id in range(1, count + 1):
+            await option.toggle_vote(voter_id)
+
+    async def test_first_and_last_page(self) -> None:
+        poll = await self.add_poll(allow_multiple_votes=True)
+        yes, _ = poll.options
+        await self.vote(yes, PAGE_SIZE + 1)
+        option_id = yes.option_id
+        first = await VotesBrowser.load(yes)
+        self.assertEqual(
+            _page_buttons(first),
+            [
+                (f"{option_id} <1 votes_page", True),
+                (f"{option_id} >{PAGE_SIZE} votes_page", False),
+            ],
+        )
+        last = await VotesBrowser.load(yes, after=PAGE_SIZE)
+        self.assertEqual(
+            _page_buttons(last),
+            [
+                (f"{option_id} <{PAGE_SIZE + 1} votes_page", False),
+                (f"{option_id} >{PAGE_SIZE + 1} votes_page", True),
+            ],
+        )
+        previous = await VotesBrowser.load(yes, before=PAGE_SIZE + 1)
+        self.assertEqual(_page_buttons(previous), _page_buttons(first))
+
+    async def test_option_without_voters(self) -> None:
+        poll = await self.add_poll()
+        yes, _ = poll.options
+        browser = await VotesBrowser.load(yes)
+        self.assertEqual(
+            _page_buttons(browser),
+            [
+                (f"{yes.option_id} < votes_page", True),
+                (f"{yes.option_id} > votes_page", True),
+            ],
+        )
@@ -0,0 +1,106 @@
+import asyncio
+import os
+from collections.abc import Iterable
+from datetime import datetime
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import patch
+
+from paul_bot import application, data
+from paul_bot.application import Option, Poll
+
+
+def make_poll(
+    poll_id: int,
+    option_ids: Iterable[int] = (),
+    *,
+    expires: datetime | None = None,
+    closed: bool = False,
+    version: int = 0,
+) -> Poll:
+    """Build a poll in memory, without adding it to a storage backend.
+
+    Args:
+        poll_id: The ID of the poll.
+        option_ids: The IDs of the poll's options.
+        expires: When the poll expires.
+        closed: Whether the poll is closed.
+        version: The poll's version.
+    """
+    poll = Poll(
+        poll_id=poll_id,
+        question=f"Poll {poll_id}?",
+        expires=expires,
+        author_id=1,
+        allow_multiple_votes=False,
+        allowed_vote_viewers=(),
+        allowed_editors=(),
+        allowed_voters=(),
+        message_id=poll_id,
+        channel_id=1,
+        closed=closed,
+        guild_id=None,
+        version=version,
+    )
+    for index, option_id in enumerate(option_ids):
+        poll.add_option(Option(option_id, f"Option {index}", 0, poll, index, None))
+    return poll
+
+
+class MemoryBackendTestCase(IsolatedAsyncioTestCase):
+    """A test case which runs each test against a fresh memory backend and poll cache."""
+
+    async def asyncSetUp(self) -> None:
+        self.enterContext(patch.dict(os.environ))
+        for name in ("SHARD_COUNT", "SHARD_IDS", "POLL_CACHE_SIZE", "POLL_CACHE_TTL"):
+            os.environ.pop(name, None)
+        os.environ["STORAGE_BACKEND"] = "memory"
+        with self.assertLogs("paul_bot.data.memory", "WARNING"):
+            await application.init()
+
+    async def asyncTearDown(self) -> None:
+        await application.close()
+
+    async def add_poll(
+        self,
+        labels: Iterable[str] = ("Yes", "No"),
+        *,
+        expires: datetime | None = None,
+        allow_multiple_votes: bool = False,
+        guild_id: int | None = None,
+    ) -> Poll:
+        """Add a poll to the memory backend.
+
+        Args:
+            labels: The labels of the poll's options.
+            expires: When the poll expires.
+            allow_multiple_votes: Whether a user may vote on several options.
+            guild_id: The ID of the poll's guild.
+
+        Returns:
+            The poll, as loaded back from the backend.
+        """
+        poll = Poll(
+            poll_id=None,
+            question="Poll?",
+            expires=expires,
+            author_id=1,
+            allow_multiple_votes=allow_multiple_votes,
+            allowed_vote_viewers=(),
+            allowed_editors=(),
+            allowed_voters=(),
+            message_id=1,
+            channel_id=1,
+            closed=False,
+            guild_id=guild_id,
+        )
+        poll_id = await data.cruds.polls_crud.add(poll)
+        loaded = await data.cruds.polls_crud.fetch_by_id(poll_id)
+        assert loaded is not None
+        await Option.create_options(labels, loaded)
+        result = await Poll.fetch_by_id(poll_id)
+        assert result is not None
+        return result
+
+    async def flush_background_tasks(self) -> None:
+        """Let the database updates started in the background, e.g. by closing a poll, finish."""
+        await asyncio.sleep(0)